@@ -1,9 +1,16 @@
 import sys
+from pathlib import Path
 
 from src.app.main import create_app
 from src.domain.mongo_seed_data_repository import MongoSeedDataRepository
+from src.domain.mongo_seed_documents import load_repo_options
+from src.domain.motor_seed_data_repository import MotorSeedDataRepository
+from src.domain.seed_cache_warm_up import WARM_UP_COUNT
+from src.domain.shared_store_seed_data_repository import (
+    SHARED_STORE_COUNT, SharedStoreSeedDataRepository, load_shared_seed_store)
 from src.stage import Stage
-from src.utils.get_env import get_env
+from src.utils.get_env import get_env, get_env_int
+from src.utils.seed_snapshot import SeedSnapshot
 
 # pylint: disable = abstract-method, import-outside-toplevel
 
@@ -33,7 +40,7 @@ if __name__ == "__main__" and "linux" in sys.platform:
             return self.application
 
 
-def main(*, stage: Stage = None, port: int = None):
+def main(*, stage: Stage = None, port: int = None, workers: int = None):
 
     if stage is None:
         try:
@@ -44,23 +51,24 @@ def main(*, stage: Stage = None, port: int = None):
     print(stage)
 
     if port is None:
-        try:
-            port = int(get_env(key="PORT"))
-        except (KeyError, ValueError):
-            port = 5000
+        port = get_env_int(key="PORT", default=5000)
+
+    if workers is None:
+        workers = get_env_int(key="WEB_CONCURRENCY", default=1)
 
-    seed_data_repo = MongoSeedDataRepository(
-        url=get_env(key="MONGO_URL"),
-        username=get_env(key="MONGO_USERNAME"),
-        password=get_env(key="MONGO_PASSWORD"),
-        db_name=get_env(key="MONGO_DB_NAME"),
-        coll_name=get_env(key="MONGO_COLLECTION_NAME"),
-    )
+    warm_up_count = get_env_int(key="SEED_CACHE_WARM_UP",
+                                default=WARM_UP_COUNT)
+
+    repo_init_kwargs = load_repo_options()
+
+    seed_data_repo = MotorSeedDataRepository(**repo_init_kwargs)
 
     if stage == Stage.DEV:
         import uvicorn
 
-        app = create_app(stage=stage, seed_data_repo=seed_data_repo)
+        app = create_app(stage=stage,
+                         seed_data_repo=seed_data_repo,
+                         warm_up_count=warm_up_count)
 
         uvicorn.run(app=app, host=HOST, port=port)
 
@@ -68,11 +76,36 @@ def main(*, stage: Stage = None, port: int = None):
         try:
             options = {
                 "bind": f"{HOST}:{port}",
-                "workers": 1,
+                "workers": workers,
                 "worker_class": "uvicorn.workers.UvicornWorker",
+                "preload_app": True,
             }
 
-            app = create_app(stage=stage, seed_data_repo=seed_data_repo)
+            snapshot_dir = get_env(key="SEED_SNAPSHOT_DIR", strict=False)
+            snapshot = None
+
+            if snapshot_dir:
+                snapshot = SeedSnapshot(path=Path(snapshot_dir))
+
+            store_count = get_env_int(key="SEED_SHARED_STORE_COUNT",
+                                      default=SHARED_STORE_COUNT)
+
+            # loaded once in the master, workers share it after the fork
+            preload_repo = MongoSeedDataRepository(**repo_init_kwargs)
+
+            try:
+                store = load_shared_seed_store(repo=preload_repo,
+                                               snapshot=snapshot,
+                                               count=store_count)
+            finally:
+                preload_repo.close()
+
+            seed_data_repo = SharedStoreSeedDataRepository(
+                repo=seed_data_repo, store=store)
+
+            app = create_app(stage=stage,
+                             seed_data_repo=seed_data_repo,
+                             warm_up_count=warm_up_count)
             StandaloneGunicornApplication(app=app, options=options).run()
 
         except ModuleNotFoundError:
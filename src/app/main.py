@@ -2,7 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
-from src.domain.seed_data_repository import SeedDataRepository
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
+from src.domain.seed_cache_warm_up import WARM_UP_COUNT
+from src.domain.seed_data_repo_startup import start_seed_data_repo
 from src.stage import Stage
 
 from .routers import api
@@ -12,7 +14,10 @@ DESCRIPTION = """
     You can get raw (unmodified) seeds and enhanced (with useful extra information) seeds."""
 
 
-def create_app(*, stage: Stage, seed_data_repo: SeedDataRepository):
+def create_app(*,
+               stage: Stage,
+               seed_data_repo: AsyncSeedDataRepository,
+               warm_up_count: int = WARM_UP_COUNT):
     app = FastAPI(title=f"TT2 Raid Data API | {stage.value}",
                   version="0.1.1",
                   description=DESCRIPTION,
@@ -33,6 +38,22 @@ def create_app(*, stage: Stage, seed_data_repo: SeedDataRepository):
     async def root():
         return RedirectResponse("/docs")
 
+    # keeps the startup retries referenced, the loop only holds weak ones
+    retries = []
+
+    @app.on_event("startup")
+    async def startup():
+        task = await start_seed_data_repo(repo=seed_data_repo,
+                                          warm_up_count=warm_up_count)
+
+        if task is not None:
+            retries.append(task)
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        for task in retries:
+            task.cancel()
+
     app.include_router(api.create_router(seed_data_repo=seed_data_repo))
 
     return app
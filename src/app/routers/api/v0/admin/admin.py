@@ -1,16 +1,20 @@
 from typing import Callable, Dict, Optional, Tuple, Union
 
 from fastapi import APIRouter, Header, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
-from src.domain.seed_data_repository import (SeedDataRepository,
-                                             SeedDuplicateError,
+from src.app.routers.api.v0.seed_responses import \
+    factory_conditional_seed_response
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
+from src.domain.seed_data_repository import (SeedDuplicateError,
                                              SeedNotFoundError)
 from src.model.raid_data import RaidSeedEnhanced, RaidSeedRaw
 from src.model.seed_type import SeedType
 from src.scripts.enhance_seeds import enhance_seed_data
 from src.utils.get_env import get_env
 from src.utils.responses import RESPONSE_STANDARD_NOT_FOUND
+from src.utils.seed_response import (create_seed_file_response,
+                                     create_seed_response)
 from src.utils.sort_order import SortOrder
 from src.utils.stream_response import create_stream_response
 
@@ -27,35 +31,58 @@ def _verify_authorization(*, secret: Optional[str]):
             detail="You are not authorized to make this request.")
 
 
-def _factory_list_seed_identifiers(*, repo: SeedDataRepository):
+def _factory_list_seed_identifiers(*, repo: AsyncSeedDataRepository):
 
     async def list_seed_identifiers(
         seed_type: SeedType,
         *,
         sort_order: Optional[SortOrder] = SortOrder.ASCENDING,
     ) -> Tuple[str]:
-        return repo.list_seed_identifiers(seed_type=seed_type,
-                                          sort_order=sort_order)
+        return await repo.list_seed_identifiers(seed_type=seed_type,
+                                                sort_order=sort_order)
 
     return list_seed_identifiers
 
 
-def _factory_download_seed_file(*, repo: SeedDataRepository,
-                                create_stream_response_func: Callable):
+def _factory_download_seed_file(*, repo: AsyncSeedDataRepository,
+                                create_seed_response_func: Callable,
+                                create_seed_file_response_func: Callable):
 
-    async def download_seed_file(seed_type: SeedType,
-                                 identifier: str) -> StreamingResponse:
+    conditional_seed_response = factory_conditional_seed_response(
+        repo=repo,
+        create_seed_response_func=create_seed_response_func,
+        create_seed_file_response_func=create_seed_file_response_func)
 
-        data = repo.get_seed_by_identifier(identifier=identifier,
-                                           seed_type=seed_type)
+    async def download_seed_file(
+        seed_type: SeedType,
+        identifier: str,
+        *,
+        accept_encoding: Optional[str] = Header(None),
+        if_none_match: Optional[str] = Header(None),
+        if_modified_since: Optional[str] = Header(None)
+    ) -> Response:
 
-        if data is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"{seed_type.value} seed {identifier} does not exist")
+        not_found = HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{seed_type.value} seed {identifier} does not exist")
+
+        metadata = await repo.get_seed_metadata(identifier=identifier,
+                                                seed_type=seed_type)
+
+        if metadata is None:
+            raise not_found
 
-        return create_stream_response_func(data=data,
-                                           filename=f"{identifier}.json")
+        response = await conditional_seed_response(
+            metadata=metadata,
+            accept_encoding=accept_encoding,
+            if_none_match=if_none_match,
+            if_modified_since=if_modified_since,
+            filename=f"{identifier}.json")
+
+        if response is None:
+            raise not_found
+
+        return response
 
     return download_seed_file
 
@@ -80,7 +107,7 @@ def _factory_enhance_seed(*, enhance_seed_data_func: Callable,
     return enhance_seed
 
 
-def _factory_save_seed(*, repo: SeedDataRepository,
+def _factory_save_seed(*, repo: AsyncSeedDataRepository,
                        enhance_seed_data_func: Callable):
 
     async def save_seed(
@@ -99,7 +126,7 @@ def _factory_save_seed(*, repo: SeedDataRepository,
         )
 
         try:
-            repo.save_seeds(items=payload)
+            await repo.save_seeds(items=payload)
         except SeedDuplicateError as err:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -115,7 +142,7 @@ def _factory_save_seed(*, repo: SeedDataRepository,
     return save_seed
 
 
-def _factory_delete_seed(*, repo: SeedDataRepository):
+def _factory_delete_seed(*, repo: AsyncSeedDataRepository):
 
     async def delete_seed(identifier: str,
                           *,
@@ -128,7 +155,7 @@ def _factory_delete_seed(*, repo: SeedDataRepository):
         )
 
         try:
-            repo.delete_seeds(items=payload)
+            await repo.delete_seeds(items=payload)
         except SeedNotFoundError as err:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                 detail=str(err)) from err
@@ -143,7 +170,7 @@ def _factory_delete_seed(*, repo: SeedDataRepository):
     return delete_seed
 
 
-def _factory_delete_old_seeds(*, repo: SeedDataRepository):
+def _factory_delete_old_seeds(*, repo: AsyncSeedDataRepository):
 
     async def delete_old_seeds(*,
                                days: int = 14,
@@ -151,7 +178,7 @@ def _factory_delete_old_seeds(*, repo: SeedDataRepository):
         _verify_authorization(secret=secret)
 
         try:
-            repo.delete_seeds_older_than(days=days)
+            await repo.delete_seeds_older_than(days=days)
         except Exception as err:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -164,7 +191,20 @@ def _factory_delete_old_seeds(*, repo: SeedDataRepository):
     return delete_old_seeds
 
 
-def create_router(seed_data_repo: SeedDataRepository):
+def _factory_get_stats(*, repo: AsyncSeedDataRepository):
+
+    async def get_stats(*, secret: Optional[str] = Header(None)) -> Dict:
+        _verify_authorization(secret=secret)
+
+        return {
+            "cache": repo.cache_stats,
+            "pool": repo.pool_stats,
+        }
+
+    return get_stats
+
+
+def create_router(seed_data_repo: AsyncSeedDataRepository):
 
     router = APIRouter(
         prefix="/admin",
@@ -184,7 +224,8 @@ def create_router(seed_data_repo: SeedDataRepository):
         methods=["get"],
         endpoint=_factory_download_seed_file(
             repo=seed_data_repo,
-            create_stream_response_func=create_stream_response),
+            create_seed_response_func=create_seed_response,
+            create_seed_file_response_func=create_seed_file_response),
         name="Download seed file by seed identifier",
         include_in_schema=DISPLAY_IN_DOCS)
 
@@ -219,4 +260,11 @@ def create_router(seed_data_repo: SeedDataRepository):
         name="Authenticated: Delete all seeds older than given days",
         include_in_schema=DISPLAY_IN_DOCS)
 
+    router.add_api_route(
+        path="/stats",
+        methods=["get"],
+        endpoint=_factory_get_stats(repo=seed_data_repo),
+        name="Authenticated: Seed cache and connection pool statistics",
+        include_in_schema=DISPLAY_IN_DOCS)
+
     return router
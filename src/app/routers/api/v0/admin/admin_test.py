@@ -1,26 +1,41 @@
-from unittest.mock import Mock
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from fastapi import HTTPException
+from src.domain.mongo_pool_monitor import PoolStats
 from src.domain.seed_data_repository import (SeedDuplicateError,
                                              SeedNotFoundError)
+from src.model.seed_metadata import SeedMetadata
 from src.model.seed_type import SeedType
+from src.utils.conditional_response import create_etag
 from src.utils.sort_order import SortOrder
+from src.utils.swr_cache import CacheStats
 
 from .admin import (TT2_RAID_API_KEY, _factory_delete_seed,
                     _factory_download_seed_file, _factory_enhance_seed,
-                    _factory_list_seed_identifiers, _factory_save_seed,
-                    _verify_authorization)
+                    _factory_get_stats, _factory_list_seed_identifiers,
+                    _factory_save_seed, _verify_authorization)
 
-# pylint: disable = protected-access
+# pylint: disable = duplicate-code, protected-access
 
 repo_mock = Mock()
 
 create_stream_response_mock = Mock()
+create_seed_response_mock = Mock()
+create_seed_file_response_mock = Mock()
 enhance_seed_data_mock = Mock()
 map_to_native_object_mock = Mock()
 
 
+def mock_metadata(seed_type: SeedType = SeedType.RAW) -> SeedMetadata:
+    return SeedMetadata(identifier="testid",
+                        seed_type=seed_type,
+                        content_hash="hash",
+                        last_modified=datetime(2022, 7, 17,
+                                               tzinfo=timezone.utc))
+
+
 def test_verify_authorization():
 
     _verify_authorization(secret=TT2_RAID_API_KEY)
@@ -42,7 +57,7 @@ class TestListSeedIdentifiers:
         data = object()
 
         async def base(**kwargs):
-            repo_mock.list_seed_identifiers = Mock()
+            repo_mock.list_seed_identifiers = AsyncMock()
             repo_mock.list_seed_identifiers.return_value = data
 
             result = await handler(**kwargs)
@@ -72,48 +87,147 @@ class TestDownloadSeedFile:
     def handler():
         return _factory_download_seed_file(
             repo=repo_mock,
-            create_stream_response_func=create_stream_response_mock)
+            create_seed_response_func=create_seed_response_mock,
+            create_seed_file_response_func=create_seed_file_response_mock)
 
     @pytest.mark.asyncio
     async def test_success(self, handler):
 
-        data = object()
-        stream_response = object()
+        serialized = object()
+        seed_response = object()
 
         async def base(**kwargs):
-            repo_mock.get_seed_by_identifier = Mock()
-            repo_mock.get_seed_by_identifier.return_value = data
+            repo_mock.get_seed_metadata = AsyncMock()
+            repo_mock.get_seed_metadata.return_value = mock_metadata(
+                kwargs["seed_type"])
 
-            create_stream_response_mock.return_value = stream_response
+            repo_mock.get_seed_file = AsyncMock()
+            repo_mock.get_seed_file.return_value = None
 
-            result = await handler(**kwargs)
+            repo_mock.get_serialized_seed = AsyncMock()
+            repo_mock.get_serialized_seed.return_value = serialized
+
+            create_seed_response_mock.reset_mock()
+            create_seed_response_mock.return_value = seed_response
 
-            repo_mock.get_seed_by_identifier.assert_called_once_with(**kwargs)
-            create_stream_response_mock.assert_called_with(
-                **{
-                    "data": data,
-                    "filename": "testid.json"
-                })
+            result = await handler(**kwargs,
+                                   accept_encoding="gzip",
+                                   if_none_match=None,
+                                   if_modified_since=None)
 
-            assert result == stream_response
+            repo_mock.get_seed_metadata.assert_called_once_with(**kwargs)
+            repo_mock.get_serialized_seed.assert_called_once_with(**kwargs)
 
-            # assert isinstance(result, StreamingResponse)
-            # assert result.media_type == "application/json"
-            # assert result.status_code == 200
-            # assert result.headers.get("content-disposition") == "attachment; filename=testid.json"
+            create_seed_response_mock.assert_called_once()
 
-            # data, *_ = [item async for item in result.body_iterator]
-            # assert json.loads(data) == return_value
+            call_kwargs = create_seed_response_mock.call_args.kwargs
+
+            assert call_kwargs["serialized"] == serialized
+            assert call_kwargs["accept_encoding"] == "gzip"
+            assert call_kwargs["filename"] == "testid.json"
+            assert call_kwargs["headers"]["ETag"] == create_etag("hash")
+
+            assert result == seed_response
 
         for seed_type in SeedType:
             await base(seed_type=seed_type, identifier="testid")
 
+    @pytest.mark.asyncio
+    async def test_success_file(self, handler):
+        seed_file = object()
+        seed_response = object()
+
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = mock_metadata()
+
+        repo_mock.get_seed_file = AsyncMock()
+        repo_mock.get_seed_file.return_value = seed_file
+
+        repo_mock.get_serialized_seed = AsyncMock()
+
+        create_seed_file_response_mock.reset_mock()
+        create_seed_file_response_mock.return_value = seed_response
+
+        result = await handler(seed_type=SeedType.RAW,
+                               identifier="testid",
+                               accept_encoding="gzip",
+                               if_none_match=None,
+                               if_modified_since=None)
+
+        repo_mock.get_serialized_seed.assert_not_called()
+
+        call_kwargs = create_seed_file_response_mock.call_args.kwargs
+
+        assert call_kwargs["seed_file"] == seed_file
+        assert call_kwargs["accept_encoding"] == "gzip"
+        assert call_kwargs["filename"] == "testid.json"
+        assert call_kwargs["headers"]["ETag"] == create_etag("hash")
+
+        assert result == seed_response
+
+    @pytest.mark.asyncio
+    async def test_success_file_not_acceptable(self, handler):
+        serialized = object()
+        seed_response = object()
+
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = mock_metadata()
+
+        repo_mock.get_seed_file = AsyncMock()
+        repo_mock.get_seed_file.return_value = object()
+
+        repo_mock.get_serialized_seed = AsyncMock()
+        repo_mock.get_serialized_seed.return_value = serialized
+
+        create_seed_file_response_mock.reset_mock()
+        create_seed_file_response_mock.return_value = None
+
+        create_seed_response_mock.reset_mock()
+        create_seed_response_mock.return_value = seed_response
+
+        result = await handler(seed_type=SeedType.RAW,
+                               identifier="testid",
+                               accept_encoding="identity",
+                               if_none_match=None,
+                               if_modified_since=None)
+
+        create_seed_file_response_mock.assert_called_once()
+
+        call_kwargs = create_seed_response_mock.call_args.kwargs
+
+        assert call_kwargs["serialized"] == serialized
+        assert result == seed_response
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, handler):
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = mock_metadata()
+
+        repo_mock.get_seed_file = AsyncMock()
+        repo_mock.get_serialized_seed = AsyncMock()
+
+        result = await handler(seed_type=SeedType.RAW,
+                               identifier="testid",
+                               accept_encoding=None,
+                               if_none_match=create_etag("hash"),
+                               if_modified_since=None)
+
+        repo_mock.get_seed_file.assert_not_called()
+        repo_mock.get_serialized_seed.assert_not_called()
+
+        assert result.status_code == 304
+
     @pytest.mark.asyncio
     async def test_throws_noseed(self, handler):
-        repo_mock.get_seed_by_identifier.return_value = None
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = None
 
         with pytest.raises(HTTPException):
-            await handler(seed_type=SeedType.RAW, identifier="testid")
+            await handler(seed_type=SeedType.RAW,
+                          identifier="testid",
+                          accept_encoding=None,
+                          if_none_match=None,
+                          if_modified_since=None)
 
 
 class TestEnhanceSeedFile:
@@ -193,7 +307,7 @@ class TestSaveSeed:
         )
 
         enhance_seed_data_mock.return_value = enhanced_data
-        repo_mock.save_seeds = Mock()
+        repo_mock.save_seeds = AsyncMock()
 
         result = await handler(identifier="testid",
                                data=data,
@@ -219,7 +333,7 @@ class TestSaveSeed:
 
         data = object()
 
-        repo_mock.save_seeds = Mock()
+        repo_mock.save_seeds = AsyncMock()
         repo_mock.save_seeds.side_effect = SeedDuplicateError
 
         with pytest.raises(HTTPException):
@@ -243,7 +357,7 @@ class TestDeleteSeed:
             ("testid", SeedType.ENHANCED),
         )
 
-        repo_mock.delete_seeds = Mock()
+        repo_mock.delete_seeds = AsyncMock()
 
         result = await handler(identifier="testid", secret=TT2_RAID_API_KEY)
 
@@ -262,8 +376,38 @@ class TestDeleteSeed:
     @pytest.mark.asyncio
     async def test_throw_notfound(self, handler):
 
-        repo_mock.delete_seeds = Mock()
+        repo_mock.delete_seeds = AsyncMock()
         repo_mock.delete_seeds.side_effect = SeedNotFoundError
 
         with pytest.raises(HTTPException):
             await handler(identifier="testid", secret=TT2_RAID_API_KEY)
+
+
+class TestGetStats:
+
+    @staticmethod
+    @pytest.fixture
+    def handler():
+        return _factory_get_stats(repo=repo_mock)
+
+    @pytest.mark.asyncio
+    async def test_success(self, handler):
+
+        cache_stats = CacheStats(hits=3, misses=1, stale=0)
+        pool_stats = PoolStats(connections_open=2,
+                               connections_in_use=1,
+                               checkouts=4,
+                               checkout_failures=0,
+                               pool_clears=0)
+
+        repo_mock.cache_stats = cache_stats
+        repo_mock.pool_stats = pool_stats
+
+        result = await handler(secret=TT2_RAID_API_KEY)
+
+        assert result == {"cache": cache_stats, "pool": pool_stats}
+
+    @pytest.mark.asyncio
+    async def test_throw_noauth(self, handler):
+        with pytest.raises(HTTPException):
+            await handler()
@@ -1,11 +1,11 @@
 from fastapi import APIRouter
-from src.domain.seed_data_repository import SeedDataRepository
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
 from src.utils.responses import RESPONSE_STANDARD_NOT_FOUND
 
 from . import admin, raid_info, seeds
 
 
-def create_router(seed_data_repo: SeedDataRepository):
+def create_router(seed_data_repo: AsyncSeedDataRepository):
     router = APIRouter(
         prefix="/v0",
         tags=[],
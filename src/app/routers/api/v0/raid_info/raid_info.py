@@ -1,50 +1,68 @@
-from typing import Callable
-
-from fastapi import APIRouter, HTTPException, status
-from src.domain.seed_data_repository import SeedDataRepository
-from src.model.raid_data import RaidInfo, map_to_native_object
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import JSONResponse, Response
+from src.app.routers.api.v0.seed_responses import \
+    get_seed_metadata_by_week_offset
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
+from src.model.raid_data import RaidInfo
 from src.model.seed_type import SeedType
-from src.utils import selectors
+from src.utils.conditional_response import (create_conditional_response,
+                                            create_etag)
 
 
-def _factory_raid_info_by_tier_level(*, repo: SeedDataRepository,
-                                     selectors_utils,
-                                     map_to_native_object_func: Callable):
+def _factory_raid_info_by_tier_level(*, repo: AsyncSeedDataRepository):
 
-    async def raid_info_by_tier_level(seed_type: SeedType,
-                                      tier: int,
-                                      level: int,
-                                      offset_weeks: int = 0) -> RaidInfo:
+    async def raid_info_by_tier_level(
+        seed_type: SeedType,
+        tier: int,
+        level: int,
+        offset_weeks: int = 0,
+        *,
+        if_none_match: Optional[str] = Header(None),
+        if_modified_since: Optional[str] = Header(None)
+    ) -> RaidInfo:
 
-        seed_data = repo.get_seed_by_week_offset(offset_weeks=offset_weeks,
-                                                 seed_type=seed_type)
+        metadata = await get_seed_metadata_by_week_offset(
+            repo=repo, seed_type=seed_type, offset_weeks=offset_weeks)
 
-        if seed_data is None:
+        if metadata is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"No raid seed found for {offset_weeks=}")
 
-        selectors_and_validators = (
-            (selectors_utils.raid_tier, lambda x: x == tier),
-            (selectors_utils.raid_level, lambda x: x == level),
-        )
+        async def create_raid_info_response(
+                *, headers: Dict[str, str]) -> Response:
 
-        payload = selectors_utils.select_first_by(
-            data=map_to_native_object_func(data=seed_data),
-            selectors_and_validators=selectors_and_validators,
-        )
+            raid_info_index = await repo.get_raid_info_index(
+                identifier=metadata.identifier, seed_type=seed_type)
 
-        if payload is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"No raid info found for raid level {tier}-{level}")
+            if raid_info_index is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"No raid seed found for {offset_weeks=}")
+
+            payload = raid_info_index.get((tier, level))
+
+            if payload is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"No raid info found for raid level {tier}-{level}")
+
+            # index entries are already jsonable, skip the encoder pass
+            return JSONResponse(content=payload, headers=headers)
 
-        return payload
+        return await create_conditional_response(
+            etag=create_etag(metadata.content_hash, tier, level),
+            last_modified=metadata.last_modified,
+            if_none_match=if_none_match,
+            if_modified_since=if_modified_since,
+            create_response_func=create_raid_info_response)
 
     return raid_info_by_tier_level
 
 
-def create_router(seed_data_repo: SeedDataRepository):
+def create_router(seed_data_repo: AsyncSeedDataRepository):
 
     router = APIRouter(
         prefix="/raid_info",
@@ -54,10 +72,7 @@ def create_router(seed_data_repo: SeedDataRepository):
     router.add_api_route(
         path="/{seed_type}/{tier}/{level}",
         methods=["get"],
-        endpoint=_factory_raid_info_by_tier_level(
-            repo=seed_data_repo,
-            selectors_utils=selectors,
-            map_to_native_object_func=map_to_native_object),
+        endpoint=_factory_raid_info_by_tier_level(repo=seed_data_repo),
         summary="Individual raid level info",
         description="Select the data for a single raid level by tier and level"
     )
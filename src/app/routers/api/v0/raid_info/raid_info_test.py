@@ -1,16 +1,27 @@
-from unittest.mock import Mock
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from src.model.seed_metadata import SeedMetadata
 from src.model.seed_type import SeedType
+from src.utils.conditional_response import create_etag
 
 from .raid_info import _factory_raid_info_by_tier_level
 
+# pylint: disable = duplicate-code
+
 repo_mock = Mock()
-selectors_utils_mock = Mock()
-map_to_native_object_mock = Mock()
 
-# pylint: disable = fixme
+
+def mock_metadata(seed_type: SeedType = SeedType.RAW) -> SeedMetadata:
+    return SeedMetadata(identifier="testid",
+                        seed_type=seed_type,
+                        content_hash="hash",
+                        last_modified=datetime(2022, 7, 17,
+                                               tzinfo=timezone.utc))
 
 
 class TestGetRaidInfo:
@@ -18,39 +29,49 @@ class TestGetRaidInfo:
     @staticmethod
     @pytest.fixture
     def handler():
-        return _factory_raid_info_by_tier_level(
-            repo=repo_mock,
-            selectors_utils=selectors_utils_mock,
-            map_to_native_object_func=map_to_native_object_mock)
+        return _factory_raid_info_by_tier_level(repo=repo_mock)
 
     @pytest.mark.asyncio
     async def test_success(self, handler):
 
         async def base(**kwargs):
-            data = object()
-            mapped_data = object()
-            selected_data = object()
+            tier, level = kwargs["tier"], kwargs["level"]
+
+            selected_data = {"tier": tier, "level": level}
 
-            repo_mock.get_seed_by_week_offset = Mock()
-            repo_mock.get_seed_by_week_offset.return_value = data
+            repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+            repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
 
-            map_to_native_object_mock.return_value = mapped_data
+            repo_mock.get_seed_metadata = AsyncMock()
+            repo_mock.get_seed_metadata.return_value = mock_metadata(
+                kwargs["seed_type"])
 
-            selectors_utils_mock.select_first_by = Mock()
-            selectors_utils_mock.select_first_by.return_value = selected_data
+            repo_mock.get_raid_info_index = AsyncMock()
+            repo_mock.get_raid_info_index.return_value = {
+                (tier, level): selected_data,
+                (tier + 1, level): {},
+            }
 
-            result = await handler(**kwargs)
+            result = await handler(**kwargs,
+                                   if_none_match=None,
+                                   if_modified_since=None)
 
-            repo_mock.get_seed_by_week_offset.assert_called_once_with(
+            repo_mock.get_seed_identifier_by_week_offset.assert_called_once_with(
                 **{
                     "seed_type": kwargs.get("seed_type"),
                     "offset_weeks": kwargs.get("offset_weeks", 0)
                 })
 
-            # TODO: test passes validators are selecting correctly
-            selectors_utils_mock.select_first_by.assert_called_once()
+            repo_mock.get_raid_info_index.assert_called_once_with(
+                **{
+                    "identifier": "testid",
+                    "seed_type": kwargs.get("seed_type")
+                })
 
-            assert result == selected_data
+            assert isinstance(result, JSONResponse)
+            assert json.loads(result.body) == selected_data
+            assert result.headers.get("etag") == create_etag(
+                "hash", tier, level)
 
         for seed_type in SeedType:
             for offset_weeks in (None, *range(-5, 6)):
@@ -69,22 +90,85 @@ class TestGetRaidInfo:
                         await base(**kwargs)
 
     @pytest.mark.asyncio
-    async def test_throws_nodata(self, handler):
+    async def test_not_modified(self, handler):
+
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
+
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = mock_metadata()
+
+        repo_mock.get_raid_info_index = AsyncMock()
 
-        repo_mock.get_seed_by_week_offset = Mock()
-        repo_mock.get_seed_by_week_offset.return_value = None
+        result = await handler(seed_type=SeedType.RAW,
+                               tier=1,
+                               level=2,
+                               if_none_match=create_etag("hash", 1, 2),
+                               if_modified_since=None)
+
+        repo_mock.get_raid_info_index.assert_not_called()
+
+        assert result.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_throws_noidentifier(self, handler):
+
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = None
+
+        repo_mock.get_seed_metadata = AsyncMock()
 
         with pytest.raises(HTTPException):
             await handler(seed_type=SeedType.RAW, tier=1, level=1)
 
+        repo_mock.get_seed_metadata.assert_not_called()
+
     @pytest.mark.asyncio
-    async def test_throws_noselection(self, handler):
+    async def test_throws_nometadata(self, handler):
 
-        repo_mock.get_seed_by_week_offset = Mock()
-        repo_mock.get_seed_by_week_offset.return_value = object()
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
 
-        selectors_utils_mock.select_first_by = Mock()
-        selectors_utils_mock.select_first_by.return_value = None
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = None
 
         with pytest.raises(HTTPException):
             await handler(seed_type=SeedType.RAW, tier=1, level=1)
+
+    @pytest.mark.asyncio
+    async def test_throws_nodata(self, handler):
+
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
+
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = mock_metadata()
+
+        repo_mock.get_raid_info_index = AsyncMock()
+        repo_mock.get_raid_info_index.return_value = None
+
+        with pytest.raises(HTTPException):
+            await handler(seed_type=SeedType.RAW,
+                          tier=1,
+                          level=1,
+                          if_none_match=None,
+                          if_modified_since=None)
+
+    @pytest.mark.asyncio
+    async def test_throws_noselection(self, handler):
+
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
+
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = mock_metadata()
+
+        repo_mock.get_raid_info_index = AsyncMock()
+        repo_mock.get_raid_info_index.return_value = {(2, 2): {}}
+
+        with pytest.raises(HTTPException):
+            await handler(seed_type=SeedType.RAW,
+                          tier=1,
+                          level=1,
+                          if_none_match=None,
+                          if_modified_since=None)
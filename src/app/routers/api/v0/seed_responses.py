@@ -0,0 +1,80 @@
+from functools import partial
+from typing import Callable, Dict, Optional
+
+from fastapi.responses import Response
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
+from src.model.seed_metadata import SeedMetadata
+from src.model.seed_type import SeedType
+from src.utils.conditional_response import (create_conditional_response,
+                                            create_etag)
+
+
+async def get_seed_metadata_by_week_offset(
+        *, repo: AsyncSeedDataRepository, seed_type: SeedType,
+        offset_weeks: int) -> Optional[SeedMetadata]:
+
+    identifier = await repo.get_seed_identifier_by_week_offset(
+        seed_type=seed_type, offset_weeks=offset_weeks)
+
+    if identifier is None:
+        return None
+
+    return await repo.get_seed_metadata(identifier=identifier,
+                                        seed_type=seed_type)
+
+
+def factory_conditional_seed_response(
+        *, repo: AsyncSeedDataRepository, create_seed_response_func: Callable,
+        create_seed_file_response_func: Callable):
+
+    async def seed_body_response(
+            *, headers: Dict[str, str], metadata: SeedMetadata,
+            accept_encoding: Optional[str],
+            filename: Optional[str]) -> Optional[Response]:
+
+        seed_file = await repo.get_seed_file(identifier=metadata.identifier,
+                                             seed_type=metadata.seed_type)
+
+        if seed_file is not None:
+            response = create_seed_file_response_func(
+                seed_file=seed_file,
+                accept_encoding=accept_encoding,
+                filename=filename,
+                headers=headers)
+
+            if response is not None:
+                return response
+
+        serialized = await repo.get_serialized_seed(
+            identifier=metadata.identifier, seed_type=metadata.seed_type)
+
+        if serialized is None:
+            return None
+
+        return create_seed_response_func(serialized=serialized,
+                                         accept_encoding=accept_encoding,
+                                         filename=filename,
+                                         headers=headers)
+
+    async def conditional_seed_response(
+            *,
+            metadata: SeedMetadata,
+            accept_encoding: Optional[str],
+            if_none_match: Optional[str],
+            if_modified_since: Optional[str],
+            filename: Optional[str] = None) -> Optional[Response]:
+        """The 304 response if the client has the seed of metadata already,
+        otherwise the seed, streamed from its file where the repository
+        stores one in an acceptable encoding. None if the seed is gone."""
+
+        return await create_conditional_response(
+            etag=create_etag(metadata.content_hash),
+            last_modified=metadata.last_modified,
+            if_none_match=if_none_match,
+            if_modified_since=if_modified_since,
+            create_response_func=partial(seed_body_response,
+                                         metadata=metadata,
+                                         accept_encoding=accept_encoding,
+                                         filename=filename))
+
+    return conditional_seed_response
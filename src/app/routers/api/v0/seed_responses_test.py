@@ -0,0 +1,153 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from src.model.seed_metadata import SeedMetadata
+from src.model.seed_type import SeedType
+from src.utils.conditional_response import create_etag
+
+from .seed_responses import (factory_conditional_seed_response,
+                             get_seed_metadata_by_week_offset)
+
+# pylint: disable = duplicate-code
+
+LAST_MODIFIED = datetime(2022, 7, 17, tzinfo=timezone.utc)
+
+METADATA = SeedMetadata(identifier="testid",
+                        seed_type=SeedType.ENHANCED,
+                        content_hash="hash",
+                        last_modified=LAST_MODIFIED)
+
+
+def mock_repo(*, seed_file=None, serialized=None) -> Mock:
+    repo = Mock()
+
+    repo.get_seed_file = AsyncMock(return_value=seed_file)
+    repo.get_serialized_seed = AsyncMock(return_value=serialized)
+
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_get_seed_metadata_by_week_offset():
+    repo = Mock()
+
+    repo.get_seed_identifier_by_week_offset = AsyncMock(return_value=None)
+    repo.get_seed_metadata = AsyncMock(return_value=METADATA)
+
+    assert await get_seed_metadata_by_week_offset(
+        repo=repo, seed_type=SeedType.ENHANCED, offset_weeks=2) is None
+
+    repo.get_seed_metadata.assert_not_called()
+
+    repo.get_seed_identifier_by_week_offset.return_value = "testid"
+
+    assert await get_seed_metadata_by_week_offset(
+        repo=repo, seed_type=SeedType.ENHANCED, offset_weeks=2) is METADATA
+
+    repo.get_seed_identifier_by_week_offset.assert_called_with(
+        seed_type=SeedType.ENHANCED, offset_weeks=2)
+    repo.get_seed_metadata.assert_called_once_with(identifier="testid",
+                                                   seed_type=SeedType.ENHANCED)
+
+
+class TestConditionalSeedResponse:
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self):
+        repo = mock_repo()
+
+        conditional_seed_response = factory_conditional_seed_response(
+            repo=repo,
+            create_seed_response_func=Mock(),
+            create_seed_file_response_func=Mock())
+
+        result = await conditional_seed_response(
+            metadata=METADATA,
+            accept_encoding=None,
+            if_none_match=create_etag("hash"),
+            if_modified_since=None)
+
+        repo.get_seed_file.assert_not_called()
+        repo.get_serialized_seed.assert_not_called()
+
+        assert result.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_file(self):
+        seed_file = object()
+        seed_response = object()
+
+        repo = mock_repo(seed_file=seed_file)
+        create_seed_file_response = Mock(return_value=seed_response)
+
+        conditional_seed_response = factory_conditional_seed_response(
+            repo=repo,
+            create_seed_response_func=Mock(),
+            create_seed_file_response_func=create_seed_file_response)
+
+        result = await conditional_seed_response(metadata=METADATA,
+                                                 accept_encoding="br",
+                                                 if_none_match=None,
+                                                 if_modified_since=None,
+                                                 filename="testid.json")
+
+        repo.get_seed_file.assert_called_once_with(identifier="testid",
+                                                   seed_type=SeedType.ENHANCED)
+        repo.get_serialized_seed.assert_not_called()
+
+        call_kwargs = create_seed_file_response.call_args.kwargs
+
+        assert call_kwargs["seed_file"] == seed_file
+        assert call_kwargs["accept_encoding"] == "br"
+        assert call_kwargs["filename"] == "testid.json"
+        assert call_kwargs["headers"]["ETag"] == create_etag("hash")
+
+        assert result == seed_response
+
+    @pytest.mark.asyncio
+    async def test_serialized(self):
+        serialized = object()
+        seed_response = object()
+
+        repo = mock_repo(seed_file=object(), serialized=serialized)
+        create_seed_response = Mock(return_value=seed_response)
+
+        conditional_seed_response = factory_conditional_seed_response(
+            repo=repo,
+            create_seed_response_func=create_seed_response,
+            create_seed_file_response_func=Mock(return_value=None))
+
+        result = await conditional_seed_response(metadata=METADATA,
+                                                 accept_encoding="identity",
+                                                 if_none_match=None,
+                                                 if_modified_since=None)
+
+        repo.get_serialized_seed.assert_called_once_with(
+            identifier="testid", seed_type=SeedType.ENHANCED)
+
+        call_kwargs = create_seed_response.call_args.kwargs
+
+        assert call_kwargs["serialized"] == serialized
+        assert call_kwargs["filename"] is None
+        assert "Last-Modified" in call_kwargs["headers"]
+
+        assert result == seed_response
+
+    @pytest.mark.asyncio
+    async def test_gone(self):
+        create_seed_response = Mock()
+
+        conditional_seed_response = factory_conditional_seed_response(
+            repo=mock_repo(),
+            create_seed_response_func=create_seed_response,
+            create_seed_file_response_func=Mock())
+
+        result = await conditional_seed_response(metadata=METADATA,
+                                                 accept_encoding=None,
+                                                 if_none_match=None,
+                                                 if_modified_since=None)
+
+        create_seed_response.assert_not_called()
+
+        assert result is None
@@ -1,51 +1,117 @@
-from typing import Tuple
-
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import RedirectResponse
-from src.domain.seed_data_repository import SeedDataRepository
+from typing import Callable, Optional, Tuple
+
+from cachetools import LRUCache
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse, Response
+from src.app.routers.api.v0.seed_responses import (
+    factory_conditional_seed_response, get_seed_metadata_by_week_offset)
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
 from src.model.raid_data import RaidSeed
 from src.model.seed_type import SeedType
+from src.utils.conditional_response import (caching_headers,
+                                            create_etag_from_hashes,
+                                            create_not_modified_response,
+                                            is_not_modified)
+from src.utils.seed_response import (create_seed_file_response,
+                                     create_seed_response)
+from src.utils.serialized_seed import serialize_body
 from src.utils.sort_order import SortOrder
 
+# one list per seed type and sort order
+LIST_BODY_CACHE_MAXSIZE = len(SeedType) * len(SortOrder)
+
 
-def _factory_get_all_seeds(*, repo: SeedDataRepository):
+def _factory_get_all_seeds(*, repo: AsyncSeedDataRepository):
+
+    # the etag covers the content hash of every seed in the list, so a cached
+    # body stays valid for as long as its etag is current
+    bodies = LRUCache(maxsize=LIST_BODY_CACHE_MAXSIZE)
 
     async def get_all_seeds_sorted(
-            seed_type: SeedType,
-            sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[RaidSeed]:
+        seed_type: SeedType,
+        sort_order: SortOrder = SortOrder.ASCENDING,
+        *,
+        if_none_match: Optional[str] = Header(None)
+    ) -> Tuple[RaidSeed]:
+
+        metadata = await repo.list_seed_metadata(seed_type=seed_type,
+                                                 sort_order=sort_order)
+
+        etag = create_etag_from_hashes(m.content_hash for m in metadata)
+
+        if is_not_modified(if_none_match=if_none_match,
+                           if_modified_since=None,
+                           etag=etag,
+                           last_modified=None):
+            return create_not_modified_response(etag=etag)
+
+        body = bodies.get(etag)
 
-        return repo.list_seeds(seed_type=seed_type, sort_order=sort_order)
+        if body is None:
+            data = await repo.list_seeds(seed_type=seed_type,
+                                         sort_order=sort_order)
+
+            # encoding every seed blocks for too long to run on the event loop
+            body = await run_in_threadpool(serialize_body, data=data)
+            bodies[etag] = body
+
+        return Response(content=body,
+                        media_type="application/json",
+                        headers=caching_headers(etag=etag))
 
     return get_all_seeds_sorted
 
 
-def _factory_get_seed_by_recency(*, repo: SeedDataRepository):
+def _factory_get_seed_by_recency(*, repo: AsyncSeedDataRepository,
+                                 create_seed_response_func: Callable,
+                                 create_seed_file_response_func: Callable):
 
-    async def get_seed_by_recency(seed_type: SeedType,
-                                  offset_weeks: int = 0,
-                                  *,
-                                  download: bool = False) -> RaidSeed:
+    conditional_seed_response = factory_conditional_seed_response(
+        repo=repo,
+        create_seed_response_func=create_seed_response_func,
+        create_seed_file_response_func=create_seed_file_response_func)
+
+    async def get_seed_by_recency(
+        seed_type: SeedType,
+        offset_weeks: int = 0,
+        *,
+        download: bool = False,
+        accept_encoding: Optional[str] = Header(None),
+        if_none_match: Optional[str] = Header(None),
+        if_modified_since: Optional[str] = Header(None)
+    ) -> RaidSeed:
 
         if download:
-            identifier = repo.get_seed_identifier_by_week_offset(
+            identifier = await repo.get_seed_identifier_by_week_offset(
                 offset_weeks=offset_weeks)
 
             return RedirectResponse(
                 f"/api/v0/admin/seed/{seed_type.value}/{identifier}")
 
-        data = repo.get_seed_by_week_offset(seed_type=seed_type,
-                                            offset_weeks=offset_weeks)
+        metadata = await get_seed_metadata_by_week_offset(
+            repo=repo, seed_type=seed_type, offset_weeks=offset_weeks)
+
+        if metadata is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"No seed found for {offset_weeks=}")
+
+        response = await conditional_seed_response(
+            metadata=metadata,
+            accept_encoding=accept_encoding,
+            if_none_match=if_none_match,
+            if_modified_since=if_modified_since)
 
-        if data is None:
+        if response is None:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                 detail=f"No seed found for {offset_weeks=}")
 
-        return data
+        return response
 
     return get_seed_by_recency
 
 
-def create_router(seed_data_repo: SeedDataRepository):
+def create_router(seed_data_repo: AsyncSeedDataRepository):
 
     router = APIRouter(
         prefix="/seeds",
@@ -59,6 +125,9 @@ def create_router(seed_data_repo: SeedDataRepository):
     router.add_api_route(
         path="/{seed_type}/recent",
         methods=["get"],
-        endpoint=_factory_get_seed_by_recency(repo=seed_data_repo))
+        endpoint=_factory_get_seed_by_recency(
+            repo=seed_data_repo,
+            create_seed_response_func=create_seed_response,
+            create_seed_file_response_func=create_seed_file_response))
 
     return router
@@ -1,9 +1,14 @@
-from unittest.mock import Mock
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from fastapi import HTTPException
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
+from src.model.seed_metadata import SeedMetadata
 from src.model.seed_type import SeedType
+from src.utils.conditional_response import (create_etag,
+                                            create_etag_from_hashes)
 from src.utils.sort_order import SortOrder
 
 from .seeds import _factory_get_all_seeds, _factory_get_seed_by_recency
@@ -11,6 +16,18 @@ from .seeds import _factory_get_all_seeds, _factory_get_seed_by_recency
 # pylint: disable = duplicate-code
 
 repo_mock = Mock()
+create_seed_response_mock = Mock()
+create_seed_file_response_mock = Mock()
+
+LAST_MODIFIED = datetime(2022, 7, 17, tzinfo=timezone.utc)
+
+
+def mock_metadata(seed_type: SeedType = SeedType.RAW,
+                  identifier: str = "testid") -> SeedMetadata:
+    return SeedMetadata(identifier=identifier,
+                        seed_type=seed_type,
+                        content_hash=f"hash_{identifier}",
+                        last_modified=LAST_MODIFIED)
 
 
 class TestListSeeds:
@@ -21,22 +38,35 @@ class TestListSeeds:
         return _factory_get_all_seeds(repo=repo_mock)
 
     @pytest.mark.asyncio
-    async def test_success(self, handler):
+    async def test_success(self):
 
-        data = object()
+        data = [[{"tier": 1}], [{"tier": 2}]]
 
         async def base(**kwargs):
-            repo_mock.list_seeds = Mock()
+            handler = _factory_get_all_seeds(repo=repo_mock)
+
+            metadata = (mock_metadata(kwargs["seed_type"], "a"),
+                        mock_metadata(kwargs["seed_type"], "b"))
+
+            repo_mock.list_seed_metadata = AsyncMock()
+            repo_mock.list_seed_metadata.return_value = metadata
+
+            repo_mock.list_seeds = AsyncMock()
             repo_mock.list_seeds.return_value = data
 
-            result = await handler(**kwargs)
+            result = await handler(**kwargs, if_none_match=None)
 
             kwargs["sort_order"] = kwargs.get("sort_order",
                                               SortOrder.ASCENDING)
 
+            repo_mock.list_seed_metadata.assert_called_once_with(**kwargs)
             repo_mock.list_seeds.assert_called_once_with(**kwargs)
 
-            assert result == data
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
+            assert json.loads(result.body) == data
+            assert result.headers.get("etag") == create_etag_from_hashes(
+                ("hash_a", "hash_b"))
 
         for seed_type in SeedType:
             for sort_order in (None, *SortOrder):
@@ -48,30 +78,110 @@ class TestListSeeds:
 
                 await base(**kwargs)
 
+    @pytest.mark.asyncio
+    async def test_cached_body(self, handler):
+
+        data = [[{"tier": 1}], [{"tier": 2}]]
+
+        repo_mock.list_seed_metadata = AsyncMock()
+        repo_mock.list_seed_metadata.return_value = (mock_metadata(
+            SeedType.RAW, "a"), )
+
+        repo_mock.list_seeds = AsyncMock()
+        repo_mock.list_seeds.return_value = data
+
+        first = await handler(seed_type=SeedType.RAW, if_none_match=None)
+        second = await handler(seed_type=SeedType.RAW, if_none_match=None)
+
+        repo_mock.list_seeds.assert_called_once()
+
+        assert second.body == first.body
+        assert json.loads(second.body) == data
+
+        repo_mock.list_seed_metadata.return_value = (mock_metadata(
+            SeedType.RAW, "b"), )
+
+        await handler(seed_type=SeedType.RAW, if_none_match=None)
+
+        assert repo_mock.list_seeds.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, handler):
+
+        repo_mock.list_seed_metadata = AsyncMock()
+        repo_mock.list_seed_metadata.return_value = (mock_metadata(), )
+
+        repo_mock.list_seeds = AsyncMock()
+
+        etag = create_etag_from_hashes(("hash_testid", ))
+
+        result = await handler(seed_type=SeedType.RAW, if_none_match=etag)
+
+        repo_mock.list_seeds.assert_not_called()
+
+        assert result.status_code == 304
+        assert result.headers.get("etag") == etag
+
 
 class TestGetSeed:
 
     @staticmethod
     @pytest.fixture
     def handler():
-        return _factory_get_seed_by_recency(repo=repo_mock)
+        return _factory_get_seed_by_recency(
+            repo=repo_mock,
+            create_seed_response_func=create_seed_response_mock,
+            create_seed_file_response_func=create_seed_file_response_mock)
 
     @pytest.mark.asyncio
     async def test_success_data(self, handler):
 
         async def base(**kwargs):
-            data = object()
+            serialized = object()
+            seed_response = object()
 
-            repo_mock.get_seed_by_week_offset = Mock()
-            repo_mock.get_seed_by_week_offset.return_value = data
+            repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+            repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
 
-            result = await handler(**kwargs)
+            repo_mock.get_seed_metadata = AsyncMock()
+            repo_mock.get_seed_metadata.return_value = mock_metadata(
+                kwargs["seed_type"])
+
+            repo_mock.get_seed_file = AsyncMock()
+            repo_mock.get_seed_file.return_value = None
+
+            repo_mock.get_serialized_seed = AsyncMock()
+            repo_mock.get_serialized_seed.return_value = serialized
+
+            create_seed_response_mock.reset_mock()
+            create_seed_response_mock.return_value = seed_response
+
+            result = await handler(**kwargs,
+                                   accept_encoding="br",
+                                   if_none_match=None,
+                                   if_modified_since=None)
+
+            repo_mock.get_seed_identifier_by_week_offset.assert_called_once_with(
+                seed_type=kwargs["seed_type"],
+                offset_weeks=kwargs.get("offset_weeks", 0))
+
+            repo_mock.get_seed_metadata.assert_called_once_with(
+                identifier="testid", seed_type=kwargs["seed_type"])
+
+            repo_mock.get_serialized_seed.assert_called_once_with(
+                identifier="testid", seed_type=kwargs["seed_type"])
 
-            kwargs["offset_weeks"] = kwargs.get("offset_weeks", 0)
+            create_seed_response_mock.assert_called_once()
 
-            repo_mock.get_seed_by_week_offset.assert_called_once_with(**kwargs)
+            call_kwargs = create_seed_response_mock.call_args.kwargs
 
-            assert result == data
+            assert call_kwargs["serialized"] == serialized
+            assert call_kwargs["accept_encoding"] == "br"
+            assert call_kwargs["headers"]["ETag"] == create_etag(
+                "hash_testid")
+            assert "Last-Modified" in call_kwargs["headers"]
+
+            assert result == seed_response
 
         for seed_type in SeedType:
             for offset_weeks in (None, *range(-5, 6)):
@@ -87,11 +197,47 @@ class TestGetSeed:
 
                     await base(**kwargs)
 
+    @pytest.mark.asyncio
+    async def test_success_file(self, handler):
+        seed_file = object()
+        seed_response = object()
+
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
+
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = mock_metadata()
+
+        repo_mock.get_seed_file = AsyncMock()
+        repo_mock.get_seed_file.return_value = seed_file
+
+        repo_mock.get_serialized_seed = AsyncMock()
+
+        create_seed_file_response_mock.reset_mock()
+        create_seed_file_response_mock.return_value = seed_response
+
+        result = await handler(seed_type=SeedType.RAW,
+                               accept_encoding="br",
+                               if_none_match=None,
+                               if_modified_since=None)
+
+        repo_mock.get_seed_file.assert_called_once_with(
+            identifier="testid", seed_type=SeedType.RAW)
+        repo_mock.get_serialized_seed.assert_not_called()
+
+        call_kwargs = create_seed_file_response_mock.call_args.kwargs
+
+        assert call_kwargs["seed_file"] == seed_file
+        assert call_kwargs["accept_encoding"] == "br"
+        assert call_kwargs["headers"]["ETag"] == create_etag("hash_testid")
+
+        assert result == seed_response
+
     @pytest.mark.asyncio
     async def test_success_download(self, handler):
 
         async def base(**kwargs):
-            repo_mock.get_seed_identifier_by_week_offset = Mock()
+            repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
             repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
 
             result = await handler(**kwargs)
@@ -115,11 +261,78 @@ class TestGetSeed:
 
                 await base(**kwargs)
 
+    @pytest.mark.asyncio
+    async def test_throws_noidentifier(self, handler):
+
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = None
+
+        with pytest.raises(HTTPException):
+            await handler(seed_type=SeedType.RAW, accept_encoding=None)
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, handler):
+
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
+
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = mock_metadata()
+
+        repo_mock.get_serialized_seed = AsyncMock()
+
+        etag = create_etag("hash_testid")
+
+        cases = (
+            {
+                "if_none_match": etag,
+                "if_modified_since": None
+            },
+            {
+                "if_none_match": None,
+                "if_modified_since": "Sun, 17 Jul 2022 00:00:00 GMT"
+            },
+        )
+
+        for case in cases:
+            result = await handler(seed_type=SeedType.RAW,
+                                   accept_encoding=None,
+                                   **case)
+
+            assert result.status_code == 304
+            assert result.headers.get("etag") == etag
+
+        repo_mock.get_serialized_seed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_throws_nometadata(self, handler):
+
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
+
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = None
+
+        with pytest.raises(HTTPException):
+            await handler(seed_type=SeedType.RAW, accept_encoding=None)
+
     @pytest.mark.asyncio
     async def test_throws_noseed(self, handler):
 
-        repo_mock.get_seed_by_week_offset = Mock()
-        repo_mock.get_seed_by_week_offset.return_value = None
+        repo_mock.get_seed_identifier_by_week_offset = AsyncMock()
+        repo_mock.get_seed_identifier_by_week_offset.return_value = "testid"
+
+        repo_mock.get_seed_metadata = AsyncMock()
+        repo_mock.get_seed_metadata.return_value = mock_metadata()
+
+        repo_mock.get_seed_file = AsyncMock()
+        repo_mock.get_seed_file.return_value = None
+
+        repo_mock.get_serialized_seed = AsyncMock()
+        repo_mock.get_serialized_seed.return_value = None
 
         with pytest.raises(HTTPException):
-            await handler(seed_type=SeedType.RAW)
+            await handler(seed_type=SeedType.RAW,
+                          accept_encoding=None,
+                          if_none_match=None,
+                          if_modified_since=None)
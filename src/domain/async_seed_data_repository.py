@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from src.domain.mongo_pool_monitor import PoolStats
+from src.domain.seed_data_repository import SeedDataRepository
+from src.model.raid_data import RaidSeed
+from src.model.seed_metadata import SeedMetadata
+from src.model.seed_type import SeedType
+from src.utils.raid_info_index import RaidInfoIndex
+from src.utils.seed_file import SeedFile
+from src.utils.serialized_seed import SerializedSeed
+from src.utils.sort_order import SortOrder
+from src.utils.swr_cache import CacheStats
+
+# mirrors the SeedDataRepository interface method for method
+# pylint: disable=duplicate-code
+
+
+class AsyncSeedDataRepository(ABC):
+
+    async def startup(self) -> None:
+        """Called once the app starts, on the server's event loop."""
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Only repositories which cache seeds return any."""
+        return None
+
+    @property
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Only repositories which pool connections return any."""
+        return None
+
+    @abstractmethod
+    async def list_seed_identifiers(
+            self,
+            *,
+            seed_type: SeedType = SeedType.RAW,
+            sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[str]:
+        pass
+
+    @abstractmethod
+    async def get_seed_identifier_by_week_offset(
+            self,
+            *,
+            seed_type: SeedType = SeedType.RAW,
+            offset_weeks: int = 0) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def get_seed_by_identifier(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[RaidSeed]:
+        pass
+
+    @abstractmethod
+    async def get_seed_by_week_offset(
+        self,
+        *,
+        seed_type: SeedType = SeedType.RAW,
+        offset_weeks: int = 0,
+    ) -> Optional[RaidSeed]:
+        pass
+
+    @abstractmethod
+    async def get_seed_metadata(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SeedMetadata]:
+        pass
+
+    @abstractmethod
+    async def list_seed_metadata(
+            self,
+            *,
+            seed_type: SeedType = SeedType.RAW,
+            sort_order: SortOrder = SortOrder.ASCENDING
+    ) -> Tuple[SeedMetadata]:
+        pass
+
+    @abstractmethod
+    async def get_serialized_seed(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SerializedSeed]:
+        pass
+
+    async def get_seed_file(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SeedFile]:
+        """Only repositories which store seeds as files return one."""
+        # pylint: disable=unused-argument
+        return None
+
+    @abstractmethod
+    async def get_raid_info_index(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[RaidInfoIndex]:
+        pass
+
+    @abstractmethod
+    async def list_seeds(
+            self,
+            *,
+            seed_type: SeedType = SeedType.RAW,
+            sort_order: SortOrder = SortOrder.ASCENDING) -> List[RaidSeed]:
+        pass
+
+    @abstractmethod
+    async def save_seed(self, *, identifier: str, seed_type: SeedType,
+                        data: RaidSeed) -> None:
+        pass
+
+    @abstractmethod
+    async def save_seeds(self, *, items: Tuple[Tuple[str, SeedType,
+                                                     RaidSeed]]) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_seed(self, *, identifier: str,
+                          seed_type: SeedType) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_seeds(self, *, items: Tuple[Tuple[str,
+                                                       SeedType]]) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_seeds_older_than(self, *, days: int) -> None:
+        pass
+
+
+class ThreadedSeedDataRepository(AsyncSeedDataRepository):
+    """Runs a blocking SeedDataRepository in the threadpool."""
+
+    def __init__(self, *, repo: SeedDataRepository) -> None:
+        super().__init__()
+
+        self._repo = repo
+
+    async def startup(self) -> None:
+        await run_in_threadpool(self._repo.startup)
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self._repo.cache_stats
+
+    @property
+    def pool_stats(self) -> Optional[PoolStats]:
+        return self._repo.pool_stats
+
+    async def list_seed_identifiers(self, **kwargs) -> Tuple[str]:
+        return await run_in_threadpool(self._repo.list_seed_identifiers,
+                                       **kwargs)
+
+    async def get_seed_identifier_by_week_offset(self,
+                                                 **kwargs) -> Optional[str]:
+        return await run_in_threadpool(
+            self._repo.get_seed_identifier_by_week_offset, **kwargs)
+
+    async def get_seed_by_identifier(self, **kwargs) -> Optional[RaidSeed]:
+        return await run_in_threadpool(self._repo.get_seed_by_identifier,
+                                       **kwargs)
+
+    async def get_seed_by_week_offset(self, **kwargs) -> Optional[RaidSeed]:
+        return await run_in_threadpool(self._repo.get_seed_by_week_offset,
+                                       **kwargs)
+
+    async def get_seed_metadata(self, **kwargs) -> Optional[SeedMetadata]:
+        return await run_in_threadpool(self._repo.get_seed_metadata, **kwargs)
+
+    async def list_seed_metadata(self, **kwargs) -> Tuple[SeedMetadata]:
+        return await run_in_threadpool(self._repo.list_seed_metadata, **kwargs)
+
+    async def get_serialized_seed(self, **kwargs) -> Optional[SerializedSeed]:
+        return await run_in_threadpool(self._repo.get_serialized_seed,
+                                       **kwargs)
+
+    async def get_seed_file(self, **kwargs) -> Optional[SeedFile]:
+        return await run_in_threadpool(self._repo.get_seed_file, **kwargs)
+
+    async def get_raid_info_index(self, **kwargs) -> Optional[RaidInfoIndex]:
+        return await run_in_threadpool(self._repo.get_raid_info_index,
+                                       **kwargs)
+
+    async def list_seeds(self, **kwargs) -> List[RaidSeed]:
+        return await run_in_threadpool(self._repo.list_seeds, **kwargs)
+
+    async def save_seed(self, **kwargs) -> None:
+        return await run_in_threadpool(self._repo.save_seed, **kwargs)
+
+    async def save_seeds(self, **kwargs) -> None:
+        return await run_in_threadpool(self._repo.save_seeds, **kwargs)
+
+    async def delete_seed(self, **kwargs) -> None:
+        return await run_in_threadpool(self._repo.delete_seed, **kwargs)
+
+    async def delete_seeds(self, **kwargs) -> None:
+        return await run_in_threadpool(self._repo.delete_seeds, **kwargs)
+
+    async def delete_seeds_older_than(self, **kwargs) -> None:
+        return await run_in_threadpool(self._repo.delete_seeds_older_than,
+                                       **kwargs)
@@ -1,55 +1,138 @@
 import json
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterator, Optional, Tuple, Union
+from typing import (Any, Callable, ContextManager, Dict, Hashable, List,
+                    Optional, Tuple, TypeVar, Union)
 
+from cachetools import LRUCache
 from fastapi.encoders import jsonable_encoder
-from src.domain.seed_data_repository import SeedDataRepository
+from src.domain.filesystem_seed_manifest import (SEED_FILE_SUFFIXES,
+                                                 ManifestEntry, SeedManifest,
+                                                 seed_filepath)
+from src.domain.seed_data_repository import (SeedDataRepository,
+                                             SeedDuplicateError,
+                                             SeedNotFoundError)
 from src.model.raid_data import RaidSeed
+from src.model.seed_metadata import SeedMetadata
 from src.model.seed_type import SeedType
+from src.utils.atomic_write import write_bytes_atomic
+from src.utils.bulk_load import load_json_bulk, loads_json
+from src.utils.content_encoding import ContentEncoding, compress, decompress
+from src.utils.file_lock import file_lock
+from src.utils.raid_info_index import RaidInfoIndex, build_raid_info_index
+from src.utils.seed_date import get_ids_older_than
+from src.utils.seed_file import SeedFile
+from src.utils.serialized_seed import SerializedSeed, create_serialized_seed
 from src.utils.sort_order import SortOrder
 
+LOCK_FILENAME = ".lock"
 
-def _filepath_generator(*, dir_path: Path) -> Iterator[Path]:
-    yield from filter(Path.is_file, dir_path.iterdir())
+METADATA_CACHE_MAXSIZE = 1024
+SEED_CACHE_MAXSIZE = 32
 
+T = TypeVar("T")
 
-def _load_from_json_file(*, filepath: Path) -> RaidSeed:
-    with open(filepath, mode='r', encoding='utf-8') as file:
-        return json.load(file)
 
+def _read_seed_file(*, filepath: Path, encoding: ContentEncoding) -> bytes:
+    return decompress(body=filepath.read_bytes(), encoding=encoding)
 
-def _save_to_json_file(*, filepath: Path, data: Any) -> bool:
-    with open(filepath, mode='w', encoding='utf-8') as file:
-        json.dump(jsonable_encoder(data), file)
 
-    return True
+def _serialize_to_json(*, data: Any) -> bytes:
+    return json.dumps(jsonable_encoder(data)).encode("utf-8")
 
 
 class FSSeedDataRepository(SeedDataRepository):
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+            self,
+            *,
+            base_path: Union[str, Path],
+            storage_encoding: ContentEncoding = ContentEncoding.IDENTITY
+    ) -> None:
+        """Seeds are saved in storage_encoding. Seeds stored in any other
+        encoding are still read."""
 
-    def __init__(self, *, base_path: Union[str, Path]) -> None:
         super().__init__()
 
         self.base_path = Path(base_path)
+        self.storage_encoding = storage_encoding
 
         self.dir_raw: Path = self.base_path / SeedType.RAW.value
         self.dir_enhanced: Path = self.base_path / SeedType.ENHANCED.value
 
+        self._manifest = SeedManifest(base_path=self.base_path)
+
+        # keyed by manifest entries, a seed changed by another instance
+        # misses the cache instead of serving the old one
+        self._cache_lock = threading.Lock()
+        self._seed_metadata = LRUCache(maxsize=METADATA_CACHE_MAXSIZE)
+        self._serialized_seeds = LRUCache(maxsize=SEED_CACHE_MAXSIZE)
+        self._raid_info_indexes = LRUCache(maxsize=SEED_CACHE_MAXSIZE)
+
+    def _lock(self) -> ContextManager[None]:
+        # one lock for all seed types, raw and enhanced seeds are saved
+        # together
+        return file_lock(path=self.base_path / LOCK_FILENAME)
+
+    def _filepaths(self, *, identifier: str,
+                   seed_type: SeedType) -> Tuple[Path, ...]:
+
+        dir_path = self.base_path / seed_type.value
+
+        return tuple(
+            seed_filepath(
+                dir_path=dir_path, identifier=identifier, encoding=encoding)
+            for encoding in SEED_FILE_SUFFIXES)
+
+    def _read_entry(self, *, identifier: str, seed_type: SeedType,
+                    entry: ManifestEntry) -> bytes:
+
+        filepath = seed_filepath(dir_path=self.base_path / seed_type.value,
+                                 identifier=identifier,
+                                 encoding=entry.encoding)
+
+        return _read_seed_file(filepath=filepath, encoding=entry.encoding)
+
+    def _read_body(self, *, identifier: str,
+                   seed_type: SeedType) -> Optional[bytes]:
+
+        entry = self._manifest.get(identifier=identifier, seed_type=seed_type)
+
+        if entry is None:
+            return None
+
+        return self._read_entry(identifier=identifier,
+                                seed_type=seed_type,
+                                entry=entry)
+
+    def _cached(self, *, cache: LRUCache, key: Hashable,
+                load: Callable[[], T]) -> T:
+        # LRUCache is not thread safe, loading runs outside of the lock
+        with self._cache_lock:
+            if key in cache:
+                return cache[key]
+
+        value = load()
+
+        with self._cache_lock:
+            cache[key] = value
+
+        return value
+
     def list_seed_identifiers(
             self,
             *,
             seed_type: SeedType = SeedType.RAW,
             sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[str]:
 
-        dir_path = self.base_path / seed_type.value
-
-        path_iterator = _filepath_generator(dir_path=dir_path)
-
-        id_iterator = map(lambda path: path.stem, path_iterator)
+        ids = self._manifest.identifiers(seed_type=seed_type)
 
-        reverse = sort_order == SortOrder.DESCENDING
+        if sort_order == SortOrder.DESCENDING:
+            return ids[::-1]
 
-        return tuple(sorted(id_iterator, reverse=reverse))
+        return ids
 
     def get_seed_identifier_by_week_offset(
             self,
@@ -57,28 +140,27 @@ class FSSeedDataRepository(SeedDataRepository):
             seed_type: SeedType = SeedType.RAW,
             offset_weeks: int = 0) -> Optional[str]:
 
-        ids = self.list_seed_identifiers(seed_type=seed_type,
-                                         sort_order=SortOrder.DESCENDING)
+        ids = self._manifest.identifiers(seed_type=seed_type)
 
         offset_weeks = abs(offset_weeks)
 
-        try:
-            return ids[offset_weeks]
-        except IndexError:
+        if offset_weeks >= len(ids):
             return None
 
+        return ids[-1 - offset_weeks]
+
     def get_seed_by_identifier(
             self,
             *,
             identifier: str,
             seed_type: SeedType = SeedType.RAW) -> Optional[RaidSeed]:
 
-        filepath = self.base_path / seed_type.value / f"{identifier}.json"
+        body = self._read_body(identifier=identifier, seed_type=seed_type)
 
-        if not filepath.is_file():
+        if body is None:
             return None
 
-        return _load_from_json_file(filepath=filepath)
+        return loads_json(body)
 
     def get_seed_by_week_offset(
         self,
@@ -88,26 +170,136 @@ class FSSeedDataRepository(SeedDataRepository):
     ) -> Optional[RaidSeed]:
 
         identifier = self.get_seed_identifier_by_week_offset(
-            offset_weeks=offset_weeks)
+            seed_type=seed_type, offset_weeks=offset_weeks)
 
         return self.get_seed_by_identifier(identifier=identifier,
                                            seed_type=seed_type)
 
+    def get_seed_metadata(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SeedMetadata]:
+
+        entry = self._manifest.get(identifier=identifier, seed_type=seed_type)
+
+        if entry is None:
+            return None
+
+        def load() -> SeedMetadata:
+            last_modified = datetime.fromtimestamp(entry.mtime,
+                                                   tz=timezone.utc)
+
+            return SeedMetadata(identifier=identifier,
+                                seed_type=seed_type,
+                                content_hash=entry.content_hash,
+                                last_modified=last_modified)
+
+        return self._cached(cache=self._seed_metadata,
+                            key=(identifier, seed_type, entry),
+                            load=load)
+
+    def list_seed_metadata(
+            self,
+            *,
+            seed_type: SeedType = SeedType.RAW,
+            sort_order: SortOrder = SortOrder.ASCENDING
+    ) -> Tuple[SeedMetadata]:
+
+        identifiers = self.list_seed_identifiers(seed_type=seed_type,
+                                                 sort_order=sort_order)
+
+        return tuple(
+            self.get_seed_metadata(identifier=identifier, seed_type=seed_type)
+            for identifier in identifiers)
+
+    def get_serialized_seed(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SerializedSeed]:
+
+        entry = self._manifest.get(identifier=identifier, seed_type=seed_type)
+
+        if entry is None:
+            return None
+
+        def load() -> SerializedSeed:
+            # the stored body is served as is, without decoding the json
+            return create_serialized_seed(body=self._read_entry(
+                identifier=identifier, seed_type=seed_type, entry=entry))
+
+        # equal seeds share one entry
+        return self._cached(cache=self._serialized_seeds,
+                            key=entry.content_hash,
+                            load=load)
+
+    def get_seed_file(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SeedFile]:
+
+        entry = self._manifest.get(identifier=identifier, seed_type=seed_type)
+
+        if entry is None:
+            return None
+
+        filepath = seed_filepath(dir_path=self.base_path / seed_type.value,
+                                 identifier=identifier,
+                                 encoding=entry.encoding)
+
+        return SeedFile(paths={entry.encoding: filepath})
+
+    def get_raid_info_index(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[RaidInfoIndex]:
+
+        entry = self._manifest.get(identifier=identifier, seed_type=seed_type)
+
+        if entry is None:
+            return None
+
+        def load() -> RaidInfoIndex:
+            return build_raid_info_index(data=loads_json(
+                self._read_entry(
+                    identifier=identifier, seed_type=seed_type, entry=entry)))
+
+        return self._cached(cache=self._raid_info_indexes,
+                            key=entry.content_hash,
+                            load=load)
+
     def list_seeds(
             self,
             *,
             seed_type: SeedType = SeedType.RAW,
             sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[RaidSeed]:
 
-        identifiers = self.list_seed_identifiers(sort_order=sort_order)
+        identifiers = self.list_seed_identifiers(seed_type=seed_type,
+                                                 sort_order=sort_order)
 
         dir_path = self.base_path / seed_type.value
 
-        def load_by_id(identifier: str):
-            path = dir_path / f"{identifier}.json"
-            return _load_from_json_file(filepath=path)
+        # resolved up front, only the reads run in the thread pool
+        files: List[Tuple[Path, ContentEncoding]] = []
+
+        for identifier in identifiers:
+            entry = self._manifest.get(identifier=identifier,
+                                       seed_type=seed_type)
+
+            filepath = seed_filepath(dir_path=dir_path,
+                                     identifier=identifier,
+                                     encoding=entry.encoding)
 
-        return tuple(map(load_by_id, identifiers))
+            files.append((filepath, entry.encoding))
+
+        def read(file: Tuple[Path, ContentEncoding]) -> bytes:
+            filepath, encoding = file
+            return _read_seed_file(filepath=filepath, encoding=encoding)
+
+        return load_json_bulk(items=files, read=read)
 
     def save_seed(self,
                   *,
@@ -115,45 +307,135 @@ class FSSeedDataRepository(SeedDataRepository):
                   seed_type: SeedType = SeedType.RAW,
                   data: RaidSeed) -> bool:
 
-        filepath = self.base_path / seed_type.value / f"{identifier}.json"
-
-        if filepath.exists():
-            return False
-
-        return _save_to_json_file(filepath=filepath, data=data)
+        return self.save_seeds(items=((identifier, seed_type, data), ))
 
     def save_seeds(self, *, items: Tuple[Tuple[str, SeedType,
                                                RaidSeed]]) -> bool:
 
-        def save_item(item: Tuple[str, SeedType, RaidSeed]) -> bool:
+        # serialized up front, failing to encode a seed writes nothing
+        payload = tuple((identifier, seed_type,
+                         compress(body=_serialize_to_json(data=data),
+                                  encoding=self.storage_encoding))
+                        for (identifier, seed_type, data) in items)
+
+        with self._lock():
+            for (identifier, seed_type, _) in payload:
+                filepaths = self._filepaths(identifier=identifier,
+                                            seed_type=seed_type)
+
+                if any(filepath.exists() for filepath in filepaths):
+                    raise SeedDuplicateError(
+                        f"Seed {identifier}.{seed_type.value} already exists")
+
+            written: List[Path] = []
+
+            try:
+                for (identifier, seed_type, body) in payload:
+                    dir_path = self.base_path / seed_type.value
+
+                    filepath = seed_filepath(dir_path=dir_path,
+                                             identifier=identifier,
+                                             encoding=self.storage_encoding)
 
-            identifier, seed_type, data = item
+                    try:
+                        write_bytes_atomic(filepath=filepath,
+                                           data=body,
+                                           exclusive=True)
+                    except FileExistsError as err:
+                        raise SeedDuplicateError(
+                            f"Seed {identifier}.{seed_type.value} "
+                            "already exists") from err
 
-            return self.save_seed(identifier=identifier,
-                                  seed_type=seed_type,
-                                  data=data)
+                    written.append(filepath)
+            except BaseException:
+                # all or nothing, like the transaction of the mongo repository
+                for filepath in written:
+                    filepath.unlink(missing_ok=True)
 
-        return all(list(map(save_item, items)))
+                raise
+
+            saved: Dict[SeedType, List[str]] = {}
+
+            for (identifier, seed_type, _) in payload:
+                saved.setdefault(seed_type, []).append(identifier)
+
+            # one manifest write per seed type instead of one per seed
+            for seed_type, identifiers in saved.items():
+                self._manifest.update(identifiers=identifiers,
+                                      seed_type=seed_type)
+
+        return True
 
     def delete_seed(self,
                     *,
                     identifier: str,
                     seed_type: SeedType = SeedType.RAW) -> bool:
 
-        filepath = self.base_path / seed_type.value / f"{identifier}.json"
+        with self._lock():
+            deleted = False
+
+            for filepath in self._filepaths(identifier=identifier,
+                                            seed_type=seed_type):
+                try:
+                    filepath.unlink()
+                    deleted = True
+                except FileNotFoundError:
+                    pass
+
+            if not deleted:
+                return False
 
-        try:
-            filepath.unlink()
-            return True
-        except FileNotFoundError:
-            return False
+            self._manifest.update(identifiers=(identifier, ),
+                                  seed_type=seed_type)
+
+        return True
 
     def delete_seeds(self, *, items: Tuple[Tuple[str, SeedType]]) -> bool:
 
-        def delete_item(item: Tuple[str, SeedType]) -> bool:
+        items = tuple(items)
+
+        # one manifest lookup per seed type instead of a stat per item
+        seed_types = {seed_type for (_, seed_type) in items}
+
+        with self._lock():
+            stored = {
+                seed_type: set(self.list_seed_identifiers(seed_type=seed_type))
+                for seed_type in seed_types
+            }
+
+            deleted: Dict[SeedType, List[str]] = {}
+
+            # all or nothing, like the transaction of the mongo repository
+            for (identifier, seed_type) in items:
+                # repeated items are only found once
+                if identifier not in stored[seed_type]:
+                    raise SeedNotFoundError(
+                        f"Seed {identifier}.{seed_type.value} not found")
+
+                stored[seed_type].remove(identifier)
+
+                deleted.setdefault(seed_type, []).append(identifier)
+
+            for seed_type, identifiers in deleted.items():
+                for identifier in identifiers:
+                    for filepath in self._filepaths(identifier=identifier,
+                                                    seed_type=seed_type):
+                        filepath.unlink(missing_ok=True)
+
+                self._manifest.update(identifiers=identifiers,
+                                      seed_type=seed_type)
+
+        return True
+
+    def delete_seeds_older_than(self, *, days: int) -> bool:
+
+        items = []
 
-            identifier, seed_type = item
+        for seed_type in SeedType:
+            ids = self.list_seed_identifiers(seed_type=seed_type)
 
-            return self.delete_seed(identifier=identifier, seed_type=seed_type)
+            items.extend(
+                (identifier, seed_type)
+                for identifier in get_ids_older_than(ids=ids, days=days))
 
-        return all(list(map(delete_item, items)))
+        return self.delete_seeds(items=items)
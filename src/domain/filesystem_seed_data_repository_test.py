@@ -0,0 +1,201 @@
+from test.mocks import mock_raid_seed_enhanced, mock_raid_seed_raw
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from src.domain.filesystem_seed_data_repository import (SEED_CACHE_MAXSIZE,
+                                                        FSSeedDataRepository)
+from src.domain.seed_data_repository import (SeedDuplicateError,
+                                             SeedNotFoundError)
+from src.model.seed_type import SeedType
+from src.utils.content_encoding import ContentEncoding
+from src.utils.sort_order import SortOrder
+
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    for seed_type in SeedType:
+        (tmp_path / seed_type.value).mkdir()
+
+    return tmp_path
+
+
+@pytest.fixture
+def repo(base_path):
+    return FSSeedDataRepository(base_path=base_path)
+
+
+def test_save_seeds(repo):
+    repo.save_seeds(items=(
+        ("raid_seed_20220717", SeedType.RAW, mock_raid_seed_raw()),
+        ("raid_seed_20220717", SeedType.ENHANCED, mock_raid_seed_enhanced()),
+    ))
+
+    for seed_type in SeedType:
+        assert repo.list_seed_identifiers(
+            seed_type=seed_type) == ("raid_seed_20220717", )
+
+    with pytest.raises(SeedDuplicateError):
+        repo.save_seed(identifier="raid_seed_20220717",
+                       seed_type=SeedType.RAW,
+                       data=mock_raid_seed_raw())
+
+
+def test_save_seeds_all_or_nothing(repo):
+    repo.save_seed(identifier="raid_seed_20220717",
+                   seed_type=SeedType.ENHANCED,
+                   data=mock_raid_seed_enhanced())
+
+    with pytest.raises(SeedDuplicateError):
+        repo.save_seeds(items=(
+            ("raid_seed_20220717", SeedType.RAW, mock_raid_seed_raw()),
+            ("raid_seed_20220717", SeedType.ENHANCED,
+             mock_raid_seed_enhanced()),
+        ))
+
+    assert repo.list_seed_identifiers(seed_type=SeedType.RAW) == ()
+
+    # duplicates within one call are only found while writing
+    with pytest.raises(SeedDuplicateError):
+        repo.save_seeds(items=(
+            ("raid_seed_20220724", SeedType.RAW, mock_raid_seed_raw()),
+            ("raid_seed_20220724", SeedType.RAW, mock_raid_seed_raw()),
+        ))
+
+    assert repo.list_seed_identifiers(seed_type=SeedType.RAW) == ()
+    assert not any(
+        path.name.startswith(".raid_seed")
+        for path in (repo.base_path / SeedType.RAW.value).iterdir())
+
+
+def test_delete_seeds_all_or_nothing(repo):
+    repo.save_seeds(items=(
+        ("raid_seed_20220717", SeedType.RAW, mock_raid_seed_raw()),
+        ("raid_seed_20220717", SeedType.ENHANCED, mock_raid_seed_enhanced()),
+    ))
+
+    found = ("raid_seed_20220717", SeedType.RAW)
+
+    # a missing seed, and a repeated one which is only found once
+    for missing in (("raid_seed_20220724", SeedType.ENHANCED), found):
+        with pytest.raises(SeedNotFoundError, match=missing[0]):
+            repo.delete_seeds(items=(found, missing))
+
+        for seed_type in SeedType:
+            assert repo.list_seed_identifiers(
+                seed_type=seed_type) == ("raid_seed_20220717", )
+
+        assert repo.get_serialized_seed(identifier="raid_seed_20220717",
+                                        seed_type=SeedType.RAW) is not None
+
+    assert repo.delete_seeds(items=(
+        ("raid_seed_20220717", SeedType.RAW),
+        ("raid_seed_20220717", SeedType.ENHANCED),
+    ))
+
+    for seed_type in SeedType:
+        assert repo.list_seed_identifiers(seed_type=seed_type) == ()
+
+
+def test_storage_encoding(base_path):
+    repo = FSSeedDataRepository(base_path=base_path,
+                                storage_encoding=ContentEncoding.GZIP)
+
+    data = mock_raid_seed_raw()
+
+    repo.save_seed(identifier="raid_seed_20220717",
+                   seed_type=SeedType.RAW,
+                   data=data)
+
+    assert (base_path / SeedType.RAW.value /
+            "raid_seed_20220717.json.gz").is_file()
+
+    # readable whatever encoding a repository saves in
+    for reader in (repo, FSSeedDataRepository(base_path=base_path)):
+        assert reader.get_seed_by_identifier(
+            identifier="raid_seed_20220717") == jsonable_encoder(data)
+
+        seed_file = reader.get_seed_file(identifier="raid_seed_20220717")
+
+        assert tuple(seed_file.paths) == (ContentEncoding.GZIP, )
+
+        serialized = reader.get_serialized_seed(
+            identifier="raid_seed_20220717")
+        metadata = reader.get_seed_metadata(identifier="raid_seed_20220717")
+
+        assert serialized.content_hash == metadata.content_hash
+
+    with pytest.raises(SeedDuplicateError):
+        FSSeedDataRepository(base_path=base_path).save_seed(
+            identifier="raid_seed_20220717", seed_type=SeedType.RAW, data=data)
+
+    assert repo.delete_seed(identifier="raid_seed_20220717",
+                            seed_type=SeedType.RAW)
+    assert repo.list_seed_identifiers() == ()
+
+
+def test_caches_follow_other_instances(base_path):
+    writer = FSSeedDataRepository(base_path=base_path)
+    reader = FSSeedDataRepository(base_path=base_path)
+
+    for data in (mock_raid_seed_raw(), mock_raid_seed_raw()):
+        writer.delete_seed(identifier="raid_seed_20220717",
+                           seed_type=SeedType.RAW)
+        writer.save_seed(identifier="raid_seed_20220717",
+                         seed_type=SeedType.RAW,
+                         data=data)
+
+        serialized = reader.get_serialized_seed(
+            identifier="raid_seed_20220717")
+        metadata = reader.get_seed_metadata(identifier="raid_seed_20220717")
+        index = reader.get_raid_info_index(identifier="raid_seed_20220717")
+
+        assert serialized.body == writer.get_serialized_seed(
+            identifier="raid_seed_20220717").body
+        assert metadata.content_hash == serialized.content_hash
+        assert index == writer.get_raid_info_index(
+            identifier="raid_seed_20220717")
+
+
+def test_caches_bounded(repo):
+    identifiers = tuple(f"raid_seed_2022{month:02}{day:02}"
+                        for month in range(1, 13) for day in (3, 10, 17, 24))
+
+    repo.save_seeds(items=[(identifier, SeedType.RAW, mock_raid_seed_raw())
+                           for identifier in identifiers])
+
+    for identifier in identifiers:
+        repo.get_serialized_seed(identifier=identifier)
+        repo.get_raid_info_index(identifier=identifier)
+
+    # pylint: disable=protected-access
+    assert len(repo._serialized_seeds) == SEED_CACHE_MAXSIZE
+    assert len(repo._raid_info_indexes) == SEED_CACHE_MAXSIZE
+
+
+def test_list_seeds(repo):
+    identifiers = ("raid_seed_20220710", "raid_seed_20220717",
+                   "raid_seed_20220724", "raid_seed_20220731",
+                   "raid_seed_20220807")
+
+    seeds = {identifier: mock_raid_seed_raw() for identifier in identifiers}
+
+    repo.save_seeds(items=[(identifier, SeedType.RAW, data)
+                           for identifier, data in seeds.items()])
+    repo.save_seed(identifier="raid_seed_20220703",
+                   seed_type=SeedType.ENHANCED,
+                   data=mock_raid_seed_enhanced())
+
+    expected = tuple(
+        jsonable_encoder(seeds[identifier]) for identifier in identifiers)
+
+    assert repo.list_seeds(seed_type=SeedType.RAW) == expected
+    assert repo.list_seeds(seed_type=SeedType.RAW,
+                           sort_order=SortOrder.DESCENDING) == expected[::-1]
+
+    assert len(repo.list_seeds(seed_type=SeedType.ENHANCED)) == 1
+
+    assert repo.get_seed_by_week_offset(
+        seed_type=SeedType.ENHANCED) == repo.get_seed_by_identifier(
+            identifier="raid_seed_20220703", seed_type=SeedType.ENHANCED)
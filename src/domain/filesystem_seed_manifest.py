@@ -0,0 +1,254 @@
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.model.seed_type import SeedType
+from src.utils.atomic_write import write_bytes_atomic
+from src.utils.content_encoding import ContentEncoding, decompress
+from src.utils.serialized_seed import compute_content_hash
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 2
+
+# a seed stored in more than one encoding is read from the first one
+SEED_FILE_SUFFIXES = {
+    ContentEncoding.IDENTITY: ".json",
+    ContentEncoding.GZIP: ".json.gz",
+    ContentEncoding.BROTLI: ".json.br",
+}
+
+_ORDER = tuple(SEED_FILE_SUFFIXES)
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """content_hash is the hash of the decoded JSON body, so it does not
+    change with the encoding a seed is stored in."""
+
+    size: int
+    content_hash: str
+    mtime: float
+    encoding: ContentEncoding
+
+
+def seed_filepath(*, dir_path: Path, identifier: str,
+                  encoding: ContentEncoding) -> Path:
+    return dir_path / f"{identifier}{SEED_FILE_SUFFIXES[encoding]}"
+
+
+def _parse_seed_filename(
+        *, filename: str) -> Optional[Tuple[str, ContentEncoding]]:
+    for encoding, suffix in SEED_FILE_SUFFIXES.items():
+        if filename.endswith(suffix) and not filename.startswith("."):
+            return filename[:-len(suffix)], encoding
+
+    return None
+
+
+def _scan_entry(*, filepath: Path, encoding: ContentEncoding,
+                previous: Optional[ManifestEntry]) -> ManifestEntry:
+    stat = filepath.stat()
+
+    # unchanged files keep their hash instead of being read again
+    if (previous is not None and previous.encoding == encoding
+            and previous.size == stat.st_size
+            and previous.mtime == stat.st_mtime):
+        return previous
+
+    body = decompress(body=filepath.read_bytes(), encoding=encoding)
+
+    return ManifestEntry(size=stat.st_size,
+                         content_hash=compute_content_hash(body=body),
+                         mtime=stat.st_mtime,
+                         encoding=encoding)
+
+
+def _map_entry_to_document(*, entry: ManifestEntry) -> dict:
+    return {**asdict(entry), "encoding": entry.encoding.value}
+
+
+def _map_document_to_entry(*, document: dict) -> ManifestEntry:
+    return ManifestEntry(size=document["size"],
+                         content_hash=document["content_hash"],
+                         mtime=document["mtime"],
+                         encoding=ContentEncoding(document["encoding"]))
+
+
+class _SeedTypeManifest:
+
+    def __init__(self, *, dir_path: Path) -> None:
+        self.dir_path = dir_path
+
+        self.dir_mtime_ns: Optional[int] = None
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.identifiers: Tuple[str, ...] = ()
+
+    def stat_dir(self) -> Optional[int]:
+        try:
+            return self.dir_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def set_entries(self, *, entries: Dict[str, ManifestEntry]) -> None:
+        self.entries = entries
+        self.identifiers = tuple(sorted(entries))
+
+    def scan(self) -> None:
+        try:
+            filepaths = tuple(self.dir_path.iterdir())
+        except FileNotFoundError:
+            filepaths = ()
+
+        encodings: Dict[str, ContentEncoding] = {}
+
+        for filepath in filepaths:
+            parsed = _parse_seed_filename(filename=filepath.name)
+
+            if parsed is None or not filepath.is_file():
+                continue
+
+            identifier, encoding = parsed
+            current = encodings.get(identifier)
+
+            if (current is None
+                    or _ORDER.index(encoding) < _ORDER.index(current)):
+                encodings[identifier] = encoding
+
+        entries = {}
+
+        for identifier, encoding in encodings.items():
+            filepath = seed_filepath(dir_path=self.dir_path,
+                                     identifier=identifier,
+                                     encoding=encoding)
+
+            entries[identifier] = _scan_entry(
+                filepath=filepath,
+                encoding=encoding,
+                previous=self.entries.get(identifier))
+
+        self.set_entries(entries=entries)
+
+    def find(self, *, identifier: str) -> Optional[ContentEncoding]:
+        for encoding in SEED_FILE_SUFFIXES:
+            filepath = seed_filepath(dir_path=self.dir_path,
+                                     identifier=identifier,
+                                     encoding=encoding)
+
+            if filepath.is_file():
+                return encoding
+
+        return None
+
+
+class SeedManifest:
+    """Identifier, encoding, size, content hash and mtime of every seed
+    file, kept in
+    memory and in one manifest file next to the seed type directories.
+
+    A seed type is only rescanned when the mtime of its directory differs
+    from the one recorded with its entries, which catches files added,
+    removed or renamed by other processes.
+    """
+
+    def __init__(self, *, base_path: Path) -> None:
+        self.path = base_path / MANIFEST_FILENAME
+
+        self._manifests = {
+            seed_type: _SeedTypeManifest(dir_path=base_path / seed_type.value)
+            for seed_type in SeedType
+        }
+
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            document = json.loads(self.path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return
+
+        if document.get("version") != MANIFEST_VERSION:
+            return
+
+        for seed_type, manifest in self._manifests.items():
+            stored = document["seed_types"].get(seed_type.value)
+
+            if stored is None:
+                continue
+
+            manifest.dir_mtime_ns = stored["dir_mtime_ns"]
+            manifest.set_entries(
+                entries={
+                    identifier: _map_document_to_entry(document=entry)
+                    for identifier, entry in stored["entries"].items()
+                })
+
+    def _save(self) -> None:
+        document = {
+            "version": MANIFEST_VERSION,
+            "seed_types": {
+                seed_type.value: {
+                    "dir_mtime_ns": manifest.dir_mtime_ns,
+                    "entries": {
+                        identifier: _map_entry_to_document(entry=entry)
+                        for identifier, entry in manifest.entries.items()
+                    },
+                }
+                for seed_type, manifest in self._manifests.items()
+            },
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        write_bytes_atomic(filepath=self.path,
+                           data=json.dumps(document).encode("utf-8"))
+
+    def _refresh(self, *, seed_type: SeedType) -> _SeedTypeManifest:
+        manifest = self._manifests[seed_type]
+
+        dir_mtime_ns = manifest.stat_dir()
+
+        if dir_mtime_ns != manifest.dir_mtime_ns:
+            manifest.scan()
+            manifest.dir_mtime_ns = dir_mtime_ns
+
+            self._save()
+
+        return manifest
+
+    def identifiers(self, *, seed_type: SeedType) -> Tuple[str, ...]:
+        """Sorted ascending."""
+        return self._refresh(seed_type=seed_type).identifiers
+
+    def get(self, *, identifier: str,
+            seed_type: SeedType) -> Optional[ManifestEntry]:
+        return self._refresh(seed_type=seed_type).entries.get(identifier)
+
+    def update(self, *, identifiers: Iterable[str],
+               seed_type: SeedType) -> None:
+        """Rescans the given seed files after they were written or
+        removed by this process."""
+
+        manifest = self._refresh(seed_type=seed_type)
+
+        entries = dict(manifest.entries)
+
+        for identifier in identifiers:
+            encoding = manifest.find(identifier=identifier)
+
+            if encoding is None:
+                entries.pop(identifier, None)
+                continue
+
+            filepath = seed_filepath(dir_path=manifest.dir_path,
+                                     identifier=identifier,
+                                     encoding=encoding)
+
+            entries[identifier] = _scan_entry(filepath=filepath,
+                                              encoding=encoding,
+                                              previous=entries.get(identifier))
+
+        manifest.set_entries(entries=entries)
+        manifest.dir_mtime_ns = manifest.stat_dir()
+
+        self._save()
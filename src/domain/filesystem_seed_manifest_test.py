@@ -0,0 +1,146 @@
+import os
+from pathlib import Path
+
+from src.domain.filesystem_seed_manifest import MANIFEST_FILENAME, SeedManifest
+from src.model.seed_type import SeedType
+from src.utils.content_encoding import ContentEncoding, compress
+from src.utils.serialized_seed import compute_content_hash
+
+
+def _write_seed(*,
+                base_path: Path,
+                identifier: str,
+                body: bytes,
+                suffix: str = ".json") -> Path:
+    dir_path = base_path / SeedType.RAW.value
+    dir_path.mkdir(parents=True, exist_ok=True)
+
+    filepath = dir_path / f"{identifier}{suffix}"
+    filepath.write_bytes(body)
+
+    return filepath
+
+
+def _touch_dir(*, base_path: Path, mtime_ns: int) -> None:
+    # explicit, the clock behind directory mtimes can be too coarse to tick
+    os.utime(base_path / SeedType.RAW.value, ns=(mtime_ns, mtime_ns))
+
+
+def test_manifest_scan(tmp_path):
+    for identifier in ("raid_seed_20220724", "raid_seed_20220717"):
+        _write_seed(base_path=tmp_path, identifier=identifier, body=b"[]")
+
+    (tmp_path / SeedType.RAW.value / "notes.txt").write_text("not a seed")
+
+    manifest = SeedManifest(base_path=tmp_path)
+
+    assert manifest.identifiers(
+        seed_type=SeedType.RAW) == ("raid_seed_20220717", "raid_seed_20220724")
+    assert manifest.identifiers(seed_type=SeedType.ENHANCED) == ()
+
+    entry = manifest.get(identifier="raid_seed_20220717",
+                         seed_type=SeedType.RAW)
+
+    assert entry.size == 2
+    assert entry.content_hash == compute_content_hash(body=b"[]")
+
+    assert (tmp_path / MANIFEST_FILENAME).is_file()
+
+
+def test_manifest_reload(tmp_path):
+    filepath = _write_seed(base_path=tmp_path,
+                           identifier="raid_seed_20220717",
+                           body=b"[]")
+    _touch_dir(base_path=tmp_path, mtime_ns=1_000_000_000)
+
+    SeedManifest(base_path=tmp_path).identifiers(seed_type=SeedType.RAW)
+
+    # unchanged directory mtime, served from the manifest file
+    filepath.unlink()
+    _touch_dir(base_path=tmp_path, mtime_ns=1_000_000_000)
+
+    manifest = SeedManifest(base_path=tmp_path)
+
+    assert manifest.identifiers(
+        seed_type=SeedType.RAW) == ("raid_seed_20220717", )
+
+    # changed directory mtime, rescanned
+    _touch_dir(base_path=tmp_path, mtime_ns=2_000_000_000)
+
+    assert manifest.identifiers(seed_type=SeedType.RAW) == ()
+
+
+def test_manifest_external_change(tmp_path):
+    _write_seed(base_path=tmp_path,
+                identifier="raid_seed_20220717",
+                body=b"[]")
+    _touch_dir(base_path=tmp_path, mtime_ns=1_000_000_000)
+
+    manifest = SeedManifest(base_path=tmp_path)
+
+    assert manifest.identifiers(
+        seed_type=SeedType.RAW) == ("raid_seed_20220717", )
+
+    _write_seed(base_path=tmp_path,
+                identifier="raid_seed_20220724",
+                body=b"[]")
+    _touch_dir(base_path=tmp_path, mtime_ns=2_000_000_000)
+
+    assert manifest.identifiers(
+        seed_type=SeedType.RAW) == ("raid_seed_20220717", "raid_seed_20220724")
+
+
+def test_manifest_update(tmp_path):
+    manifest = SeedManifest(base_path=tmp_path)
+
+    filepath = _write_seed(base_path=tmp_path,
+                           identifier="raid_seed_20220717",
+                           body=b"[1]")
+    manifest.update(identifiers=("raid_seed_20220717", ),
+                    seed_type=SeedType.RAW)
+
+    entry = manifest.get(identifier="raid_seed_20220717",
+                         seed_type=SeedType.RAW)
+
+    assert entry.content_hash == compute_content_hash(body=b"[1]")
+
+    filepath.unlink()
+    manifest.update(identifiers=("raid_seed_20220717", ),
+                    seed_type=SeedType.RAW)
+
+    assert manifest.identifiers(seed_type=SeedType.RAW) == ()
+    assert SeedManifest(base_path=tmp_path).identifiers(
+        seed_type=SeedType.RAW) == ()
+
+
+def test_manifest_encodings(tmp_path):
+    body = b"[1]"
+
+    _write_seed(base_path=tmp_path, identifier="raid_seed_20220717", body=body)
+    _write_seed(base_path=tmp_path,
+                identifier="raid_seed_20220717",
+                body=compress(body=body, encoding=ContentEncoding.BROTLI),
+                suffix=".json.br")
+    _write_seed(base_path=tmp_path,
+                identifier="raid_seed_20220724",
+                body=compress(body=body, encoding=ContentEncoding.GZIP),
+                suffix=".json.gz")
+
+    manifest = SeedManifest(base_path=tmp_path)
+
+    assert manifest.identifiers(
+        seed_type=SeedType.RAW) == ("raid_seed_20220717", "raid_seed_20220724")
+
+    for identifier, encoding in (
+        ("raid_seed_20220717", ContentEncoding.IDENTITY),
+        ("raid_seed_20220724", ContentEncoding.GZIP),
+    ):
+        entry = manifest.get(identifier=identifier, seed_type=SeedType.RAW)
+
+        assert entry.encoding == encoding
+        assert entry.content_hash == compute_content_hash(body=body)
+
+    reloaded = SeedManifest(base_path=tmp_path).get(
+        identifier="raid_seed_20220724", seed_type=SeedType.RAW)
+
+    assert reloaded.encoding == ContentEncoding.GZIP
@@ -0,0 +1,45 @@
+import threading
+from typing import Any, Optional
+
+from bson.timestamp import Timestamp
+
+
+class CausalWriteTracker:
+    """Remembers the cluster and operation time of the latest write.
+
+    Sessions advanced to these times only read from members which have
+    applied all writes recorded so far, even on secondaries.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+        self._cluster_time: Optional[dict] = None
+        self._operation_time: Optional[Timestamp] = None
+
+    @property
+    def has_writes(self) -> bool:
+        return self._operation_time is not None
+
+    def record(self, *, session: Any) -> None:
+        operation_time = session.operation_time
+
+        if operation_time is None:
+            return
+
+        with self._lock:
+            if (self._operation_time is None
+                    or operation_time > self._operation_time):
+                self._cluster_time = session.cluster_time
+                self._operation_time = operation_time
+
+    def advance(self, *, session: Any) -> None:
+        with self._lock:
+            cluster_time = self._cluster_time
+            operation_time = self._operation_time
+
+        if cluster_time is not None:
+            session.advance_cluster_time(cluster_time)
+
+        if operation_time is not None:
+            session.advance_operation_time(operation_time)
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from bson.timestamp import Timestamp
+from src.domain.mongo_causal_writes import CausalWriteTracker
+
+
+def _session(*, time: int) -> SimpleNamespace:
+    return SimpleNamespace(cluster_time={"clusterTime": Timestamp(time, 1)},
+                           operation_time=Timestamp(time, 1))
+
+
+def test_record_latest():
+    tracker = CausalWriteTracker()
+
+    assert not tracker.has_writes
+
+    tracker.record(
+        session=SimpleNamespace(cluster_time=None, operation_time=None))
+
+    assert not tracker.has_writes
+
+    tracker.record(session=_session(time=2))
+    tracker.record(session=_session(time=1))
+
+    session = Mock()
+    tracker.advance(session=session)
+
+    assert tracker.has_writes
+
+    session.advance_cluster_time.assert_called_once_with(
+        {"clusterTime": Timestamp(2, 1)})
+    session.advance_operation_time.assert_called_once_with(Timestamp(2, 1))
+
+
+def test_advance_without_writes():
+    session = Mock()
+
+    CausalWriteTracker().advance(session=session)
+
+    session.advance_cluster_time.assert_not_called()
+    session.advance_operation_time.assert_not_called()
@@ -0,0 +1,85 @@
+import threading
+from dataclasses import dataclass
+
+from pymongo import monitoring
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    connections_open: int
+    connections_in_use: int
+    checkouts: int
+    checkout_failures: int
+    pool_clears: int
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts connection pool events across all servers of one client.
+
+    Pass it to the client via event_listeners, pymongo calls it from its
+    own threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+        self._connections_open = 0
+        self._connections_in_use = 0
+        self._checkouts = 0
+        self._checkout_failures = 0
+        self._pool_clears = 0
+
+    @property
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(connections_open=self._connections_open,
+                             connections_in_use=self._connections_in_use,
+                             checkouts=self._checkouts,
+                             checkout_failures=self._checkout_failures,
+                             pool_clears=self._pool_clears)
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self._lock:
+            self._pool_clears += 1
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self,
+                           event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self._connections_open += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self,
+                          event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self._connections_open -= 1
+
+    def connection_check_out_started(
+            self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        pass
+
+    def connection_check_out_failed(
+            self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            self._checkout_failures += 1
+
+    def connection_checked_out(
+            self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._connections_in_use += 1
+
+    def connection_checked_in(
+            self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self._connections_in_use -= 1
@@ -0,0 +1,37 @@
+from pymongo import monitoring
+from src.domain.mongo_pool_monitor import PoolStats, PoolStatsListener
+
+_ADDRESS = ("localhost", 27017)
+
+
+def test_pool_stats_empty():
+    assert PoolStatsListener().stats == PoolStats(connections_open=0,
+                                                  connections_in_use=0,
+                                                  checkouts=0,
+                                                  checkout_failures=0,
+                                                  pool_clears=0)
+
+
+def test_pool_stats():
+    listener = PoolStatsListener()
+
+    for connection_id in (1, 2):
+        listener.connection_created(
+            monitoring.ConnectionCreatedEvent(_ADDRESS, connection_id))
+        listener.connection_checked_out(
+            monitoring.ConnectionCheckedOutEvent(_ADDRESS, connection_id))
+
+    listener.connection_checked_in(
+        monitoring.ConnectionCheckedInEvent(_ADDRESS, 1))
+    listener.connection_closed(
+        monitoring.ConnectionClosedEvent(_ADDRESS, 1, "stale"))
+
+    listener.connection_check_out_failed(
+        monitoring.ConnectionCheckOutFailedEvent(_ADDRESS, "timeout"))
+    listener.pool_cleared(monitoring.PoolClearedEvent(_ADDRESS))
+
+    assert listener.stats == PoolStats(connections_open=1,
+                                       connections_in_use=1,
+                                       checkouts=2,
+                                       checkout_failures=1,
+                                       pool_clears=1)
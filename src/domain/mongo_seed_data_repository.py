@@ -1,92 +1,128 @@
 import contextlib
-import re
-from datetime import datetime, timedelta
-from typing import (Callable, Generator, Iterable, Literal, Optional, Tuple,
-                    Union)
-
-import pymongo
-from cachetools import TTLCache, cached
-from pymongo import MongoClient
-from pymongo.collection import Collection
-from src.domain.seed_data_repository import (SeedDataRepository,
-                                             SeedDuplicateError,
-                                             SeedNotFoundError)
-from src.model.raid_data import (RaidSeed, is_of_seed_type,
-                                 map_to_native_object, map_to_raid_seed)
+import logging
+import operator
+import threading
+from typing import (Any, Callable, ContextManager, Generator, List, Optional,
+                    Tuple)
+
+from pymongo import MongoClient, ReadPreference
+from pymongo.client_session import ClientSession
+from pymongo.cursor import Cursor
+from pymongo.errors import PyMongoError
+from src.domain.mongo_seed_documents import (SEED_CHANGE_PIPELINE,
+                                             WATCH_MAX_AWAIT_MS,
+                                             WATCH_RETRY_SECONDS,
+                                             seed_cache_key, seed_cache_tag,
+                                             seed_list_cache_tag)
+from src.domain.mongo_seed_repository_mixin import (MongoSeedRepositoryMixin,
+                                                    Steps, run_steps)
+from src.domain.seed_data_repository import SeedDataRepository
+from src.model.compact_seed import CompactSeed
+from src.model.raid_data import RaidSeed
+from src.model.seed_metadata import SeedMetadata
 from src.model.seed_type import SeedType
+from src.utils.raid_info_index import RaidInfoIndex
+from src.utils.serialized_seed import SerializedSeed
+from src.utils.single_flight import single_flight
 from src.utils.sort_order import SortOrder
+from src.utils.swr_cache import swr_cachedmethod
 
-_CACHE = TTLCache(maxsize=32, ttl=600)
+logger = logging.getLogger(__name__)
 
 
-def _map_pymongo_sort_order(
-        *, sort_order: SortOrder) -> Optional[Union[Literal[1], Literal[-1]]]:
-    if sort_order == SortOrder.ASCENDING:
-        return pymongo.ASCENDING
+class MongoSeedDataRepository(MongoSeedRepositoryMixin, SeedDataRepository):
 
-    if sort_order == SortOrder.DESCENDING:
-        return pymongo.DESCENDING
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
 
-    return None
-
-
-def filter_by_key(predicate: Callable, iterable: Iterable,
-                  key_func: Callable) -> Generator:
-    for value in iterable:
-        if predicate(key_func(value)):
-            yield value
-
-
-def get_ids_older_than(ids: Iterable[str], days: int) -> Tuple[str]:
-
-    def key_func(seed_id: str) -> datetime.date:
-        date_str = re.search(r"\d+", seed_id).group()
-        date = datetime.strptime(date_str, "%Y%m%d").date()
-
-        return date
-
-    cutoff = (datetime.now() - timedelta(days=days)).date()
-
-    ids_older = filter_by_key(predicate=lambda d: d < cutoff,
-                              iterable=ids,
-                              key_func=key_func)
-
-    return tuple(ids_older)
-
-
-class MongoSeedDataRepository(SeedDataRepository):
-
-    _connection_string_template = ("mongodb+srv://"
-                                   "{username}:{password}"
-                                   "@{url}?retryWrites=true&w=majority")
-
-    def __init__(self, *, url: str, username: str, password: str, db_name: str,
-                 coll_name: str) -> None:
-        super().__init__()
-
-        self._connection_string = self._connection_string_template.format(
-            username=username, password=password, url=url)
-
-        self._client = self._connect()
-
-        self._database_name = db_name
-        self._database = self._client[db_name]
-
-        self._collection_name = coll_name
-        self._collection = self._database[coll_name]
+        self._watch_stop = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
 
     def _connect(self) -> MongoClient:
-        return MongoClient(self._connection_string)
+        # connect lazily: boot does not wait for or fail on Mongo
+        return MongoClient(self._connection_string,
+                           connect=False,
+                           event_listeners=[self._pool_listener],
+                           **self._client_options)
+
+    @contextlib.contextmanager
+    def _write_session(self) -> Generator[ClientSession, None, None]:
+        with self._client.start_session(causal_consistency=True) as session:
+            yield session
+
+            self._write_tracker.record(session=session)
+
+    def _read_session(self) -> ContextManager[Optional[ClientSession]]:
+        if not self._needs_read_session():
+            return contextlib.nullcontext()
+
+        session = self._client.start_session(causal_consistency=True)
+        self._write_tracker.advance(session=session)
+
+        return session
+
+    def _find(self, *args, **kwargs) -> List[dict]:
+        with self._read_session() as session:
+            return list(
+                self._read_collection.find(*args, session=session, **kwargs))
+
+    def _find_one(self, *args, **kwargs) -> Optional[dict]:
+        with self._read_session() as session:
+            return self._read_collection.find_one(*args,
+                                                  session=session,
+                                                  **kwargs)
+
+    @staticmethod
+    def _fetch_all(cursor: Cursor) -> List[dict]:
+        return list(cursor)
+
+    @staticmethod
+    def _run_cpu(func: Callable, **kwargs) -> Any:
+        return func(**kwargs)
+
+    def _in_write_session(self, steps_func: Callable[..., Steps],
+                          **kwargs) -> Any:
+        with self._write_session() as session:
+            return run_steps(steps_func(session=session, **kwargs))
+
+    def _in_transaction(self, steps_func: Callable[..., Steps],
+                        **kwargs) -> Any:
+        with self._write_session() as session:
+            return session.with_transaction(
+                callback=lambda s: run_steps(steps_func(session=s, **kwargs)),
+                read_preference=ReadPreference.PRIMARY)
+
+    def startup(self) -> None:
+        self.ensure_indexes()
+        self.backfill_seed_dates()
+        self._backfill_content_hashes()
+
+        if self._watch_changes:
+            self._watch_thread = threading.Thread(target=self._watch,
+                                                  name="seed-change-watcher",
+                                                  daemon=True)
+            self._watch_thread.start()
+
+    def ensure_indexes(self) -> None:
+        run_steps(self._ensure_indexes_steps())
+
+    def backfill_seed_dates(self) -> None:
+        run_steps(self._backfill_seed_dates_steps())
+
+    def _backfill_content_hashes(self) -> None:
+        run_steps(self._backfill_content_hashes_steps())
+
+    def close(self) -> None:
+        self._watch_stop.set()
+
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
 
-    def _disconnect(self) -> None:
-        if self._client:
-            self._client.close()
-            self._client = None
+        self._disconnect()
 
     def _teardown_db(self) -> None:
-        self._client.drop_database(self._database)
-
-        self._disconnect()
+        run_steps(self._teardown_db_steps())
 
     def list_seed_identifiers(
             self,
@@ -94,14 +130,9 @@ class MongoSeedDataRepository(SeedDataRepository):
             seed_type: Optional[SeedType] = None,
             sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[str]:
 
-        db_sort_order = _map_pymongo_sort_order(sort_order=sort_order)
-
-        query = {} if seed_type is None else {"seed_type": seed_type.value}
-
-        records = self._collection.find(query).sort("identifier",
-                                                    db_sort_order)
-
-        return tuple(map(lambda r: r['identifier'], records))
+        return run_steps(
+            self._list_seed_identifiers_steps(seed_type=seed_type,
+                                              sort_order=sort_order))
 
     def get_seed_identifier_by_week_offset(
             self,
@@ -109,57 +140,112 @@ class MongoSeedDataRepository(SeedDataRepository):
             seed_type: Optional[SeedType] = None,
             offset_weeks: int = 0) -> Optional[str]:
 
-        offset_weeks = abs(offset_weeks)
+        return run_steps(
+            self._get_seed_identifier_by_week_offset_steps(
+                seed_type=seed_type, offset_weeks=offset_weeks))
 
-        query = {} if seed_type is None else {"seed_type": seed_type.value}
+    @swr_cachedmethod(operator.attrgetter("_cache"),
+                      key=seed_cache_key("seeds"),
+                      tag=seed_list_cache_tag)
+    @single_flight()
+    def _list_compact_seeds(
+            self,
+            *,
+            seed_type: Optional[SeedType] = None,
+            sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[CompactSeed]:
 
-        records = self._collection.find(query).sort("identifier",
-                                                    pymongo.DESCENDING)
+        return run_steps(
+            self._list_compact_seeds_steps(seed_type=seed_type,
+                                           sort_order=sort_order))
 
-        try:
-            return records[offset_weeks]["identifier"]
-        except IndexError:
-            return None
+    @swr_cachedmethod(operator.attrgetter("_cache"),
+                      key=seed_cache_key("seed"),
+                      tag=seed_cache_tag)
+    @single_flight()
+    def _get_compact_seed(
+            self,
+            *,
+            identifier: str,
+            seed_type: Optional[SeedType] = None) -> Optional[CompactSeed]:
+
+        return run_steps(
+            self._get_compact_seed_steps(identifier=identifier,
+                                         seed_type=seed_type))
 
-    @cached(_CACHE)
     def list_seeds(
             self,
             *,
             seed_type: Optional[SeedType] = None,
             sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[RaidSeed]:
 
-        db_sort_order = _map_pymongo_sort_order(sort_order=sort_order)
-
-        query = {} if seed_type is None else {"seed_type": seed_type.value}
-
-        records = self._collection.find(query).sort("identifier",
-                                                    db_sort_order)
+        return run_steps(
+            self._list_seeds_steps(seed_type=seed_type, sort_order=sort_order))
 
-        return tuple(
-            map(
-                lambda r: map_to_raid_seed(data=r["data"], seed_type=seed_type
-                                           ), records))
-
-    @cached(_CACHE)
     def get_seed_by_identifier(
             self,
             *,
             identifier: str,
             seed_type: Optional[SeedType] = None) -> Optional[RaidSeed]:
 
-        query = {
-            "identifier": identifier,
-        }
+        return run_steps(
+            self._get_seed_by_identifier_steps(identifier=identifier,
+                                               seed_type=seed_type))
 
-        if seed_type is not None:
-            query["seed_type"] = seed_type.value
+    @swr_cachedmethod(operator.attrgetter("_cache"),
+                      key=seed_cache_key("seed_metadata"),
+                      tag=seed_cache_tag)
+    @single_flight()
+    def get_seed_metadata(
+            self,
+            *,
+            identifier: str,
+            seed_type: Optional[SeedType] = None) -> Optional[SeedMetadata]:
 
-        record = self._collection.find_one(query)
+        return run_steps(
+            self._get_seed_metadata_steps(identifier=identifier,
+                                          seed_type=seed_type))
 
-        if record is None:
-            return None
+    @swr_cachedmethod(operator.attrgetter("_cache"),
+                      key=seed_cache_key("seed_metadata_list"),
+                      tag=seed_list_cache_tag)
+    def list_seed_metadata(
+            self,
+            *,
+            seed_type: Optional[SeedType] = None,
+            sort_order: SortOrder = SortOrder.ASCENDING
+    ) -> Tuple[SeedMetadata]:
+
+        return run_steps(
+            self._list_seed_metadata_steps(seed_type=seed_type,
+                                           sort_order=sort_order))
+
+    @swr_cachedmethod(operator.attrgetter("_cache"),
+                      key=seed_cache_key("serialized_seed"),
+                      tag=seed_cache_tag)
+    @single_flight()
+    def get_serialized_seed(
+            self,
+            *,
+            identifier: str,
+            seed_type: Optional[SeedType] = None) -> Optional[SerializedSeed]:
+
+        return run_steps(
+            self._get_serialized_seed_steps(identifier=identifier,
+                                            seed_type=seed_type))
 
-        return map_to_raid_seed(data=record["data"], seed_type=seed_type)
+    @swr_cachedmethod(operator.attrgetter("_cache"),
+                      key=seed_cache_key("raid_info_index"),
+                      tag=seed_cache_tag)
+    @single_flight()
+    def get_raid_info_index(
+            self,
+            *,
+            identifier: str,
+            seed_type: Optional[SeedType] = None) -> Optional[RaidInfoIndex]:
+
+        return run_steps(
+            self._get_raid_info_index_steps(identifier=identifier,
+                                            seed_type=seed_type))
 
     def get_seed_by_week_offset(
         self,
@@ -168,47 +254,42 @@ class MongoSeedDataRepository(SeedDataRepository):
         offset_weeks: int = 0,
     ) -> Optional[RaidSeed]:
 
-        seed_id = self.get_seed_identifier_by_week_offset(
-            seed_type=seed_type, offset_weeks=offset_weeks)
-
-        if seed_id is None:
-            return None
-
-        return self.get_seed_by_identifier(identifier=seed_id,
-                                           seed_type=seed_type)
-
-    def _save_seed(self,
-                   *,
-                   collection: Collection,
-                   identifier: str,
-                   seed_type: SeedType,
-                   data: RaidSeed,
-                   session=None,
-                   _duplicate_ok: bool = False) -> None:
-
-        if not is_of_seed_type(data=data, seed_type=seed_type):
-            raise ValueError(f"Not a valid {seed_type.value} raid seed")
-
-        if collection.count_documents(
-            {
-                "identifier": identifier,
-                "seed_type": seed_type.value
-            },
-                session=session) > 0:
-
-            if not _duplicate_ok:
-                raise SeedDuplicateError(
-                    f"Seed {identifier}.{seed_type.value} already exists")
-
-            return
-
-        collection.insert_one(
-            {
-                "identifier": identifier,
-                "seed_type": seed_type.value,
-                "data": map_to_native_object(data=data)
-            },
-            session=session)
+        return run_steps(
+            self._get_seed_by_week_offset_steps(seed_type=seed_type,
+                                                offset_weeks=offset_weeks))
+
+    def _poll_changes(self) -> None:
+        run_steps(self._poll_changes_steps())
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                self._poll_changes()
+            except PyMongoError as err:
+                logger.warning("Polling seed changes failed: %s", err)
+
+            if self._watch_stop.wait(self._poll_interval):
+                return
+
+    def _watch(self) -> None:
+        while not self._watch_stop.is_set():
+            try:
+                with self._collection.watch(
+                        SEED_CHANGE_PIPELINE,
+                        max_await_time_ms=WATCH_MAX_AWAIT_MS) as stream:
+                    while stream.alive and not self._watch_stop.is_set():
+                        change = stream.try_next()
+
+                        if change is not None:
+                            self._apply_change(change=change)
+            except PyMongoError as err:
+                if self._watch_failed(error=err):
+                    self._poll()
+                    return
+
+            # changes may have been missed until the stream is reopened
+            self._cache.clear()
+            self._watch_stop.wait(WATCH_RETRY_SECONDS)
 
     def save_seed(self,
                   *,
@@ -217,54 +298,19 @@ class MongoSeedDataRepository(SeedDataRepository):
                   data: RaidSeed,
                   _duplicate_ok: bool = False) -> None:
 
-        self._save_seed(collection=self._collection,
-                        identifier=identifier,
-                        seed_type=seed_type,
-                        data=data,
-                        _duplicate_ok=_duplicate_ok)
-
-        _CACHE.clear()
+        run_steps(
+            self._save_seed_steps(identifier=identifier,
+                                  seed_type=seed_type,
+                                  data=data,
+                                  duplicate_ok=_duplicate_ok))
 
     def save_seeds(self,
                    *,
                    items: Tuple[Tuple[str, SeedType, RaidSeed]],
                    _duplicate_ok: bool = False) -> None:
 
-        def callback(session) -> None:
-            collection = session.client[self._database_name][
-                self._collection_name]
-
-            for (identifier, seed_type, data) in items:
-                self._save_seed(collection=collection,
-                                identifier=identifier,
-                                seed_type=seed_type,
-                                data=data,
-                                session=session,
-                                _duplicate_ok=_duplicate_ok)
-
-        with self._client.start_session() as session:
-            session.with_transaction(callback=callback)
-
-        _CACHE.clear()
-
-    def _delete_seed(self,
-                     *,
-                     collection: Collection,
-                     identifier: str,
-                     seed_type: SeedType,
-                     session=None,
-                     _notfound_ok: bool = False) -> None:
-
-        record = collection.find_one_and_delete(
-            {
-                "identifier": identifier,
-                "seed_type": seed_type.value
-            },
-            session=session)
-
-        if not _notfound_ok and record is None:
-            raise SeedNotFoundError(
-                f"Seed {identifier}.{seed_type.value} not found")
+        run_steps(
+            self._save_seeds_steps(items=items, duplicate_ok=_duplicate_ok))
 
     def delete_seed(self,
                     *,
@@ -272,49 +318,28 @@ class MongoSeedDataRepository(SeedDataRepository):
                     seed_type: SeedType,
                     _notfound_ok: bool = False) -> None:
 
-        self._delete_seed(collection=self._collection,
-                          identifier=identifier,
-                          seed_type=seed_type,
-                          _notfound_ok=_notfound_ok)
-
-        _CACHE.clear()
+        run_steps(
+            self._delete_seed_steps(identifier=identifier,
+                                    seed_type=seed_type,
+                                    notfound_ok=_notfound_ok))
 
     def delete_seeds(self,
                      *,
                      items: Tuple[Tuple[str, SeedType]],
                      _notfound_ok: bool = False) -> None:
 
-        def callback(session) -> None:
-            collection = session.client[self._database_name][
-                self._collection_name]
-
-            for (identifier, seed_type) in items:
-                self._delete_seed(collection=collection,
-                                  identifier=identifier,
-                                  seed_type=seed_type,
-                                  session=session,
-                                  _notfound_ok=_notfound_ok)
-
-        with self._client.start_session() as session:
-            session.with_transaction(callback=callback)
-
-        _CACHE.clear()
+        run_steps(
+            self._delete_seeds_steps(items=items, notfound_ok=_notfound_ok))
 
     def delete_seeds_older_than(self, *, days: int) -> None:
-
-        ids = set(self.list_seed_identifiers())
-        to_delete = get_ids_older_than(ids, days)
-
-        items = (*((seed_id, SeedType.RAW) for seed_id in to_delete),
-                 *((seed_id, SeedType.ENHANCED) for seed_id in to_delete))
-
-        self.delete_seeds(items=items)
+        run_steps(self._delete_seeds_older_than_steps(days=days))
 
 
 @contextlib.contextmanager
 def temp_repo(**kwargs) -> MongoSeedDataRepository:
 
     repo = MongoSeedDataRepository(**kwargs)
+    repo.startup()
 
     # pylint: disable=protected-access
 
@@ -1,3 +1,4 @@
+import json
 import uuid
 from datetime import datetime, timedelta
 from itertools import cycle, zip_longest
@@ -8,11 +9,18 @@ from test.utils.assert_deep_equals import assert_deep_equals
 from typing import Optional, Tuple
 
 import pytest
+from pymongo import ReadPreference
 from src.domain.mongo_seed_data_repository import (MongoSeedDataRepository,
                                                    temp_repo)
+from src.domain.mongo_seed_documents import (SEED_DATE_INDEX_KEYS,
+                                             SEED_DATE_INDEX_NAME,
+                                             SEED_INDEX_KEYS, SEED_INDEX_NAME,
+                                             build_seed_date_index_options,
+                                             build_seed_document)
+from src.domain.mongo_seed_repository_mixin import run_steps
 from src.domain.seed_data_repository import (SeedDuplicateError,
                                              SeedNotFoundError)
-from src.model.raid_data import RaidSeed
+from src.model.raid_data import RaidSeed, map_to_native_object
 from src.model.seed_type import SeedType
 from src.utils.get_env import get_env
 from src.utils.sort_order import SortOrder
@@ -28,6 +36,132 @@ _REPO_INIT_KWARGS = {
 }
 
 
+def test_ensure_indexes():
+    with temp_repo(**_REPO_INIT_KWARGS) as repo:
+        # pylint: disable=protected-access
+        indexes = repo._collection.index_information()
+
+        assert indexes[SEED_INDEX_NAME]["key"] == SEED_INDEX_KEYS
+        assert indexes[SEED_INDEX_NAME]["unique"]
+
+        assert indexes[SEED_DATE_INDEX_NAME]["key"] == SEED_DATE_INDEX_KEYS
+        assert "expireAfterSeconds" not in indexes[SEED_DATE_INDEX_NAME]
+
+
+def test_ensure_indexes_retention_days():
+    with temp_repo(**_REPO_INIT_KWARGS, retention_days=30) as repo:
+        # pylint: disable=protected-access
+        indexes = repo._collection.index_information()
+
+        assert indexes[SEED_DATE_INDEX_NAME]["expireAfterSeconds"] == 2592000
+
+        repo._retention_days = None
+        repo.ensure_indexes()
+
+        indexes = repo._collection.index_information()
+
+        assert "expireAfterSeconds" not in indexes[SEED_DATE_INDEX_NAME]
+
+
+def test_ensure_indexes_retention_days_changed():
+    with temp_repo(**_REPO_INIT_KWARGS, retention_days=30) as repo:
+        # pylint: disable=protected-access
+        repo._retention_days = 60
+        repo.ensure_indexes()
+
+        indexes = repo._collection.index_information()
+
+        assert indexes[SEED_DATE_INDEX_NAME]["expireAfterSeconds"] == 5184000
+
+
+def test_ensure_indexes_dropped_concurrently():
+    with temp_repo(**_REPO_INIT_KWARGS, retention_days=30) as repo:
+        # pylint: disable=protected-access
+        repo._collection.drop_index(SEED_DATE_INDEX_NAME)
+
+        repo._retention_days = None
+        run_steps(
+            repo._update_seed_date_index_steps(
+                options=build_seed_date_index_options(retention_days=None)))
+
+        indexes = repo._collection.index_information()
+
+        assert "expireAfterSeconds" not in indexes[SEED_DATE_INDEX_NAME]
+
+
+def test_read_preference():
+    with temp_repo(**_REPO_INIT_KWARGS,
+                   read_preference="secondaryPreferred") as repo:
+        # pylint: disable=protected-access
+        assert repo._collection.read_preference == ReadPreference.PRIMARY
+        assert repo._read_collection.read_preference == (
+            ReadPreference.SECONDARY_PREFERRED)
+
+        seed_id = mock_seed_identifier()
+        seed = mock_raid_seed_raw()
+
+        repo.save_seed(identifier=seed_id, seed_type=SeedType.RAW, data=seed)
+
+        # causally consistent with the write above, even on a secondary
+        assert repo.list_seed_identifiers() == (seed_id, )
+
+        saved_seed = repo.get_seed_by_identifier(identifier=seed_id,
+                                                 seed_type=SeedType.RAW)
+
+        assert_deep_equals(seed, saved_seed)
+
+
+def test_poll_changes():
+    with temp_repo(**_REPO_INIT_KWARGS) as repo:
+        # pylint: disable=protected-access
+        repo._poll_changes()
+
+        assert len(repo.list_seeds()) == 0
+
+        seed_id = mock_seed_identifier()
+
+        # written by another worker, bypassing this repo's cache
+        repo._collection.insert_one(
+            build_seed_document(identifier=seed_id,
+                                seed_type=SeedType.RAW,
+                                data=mock_raid_seed_raw()))
+
+        assert len(repo.list_seeds()) == 0
+
+        repo._poll_changes()
+
+        assert len(repo.list_seeds()) == 1
+
+
+def test_apply_change():
+    with temp_repo(**_REPO_INIT_KWARGS) as repo:
+        assert len(repo.list_seeds()) == 0
+
+        seed_id = mock_seed_identifier()
+        document = build_seed_document(identifier=seed_id,
+                                       seed_type=SeedType.RAW,
+                                       data=mock_raid_seed_raw())
+
+        # pylint: disable=protected-access
+        repo._collection.insert_one(document)
+        repo._apply_change(change={
+            "operationType": "insert",
+            "fullDocument": document
+        })
+
+        assert len(repo.list_seeds()) == 1
+
+        repo._collection.delete_one({"_id": document["_id"]})
+        repo._apply_change(change={
+            "operationType": "delete",
+            "documentKey": {
+                "_id": document["_id"]
+            }
+        })
+
+        assert len(repo.list_seeds()) == 0
+
+
 class TestSaveSeed:
 
     @staticmethod
@@ -447,6 +581,97 @@ class TestSeeds:
 
             assert saved_seed == seed
 
+    def test_get_seed_metadata(self, repo: MongoSeedDataRepository):
+        for (seed_id, seed_type, _) in self.items:
+            metadata = repo.get_seed_metadata(identifier=seed_id,
+                                              seed_type=seed_type)
+
+            serialized = repo.get_serialized_seed(identifier=seed_id,
+                                                  seed_type=seed_type)
+
+            assert metadata.identifier == seed_id
+            assert metadata.seed_type == seed_type
+            assert metadata.content_hash == serialized.content_hash
+            assert metadata.last_modified is not None
+
+        result = repo.get_seed_metadata(identifier="doesnotexist",
+                                        seed_type=SeedType.RAW)
+
+        assert result is None
+
+    def test_list_seed_metadata(self, repo: MongoSeedDataRepository):
+        for seed_type in SeedType:
+            for sort_order in SortOrder:
+                metadata = repo.list_seed_metadata(seed_type=seed_type,
+                                                   sort_order=sort_order)
+
+                ids = repo.list_seed_identifiers(seed_type=seed_type,
+                                                 sort_order=sort_order)
+
+                assert tuple(m.identifier for m in metadata) == ids
+                assert all(m.seed_type == seed_type for m in metadata)
+
+    def test_get_serialized_seed(self, repo: MongoSeedDataRepository):
+        for (seed_id, seed_type, seed) in self.items:
+            serialized = repo.get_serialized_seed(identifier=seed_id,
+                                                  seed_type=seed_type)
+
+            assert_deep_equals(json.loads(serialized.body),
+                               map_to_native_object(data=seed))
+
+        result = repo.get_serialized_seed(identifier="doesnotexist",
+                                          seed_type=SeedType.RAW)
+
+        assert result is None
+
+    def test_get_raid_info_index(self, repo: MongoSeedDataRepository):
+        for (seed_id, seed_type, seed) in self.items:
+            index = repo.get_raid_info_index(identifier=seed_id,
+                                             seed_type=seed_type)
+
+            for raid_info in map_to_native_object(data=seed):
+                key = (raid_info["tier"], raid_info["level"])
+
+                assert_deep_equals(index[key], raid_info)
+
+        result = repo.get_raid_info_index(identifier="doesnotexist",
+                                          seed_type=SeedType.RAW)
+
+        assert result is None
+
+    def test_cache_invalidation(self, repo: MongoSeedDataRepository):
+        (seed_id, seed_type, seed), *_ = self.items
+
+        repo.get_seed_by_identifier(identifier=seed_id, seed_type=seed_type)
+        repo.list_seeds(seed_type=SeedType.RAW)
+
+        seeds_enhanced = repo.list_seeds(seed_type=SeedType.ENHANCED)
+
+        new_kwargs = {
+            "identifier": mock_seed_identifier(),
+            "seed_type": SeedType.ENHANCED
+        }
+
+        repo.save_seed(data=mock_raid_seed_enhanced(), **new_kwargs)
+
+        try:
+            hits = repo.cache_stats.hits
+
+            assert repo.get_seed_by_identifier(identifier=seed_id,
+                                               seed_type=seed_type) == seed
+            repo.list_seeds(seed_type=SeedType.RAW)
+
+            assert repo.cache_stats.hits == hits + 2
+
+            assert len(repo.list_seeds(
+                seed_type=SeedType.ENHANCED)) == len(seeds_enhanced) + 1
+            assert repo.cache_stats.hits == hits + 2
+        finally:
+            repo.delete_seed(**new_kwargs)
+
+        assert len(repo.list_seeds(
+            seed_type=SeedType.ENHANCED)) == len(seeds_enhanced)
+
     def test_get_seed_by_week_offset_nonexistent(
             self, repo: MongoSeedDataRepository):
 
@@ -589,6 +814,14 @@ class TestDeleteSeed:
 
             assert saved_seed is not None
 
+    def test_multiple_notfound_ok(self, repo: MongoSeedDataRepository):
+
+        _ids = ("doesnotexist", *self._ids[1:])
+
+        repo.delete_seeds(items=zip(_ids, self._seed_types), _notfound_ok=True)
+
+        assert repo.list_seed_identifiers() == self._ids[:1]
+
 
 class TestDeleteOldSeeds:
 
@@ -670,3 +903,29 @@ class TestDeleteOldSeeds:
         repo.delete_seeds_older_than(days=-1)
 
         assert len(repo.list_seed_identifiers()) == 0
+
+    def test_backfill_seed_dates(self, repo: MongoSeedDataRepository):
+        # pylint: disable=protected-access
+        repo._collection.update_many({}, {"$unset": {"seed_date": ""}})
+
+        repo.delete_seeds_older_than(days=13)
+
+        assert set(repo.list_seed_identifiers()) == set(self._ids)
+
+        repo.backfill_seed_dates()
+        repo.delete_seeds_older_than(days=13)
+
+        assert set(repo.list_seed_identifiers()) == set(self._ids[:2])
+
+    def test_backfill_content_hashes(self, repo: MongoSeedDataRepository):
+        # pylint: disable=protected-access
+        expected = repo._collection.find_one({})["content_hash"]
+
+        repo._collection.update_many({}, {"$unset": {"content_hash": ""}})
+
+        repo._backfill_content_hashes()
+
+        for record in repo._collection.find({}, {"content_hash": 1}):
+            assert "content_hash" in record
+
+        assert repo._collection.find_one({})["content_hash"] == expected
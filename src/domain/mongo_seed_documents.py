@@ -0,0 +1,411 @@
+from datetime import datetime, time
+from typing import (Callable, Hashable, Iterable, List, Literal, Optional,
+                    Tuple, Union)
+
+import pymongo
+from cachetools.keys import hashkey
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from pymongo.read_preferences import (ReadPreference, _ServerMode,
+                                      make_read_preference,
+                                      read_pref_mode_from_name)
+from src.domain.seed_data_repository import (SeedDuplicateError,
+                                             SeedNotFoundError)
+from src.model.compact_seed import CompactSeed, map_to_compact_seed
+from src.model.raid_data import (RaidSeed, is_of_seed_type,
+                                 map_to_native_object, map_to_raid_seed)
+from src.model.seed_metadata import SeedMetadata
+from src.model.seed_type import SeedType
+from src.utils.get_env import get_env, get_env_int
+from src.utils.seed_date import parse_seed_date, seed_date_cutoff
+from src.utils.serialized_seed import compute_content_hash, serialize_body
+from src.utils.sort_order import SortOrder
+from src.utils.swr_cache import StaleWhileRevalidateCache
+
+CONNECTION_STRING_TEMPLATE = ("mongodb+srv://"
+                              "{username}:{password}"
+                              "@{url}?retryWrites=true&w=majority")
+
+# fail fast instead of pymongo's 30s default when Mongo is unreachable
+DEFAULT_CLIENT_OPTIONS = {
+    "connectTimeoutMS": 10000,
+    "serverSelectionTimeoutMS": 10000,
+}
+
+CLIENT_OPTION_ENV_KEYS = (
+    ("maxPoolSize", "MONGO_MAX_POOL_SIZE", int),
+    ("minPoolSize", "MONGO_MIN_POOL_SIZE", int),
+    ("connectTimeoutMS", "MONGO_CONNECT_TIMEOUT_MS", int),
+    ("serverSelectionTimeoutMS", "MONGO_SERVER_SELECTION_TIMEOUT_MS", int),
+    ("socketTimeoutMS", "MONGO_SOCKET_TIMEOUT_MS", int),
+    ("compressors", "MONGO_COMPRESSORS", str),
+)
+
+CACHE_MAXSIZE = 32
+CACHE_SOFT_TTL = 600
+CACHE_HARD_TTL = 3600
+
+SEED_INDEX_NAME = "seed_type_identifier"
+SEED_INDEX_KEYS = [("seed_type", pymongo.ASCENDING),
+                   ("identifier", pymongo.ASCENDING)]
+
+SEED_DATE_INDEX_NAME = "seed_date"
+SEED_DATE_INDEX_KEYS = [("seed_date", pymongo.ASCENDING)]
+
+MISSING_SEED_DATE_QUERY = {"seed_date": {"$exists": False}}
+
+MISSING_CONTENT_HASH_QUERY = {"content_hash": {"$exists": False}}
+
+# excludes _id so identifier queries are covered by the seed index
+IDENTIFIER_PROJECTION = {"_id": 0, "identifier": 1}
+
+SEED_KEY_PROJECTION = {"_id": 0, "identifier": 1, "seed_type": 1}
+
+METADATA_PROJECTION = {"identifier": 1, "seed_type": 1, "content_hash": 1}
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# IndexOptionsConflict, IndexKeySpecsConflict
+INDEX_CONFLICT_ERROR_CODES = (85, 86)
+
+INDEX_NOT_FOUND_ERROR_CODE = 27
+
+# change streams need a replica set or sharded cluster
+CHANGE_STREAM_UNSUPPORTED_ERROR_CODE = 40573
+
+# seeds are never updated in place, updates only backfill derived fields
+SEED_CHANGE_PIPELINE = [
+    {
+        "$match": {
+            "operationType": {
+                "$ne": "update"
+            }
+        }
+    },
+    {
+        "$project": {
+            "fullDocument.data": 0
+        }
+    },
+]
+
+WATCH_MAX_AWAIT_MS = 1000
+WATCH_RETRY_SECONDS = 5
+POLL_INTERVAL = 30
+
+
+def map_pymongo_sort_order(
+        *, sort_order: SortOrder) -> Optional[Union[Literal[1], Literal[-1]]]:
+    if sort_order == SortOrder.ASCENDING:
+        return pymongo.ASCENDING
+
+    if sort_order == SortOrder.DESCENDING:
+        return pymongo.DESCENDING
+
+    return None
+
+
+def build_seed_query(*,
+                     seed_type: Optional[SeedType],
+                     identifier: Optional[str] = None) -> dict:
+    query = {}
+
+    if identifier is not None:
+        query["identifier"] = identifier
+
+    if seed_type is not None:
+        query["seed_type"] = seed_type.value
+
+    return query
+
+
+def build_seeds_query(*, items: Iterable[Tuple[str, SeedType]]) -> dict:
+    identifiers = {}
+
+    for (identifier, seed_type) in items:
+        identifiers.setdefault(seed_type.value, []).append(identifier)
+
+    # one branch per seed type, each served by the seed index
+    return {
+        "$or": [{
+            "seed_type": seed_type,
+            "identifier": {
+                "$in": ids
+            }
+        } for (seed_type, ids) in identifiers.items()]
+    }
+
+
+def map_seed_key(*, record: dict) -> Tuple[str, SeedType]:
+    return record["identifier"], SeedType(record["seed_type"])
+
+
+def map_change_to_seed_keys(
+        *, change: dict) -> Optional[Tuple[Tuple[str, SeedType], ...]]:
+    """Seeds affected by a change event, None if they are unknown."""
+    if change["operationType"] == "insert":
+        return (map_seed_key(record=change["fullDocument"]), )
+
+    # delete events only carry the _id of the removed document
+    return None
+
+
+def map_missing_seed_error(
+        *, items: Iterable[Tuple[str, SeedType]],
+        found: Iterable[Tuple[str, SeedType]]) -> SeedNotFoundError:
+    found = set(found)
+
+    for (identifier, seed_type) in items:
+        # repeated items are only found once
+        if (identifier, seed_type) not in found:
+            return SeedNotFoundError(
+                f"Seed {identifier}.{seed_type.value} not found")
+
+        found.remove((identifier, seed_type))
+
+    return SeedNotFoundError("Seeds changed while deleting")
+
+
+def map_seed_date(*, identifier: str) -> Optional[datetime]:
+    seed_date = parse_seed_date(identifier=identifier)
+
+    if seed_date is None:
+        return None
+
+    # BSON has no plain date type, TTL indexes require datetimes
+    return datetime.combine(seed_date, time.min)
+
+
+def build_retention_query(*, days: int) -> dict:
+    cutoff = datetime.combine(seed_date_cutoff(days=days), time.min)
+
+    return {"seed_date": {"$lt": cutoff}}
+
+
+def build_seed_date_index_options(*, retention_days: Optional[int]) -> dict:
+    options = {"name": SEED_DATE_INDEX_NAME}
+
+    if retention_days is not None:
+        # TTL mode, the server expires seeds on its own
+        options["expireAfterSeconds"] = retention_days * 24 * 60 * 60
+
+    return options
+
+
+def build_seed_date_index_update(
+        *, coll_name: str, retention_days: Optional[int]) -> Optional[dict]:
+    """collMod command changing the expiry of the seed date index in place,
+    None if the index has to be dropped and created again."""
+
+    # collMod cannot remove expireAfterSeconds
+    if retention_days is None:
+        return None
+
+    options = build_seed_date_index_options(retention_days=retention_days)
+
+    return {
+        "collMod": coll_name,
+        "index": {
+            "name": SEED_DATE_INDEX_NAME,
+            "expireAfterSeconds": options["expireAfterSeconds"]
+        }
+    }
+
+
+def build_seed_date_backfill(*, records: Iterable[dict]) -> List[UpdateOne]:
+    requests = []
+
+    for record in records:
+        seed_date = map_seed_date(identifier=record["identifier"])
+
+        if seed_date is not None:
+            requests.append(
+                UpdateOne({"_id": record["_id"]},
+                          {"$set": {
+                              "seed_date": seed_date
+                          }}))
+
+    return requests
+
+
+def build_content_hash_update(*, record: dict) -> UpdateOne:
+    content_hash = compute_content_hash(body=serialize_body(
+        data=record["data"]))
+
+    return UpdateOne({"_id": record["_id"]},
+                     {"$set": {
+                         "content_hash": content_hash
+                     }})
+
+
+def build_seed_document(*, identifier: str, seed_type: SeedType,
+                        data: RaidSeed) -> dict:
+    native_data = map_to_native_object(data=data)
+
+    document = {
+        "identifier": identifier,
+        "seed_type": seed_type.value,
+        "content_hash": compute_content_hash(
+            body=serialize_body(data=native_data)),
+        "data": native_data
+    }
+
+    seed_date = map_seed_date(identifier=identifier)
+
+    if seed_date is not None:
+        document["seed_date"] = seed_date
+
+    return document
+
+
+def build_seed_write(*, identifier: str, seed_type: SeedType, data: RaidSeed,
+                     upsert: bool) -> Union[InsertOne, UpdateOne]:
+    if not is_of_seed_type(data=data, seed_type=seed_type):
+        raise ValueError(f"Not a valid {seed_type.value} raid seed")
+
+    document = build_seed_document(identifier=identifier,
+                                   seed_type=seed_type,
+                                   data=data)
+
+    if not upsert:
+        return InsertOne(document)
+
+    # inserts the seed unless it exists, never overwrites
+    return UpdateOne(build_seed_query(seed_type=seed_type,
+                                      identifier=identifier),
+                     {"$setOnInsert": document},
+                     upsert=True)
+
+
+def map_bulk_write_error(
+        *, error: BulkWriteError,
+        items: Tuple[Tuple[str, SeedType, RaidSeed]]) -> Exception:
+    for write_error in error.details.get("writeErrors", ()):
+        if write_error.get("code") == DUPLICATE_KEY_ERROR_CODE:
+            identifier, seed_type, _ = items[write_error["index"]]
+
+            return SeedDuplicateError(
+                f"Seed {identifier}.{seed_type.value} already exists")
+
+    return error
+
+
+def map_record_to_metadata(*, record: dict,
+                           content_hash: Optional[str] = None) -> SeedMetadata:
+    return SeedMetadata(identifier=record["identifier"],
+                        seed_type=SeedType(record["seed_type"]),
+                        content_hash=content_hash or record["content_hash"],
+                        last_modified=record["_id"].generation_time)
+
+
+def map_record_to_compact_seed(*,
+                               record: dict,
+                               verify: bool = False) -> CompactSeed:
+    # validated on save, the stored seed type picks the model without retries
+    seed_type = SeedType(record["seed_type"])
+
+    if verify:
+        map_to_raid_seed(data=record["data"], seed_type=seed_type)
+
+    return map_to_compact_seed(data=record["data"], seed_type=seed_type)
+
+
+def load_client_options() -> dict:
+    options = {}
+
+    for (option, key, parse) in CLIENT_OPTION_ENV_KEYS:
+        value = get_env(key=key, strict=False)
+
+        if not value:
+            continue
+
+        try:
+            options[option] = parse(value)
+        except ValueError:
+            continue
+
+    return options
+
+
+def load_repo_options() -> dict:
+    """Keyword arguments of the Mongo and Motor repositories."""
+
+    watch_changes = get_env(key="SEED_CACHE_WATCH", strict=False) == "true"
+    verify_reads = get_env(key="SEED_VERIFY_READS", strict=False) == "true"
+    poll_interval = _get_env_seconds(key="SEED_CACHE_POLL_INTERVAL",
+                                     default=POLL_INTERVAL)
+
+    return {
+        "url": get_env(key="MONGO_URL"),
+        "username": get_env(key="MONGO_USERNAME"),
+        "password": get_env(key="MONGO_PASSWORD"),
+        "db_name": get_env(key="MONGO_DB_NAME"),
+        "coll_name": get_env(key="MONGO_COLLECTION_NAME"),
+        "retention_days": get_env_int(key="SEED_RETENTION_DAYS"),
+        "client_options": load_client_options(),
+        "read_preference": get_env(key="MONGO_READ_PREFERENCE", strict=False),
+        "watch_changes": watch_changes,
+        "poll_interval": poll_interval,
+        "verify_reads": verify_reads,
+    }
+
+
+def map_read_preference(*, name: Optional[str]) -> _ServerMode:
+    if not name:
+        return ReadPreference.PRIMARY
+
+    return make_read_preference(read_pref_mode_from_name(name), None)
+
+
+def build_client_options(*, client_options: Optional[dict]) -> dict:
+    return {**DEFAULT_CLIENT_OPTIONS, **(client_options or {})}
+
+
+def _get_env_seconds(*, key: str, default: float) -> float:
+    try:
+        return float(get_env(key=key))
+    except (KeyError, ValueError):
+        return default
+
+
+def create_seed_cache() -> StaleWhileRevalidateCache:
+    return StaleWhileRevalidateCache(
+        maxsize=CACHE_MAXSIZE,
+        soft_ttl=_get_env_seconds(key="SEED_CACHE_SOFT_TTL",
+                                  default=CACHE_SOFT_TTL),
+        hard_ttl=_get_env_seconds(key="SEED_CACHE_HARD_TTL",
+                                  default=CACHE_HARD_TTL))
+
+
+def seed_cache_key(prefix: str) -> Callable:
+
+    def key(_, *args, **kwargs) -> Hashable:
+        return hashkey(prefix, *args, **kwargs)
+
+    return key
+
+
+def seed_cache_tag(_,
+                   *,
+                   identifier: str,
+                   seed_type: Optional[SeedType] = None,
+                   **__) -> Hashable:
+    return ("seed", identifier, seed_type)
+
+
+def seed_list_cache_tag(_,
+                        *,
+                        seed_type: Optional[SeedType] = None,
+                        **__) -> Hashable:
+    return ("seed_list", seed_type)
+
+
+def seed_cache_tags(*, identifier: str,
+                    seed_type: SeedType) -> Tuple[Hashable, ...]:
+    """Tags of all cache entries outdated by adding or removing a seed."""
+    return (
+        seed_cache_tag(None, identifier=identifier, seed_type=seed_type),
+        seed_cache_tag(None, identifier=identifier),
+        seed_list_cache_tag(None, seed_type=seed_type),
+        seed_list_cache_tag(None),
+    )
@@ -0,0 +1,113 @@
+from test.mocks import mock_raid_seed_raw
+
+import pytest
+from pydantic import ValidationError
+from src.domain.mongo_seed_documents import (DEFAULT_CLIENT_OPTIONS,
+                                             build_client_options,
+                                             build_seed_document,
+                                             build_seeds_query,
+                                             load_client_options,
+                                             map_change_to_seed_keys,
+                                             map_missing_seed_error,
+                                             map_record_to_compact_seed)
+from src.model.compact_seed import map_compact_to_raid_seed
+from src.model.seed_type import SeedType
+
+
+def test_load_client_options(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "50")
+    monkeypatch.setenv("MONGO_MIN_POOL_SIZE", "many")
+    monkeypatch.setenv("MONGO_SOCKET_TIMEOUT_MS", "")
+    monkeypatch.setenv("MONGO_COMPRESSORS", "zstd,zlib")
+
+    options = load_client_options()
+
+    assert options["maxPoolSize"] == 50
+    assert options["compressors"] == "zstd,zlib"
+
+    assert "minPoolSize" not in options
+    assert "socketTimeoutMS" not in options
+
+
+def test_build_client_options():
+    assert build_client_options(client_options=None) == DEFAULT_CLIENT_OPTIONS
+
+    options = build_client_options(client_options={
+        "maxPoolSize": 50,
+        "serverSelectionTimeoutMS": 500
+    })
+
+    assert options["maxPoolSize"] == 50
+    assert options["serverSelectionTimeoutMS"] == 500
+    assert options["connectTimeoutMS"] == DEFAULT_CLIENT_OPTIONS[
+        "connectTimeoutMS"]
+
+
+def test_build_seeds_query():
+    items = (
+        ("a", SeedType.RAW),
+        ("b", SeedType.ENHANCED),
+        ("c", SeedType.RAW),
+    )
+
+    query = build_seeds_query(items=items)
+
+    assert query == {
+        "$or": [{
+            "seed_type": SeedType.RAW.value,
+            "identifier": {
+                "$in": ["a", "c"]
+            }
+        }, {
+            "seed_type": SeedType.ENHANCED.value,
+            "identifier": {
+                "$in": ["b"]
+            }
+        }]
+    }
+
+
+def test_map_missing_seed_error():
+    items = (("a", SeedType.RAW), ("b", SeedType.RAW), ("a", SeedType.RAW))
+
+    error = map_missing_seed_error(items=items, found=items[:1])
+    assert str(error) == f"Seed b.{SeedType.RAW.value} not found"
+
+    error = map_missing_seed_error(items=items, found=items[:2])
+    assert str(error) == f"Seed a.{SeedType.RAW.value} not found"
+
+
+def test_map_change_to_seed_keys():
+    change = {
+        "operationType": "insert",
+        "fullDocument": {
+            "identifier": "a",
+            "seed_type": SeedType.RAW.value
+        }
+    }
+
+    assert map_change_to_seed_keys(change=change) == (("a", SeedType.RAW), )
+
+    change = {"operationType": "delete", "documentKey": {"_id": "x"}}
+
+    assert map_change_to_seed_keys(change=change) is None
+
+
+def test_map_record_to_compact_seed():
+    seed = mock_raid_seed_raw()
+    record = build_seed_document(identifier="raid_seed_20220717",
+                                 seed_type=SeedType.RAW,
+                                 data=seed)
+
+    compact_seed = map_record_to_compact_seed(record=record)
+
+    assert map_compact_to_raid_seed(data=compact_seed) == seed
+    assert map_compact_to_raid_seed(
+        data=map_record_to_compact_seed(record=record, verify=True)) == seed
+
+    record["data"][0]["tier"] = "invalid"
+
+    assert map_record_to_compact_seed(record=record)[0].tier == "invalid"
+
+    with pytest.raises(ValidationError):
+        map_record_to_compact_seed(record=record, verify=True)
@@ -0,0 +1,563 @@
+import logging
+from typing import Any, FrozenSet, Generator, Iterable, List, Optional, Tuple
+
+import pymongo
+from pymongo import ReadPreference
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
+from pymongo.operations import UpdateOne
+from src.domain.mongo_causal_writes import CausalWriteTracker
+from src.domain.mongo_pool_monitor import PoolStats, PoolStatsListener
+from src.domain.mongo_seed_documents import (
+    CHANGE_STREAM_UNSUPPORTED_ERROR_CODE, CONNECTION_STRING_TEMPLATE,
+    IDENTIFIER_PROJECTION, INDEX_CONFLICT_ERROR_CODES,
+    INDEX_NOT_FOUND_ERROR_CODE, METADATA_PROJECTION,
+    MISSING_CONTENT_HASH_QUERY, MISSING_SEED_DATE_QUERY, POLL_INTERVAL,
+    SEED_DATE_INDEX_KEYS, SEED_DATE_INDEX_NAME, SEED_INDEX_KEYS,
+    SEED_INDEX_NAME, SEED_KEY_PROJECTION, build_client_options,
+    build_content_hash_update, build_retention_query, build_seed_date_backfill,
+    build_seed_date_index_options, build_seed_date_index_update,
+    build_seed_query, build_seed_write, build_seeds_query, create_seed_cache,
+    map_bulk_write_error, map_change_to_seed_keys, map_missing_seed_error,
+    map_pymongo_sort_order, map_read_preference, map_record_to_compact_seed,
+    map_record_to_metadata, map_seed_key, seed_cache_tags)
+from src.domain.seed_data_repository import SeedNotFoundError
+from src.model.compact_seed import (CompactSeed, map_compact_to_native,
+                                    map_compact_to_raid_seed)
+from src.model.raid_data import RaidSeed
+from src.model.seed_type import SeedType
+from src.utils.raid_info_index import RaidInfoIndex, build_raid_info_index
+from src.utils.serialized_seed import SerializedSeed, serialize_seed
+from src.utils.sort_order import SortOrder
+from src.utils.swr_cache import CacheStats
+
+logger = logging.getLogger(__name__)
+
+# yields Mongo operations and is sent back their results
+Steps = Generator[Any, Any, Any]
+
+
+def run_steps(steps: Steps) -> Any:
+    """Runs steps against pymongo: operations are done by the time they are
+    yielded, their results are sent straight back."""
+
+    try:
+        result = next(steps)
+
+        while True:
+            result = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def async_run_steps(steps: Steps) -> Any:
+    """Runs steps against Motor: each yielded operation is awaited, its result
+    sent back or its error thrown into the steps where it was yielded."""
+
+    result, error = None, None
+
+    while True:
+        try:
+            if error is None:
+                operation = steps.send(result)
+            else:
+                operation = steps.throw(error)
+        except StopIteration as stop:
+            return stop.value
+
+        try:
+            result, error = await operation, None
+        except Exception as err:
+            result, error = None, err
+
+
+def _sort_by_identifier(*, sort_order: SortOrder) -> List[Tuple[str, int]]:
+    return [("identifier", map_pymongo_sort_order(sort_order=sort_order))]
+
+
+def _build_content_hash_updates(*, records: List[dict]) -> List[UpdateOne]:
+    return [build_content_hash_update(record=record) for record in records]
+
+
+def _map_records_to_compact_seeds(*, records: List[dict],
+                                  verify: bool) -> Tuple[CompactSeed]:
+    return tuple(
+        map_record_to_compact_seed(record=record, verify=verify)
+        for record in records)
+
+
+def _map_compact_seeds_to_raid_seeds(
+        *, compact_seeds: Tuple[CompactSeed]) -> Tuple[RaidSeed]:
+    return tuple(
+        map_compact_to_raid_seed(data=compact_seed)
+        for compact_seed in compact_seeds)
+
+
+def _serialize_compact_seed(*, compact_seed: CompactSeed) -> SerializedSeed:
+    return serialize_seed(data=map_compact_to_native(data=compact_seed))
+
+
+def _build_compact_raid_info_index(*,
+                                   compact_seed: CompactSeed) -> RaidInfoIndex:
+    return build_raid_info_index(data=map_compact_to_native(data=compact_seed))
+
+
+class MongoSeedRepositoryMixin:
+    """The seed repository on Mongo, for the pymongo and Motor clients.
+
+    Methods ending in _steps are generators yielding each Mongo operation,
+    see run_steps and async_run_steps. The repositories only add the I/O:
+    _connect, _read_session and _write_session, and the primitives the steps
+    yield, which return results with pymongo and awaitables with Motor:
+
+    - _find and _find_one read from _read_collection in a read session
+    - _fetch_all lists a cursor
+    - _run_cpu calls a CPU bound function, off the event loop with Motor
+    - _in_write_session and _in_transaction run steps given a write session
+
+    besides the cached _list_compact_seeds and _get_compact_seed and the
+    public methods of their repository interface, wrapping the steps."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    _connection_string_template = CONNECTION_STRING_TEMPLATE
+
+    def __init__(self,
+                 *,
+                 url: str,
+                 username: str,
+                 password: str,
+                 db_name: str,
+                 coll_name: str,
+                 retention_days: Optional[int] = None,
+                 client_options: Optional[dict] = None,
+                 read_preference: Optional[str] = None,
+                 watch_changes: bool = False,
+                 poll_interval: float = POLL_INTERVAL,
+                 verify_reads: bool = False) -> None:
+        super().__init__()
+
+        self._connection_string = self._connection_string_template.format(
+            username=username, password=password, url=url)
+
+        self._client_options = build_client_options(
+            client_options=client_options)
+        self._pool_listener = PoolStatsListener()
+
+        self._client = self._connect()
+
+        self._database_name = db_name
+        self._database = self._client[db_name]
+
+        self._collection_name = coll_name
+
+        # writes and transactions always run on the primary
+        self._collection = self._database[coll_name].with_options(
+            read_preference=ReadPreference.PRIMARY)
+
+        self._read_preference = map_read_preference(name=read_preference)
+        self._read_collection = self._collection.with_options(
+            read_preference=self._read_preference)
+
+        self._write_tracker = CausalWriteTracker()
+
+        self._retention_days = retention_days
+
+        self._cache = create_seed_cache()
+        self._verify_reads = verify_reads
+
+        self._watch_changes = watch_changes
+        self._poll_interval = poll_interval
+        self._seed_keys: Optional[FrozenSet[Tuple[str, SeedType]]] = None
+
+    def _disconnect(self) -> None:
+        if self._client:
+            self._client.close()
+            self._client = None
+
+    def _needs_read_session(self) -> bool:
+        # the primary always returns this process' own writes
+        return (self._read_preference != ReadPreference.PRIMARY
+                and self._write_tracker.has_writes)
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self._cache.stats
+
+    @property
+    def pool_stats(self) -> PoolStats:
+        return self._pool_listener.stats
+
+    def _ensure_indexes_steps(self) -> Steps:
+        yield self._collection.create_index(SEED_INDEX_KEYS,
+                                            name=SEED_INDEX_NAME,
+                                            unique=True)
+
+        options = build_seed_date_index_options(
+            retention_days=self._retention_days)
+
+        try:
+            yield self._collection.create_index(SEED_DATE_INDEX_KEYS,
+                                                **options)
+        except OperationFailure as err:
+            if err.code not in INDEX_CONFLICT_ERROR_CODES:
+                raise
+
+            # retention mode changed since the index was created
+            yield from self._update_seed_date_index_steps(options=options)
+
+    def _update_seed_date_index_steps(self, *, options: dict) -> Steps:
+        command = build_seed_date_index_update(
+            coll_name=self._collection_name,
+            retention_days=self._retention_days)
+
+        if command is not None:
+            try:
+                yield self._database.command(command)
+                return
+            except OperationFailure as err:
+                # not a TTL index yet, or a server without collMod support
+                logger.info("Updating the seed date index failed: %s", err)
+
+        try:
+            yield self._collection.drop_index(SEED_DATE_INDEX_NAME)
+        except OperationFailure as err:
+            # dropped by another worker starting at the same time
+            if err.code != INDEX_NOT_FOUND_ERROR_CODE:
+                raise
+
+        yield self._collection.create_index(SEED_DATE_INDEX_KEYS, **options)
+
+    def _backfill_seed_dates_steps(self) -> Steps:
+        records = yield self._fetch_all(
+            self._collection.find(MISSING_SEED_DATE_QUERY, {"identifier": 1}))
+
+        requests = build_seed_date_backfill(records=records)
+
+        if requests:
+            yield self._collection.bulk_write(requests, ordered=False)
+
+    def _backfill_content_hashes_steps(self) -> Steps:
+        records = yield self._fetch_all(
+            self._collection.find(MISSING_CONTENT_HASH_QUERY, {"data": 1}))
+
+        # hashing serializes the whole seed, keep it off the event loop
+        requests = yield self._run_cpu(_build_content_hash_updates,
+                                       records=records)
+
+        if requests:
+            yield self._collection.bulk_write(requests, ordered=False)
+
+    def _teardown_db_steps(self) -> Steps:
+        yield self._client.drop_database(self._database_name)
+
+        self._disconnect()
+
+    def _list_seed_identifiers_steps(self, *, seed_type: Optional[SeedType],
+                                     sort_order: SortOrder) -> Steps:
+
+        records = yield self._find(
+            build_seed_query(seed_type=seed_type),
+            IDENTIFIER_PROJECTION,
+            sort=_sort_by_identifier(sort_order=sort_order))
+
+        return tuple(record["identifier"] for record in records)
+
+    def _get_seed_identifier_by_week_offset_steps(
+            self, *, seed_type: Optional[SeedType],
+            offset_weeks: int) -> Steps:
+
+        records = yield self._find(build_seed_query(seed_type=seed_type),
+                                   IDENTIFIER_PROJECTION,
+                                   sort=[("identifier", pymongo.DESCENDING)],
+                                   skip=abs(offset_weeks),
+                                   limit=1)
+
+        if not records:
+            return None
+
+        return records[0]["identifier"]
+
+    def _list_compact_seeds_steps(self, *, seed_type: Optional[SeedType],
+                                  sort_order: SortOrder) -> Steps:
+
+        records = yield self._find(
+            build_seed_query(seed_type=seed_type),
+            sort=_sort_by_identifier(sort_order=sort_order))
+
+        return (yield self._run_cpu(_map_records_to_compact_seeds,
+                                    records=records,
+                                    verify=self._verify_reads))
+
+    def _get_compact_seed_steps(self, *, identifier: str,
+                                seed_type: Optional[SeedType]) -> Steps:
+
+        record = yield self._find_one(
+            build_seed_query(seed_type=seed_type, identifier=identifier))
+
+        if record is None:
+            return None
+
+        return (yield self._run_cpu(map_record_to_compact_seed,
+                                    record=record,
+                                    verify=self._verify_reads))
+
+    def _list_seeds_steps(self, *, seed_type: Optional[SeedType],
+                          sort_order: SortOrder) -> Steps:
+
+        compact_seeds = yield self._list_compact_seeds(seed_type=seed_type,
+                                                       sort_order=sort_order)
+
+        return (yield self._run_cpu(_map_compact_seeds_to_raid_seeds,
+                                    compact_seeds=compact_seeds))
+
+    def _get_seed_by_identifier_steps(self, *, identifier: str,
+                                      seed_type: Optional[SeedType]) -> Steps:
+
+        compact_seed = yield self._get_compact_seed(identifier=identifier,
+                                                    seed_type=seed_type)
+
+        if compact_seed is None:
+            return None
+
+        return (yield self._run_cpu(map_compact_to_raid_seed,
+                                    data=compact_seed))
+
+    def _get_seed_by_week_offset_steps(self, *, seed_type: Optional[SeedType],
+                                       offset_weeks: int) -> Steps:
+
+        seed_id = yield self.get_seed_identifier_by_week_offset(
+            seed_type=seed_type, offset_weeks=offset_weeks)
+
+        if seed_id is None:
+            return None
+
+        return (yield self.get_seed_by_identifier(identifier=seed_id,
+                                                  seed_type=seed_type))
+
+    def _map_record_to_metadata_steps(self, *, record: dict) -> Steps:
+        content_hash = None
+
+        if "content_hash" not in record:
+            # stored before content hashes were persisted on save
+            serialized = yield self.get_serialized_seed(
+                identifier=record["identifier"],
+                seed_type=SeedType(record["seed_type"]))
+
+            content_hash = serialized.content_hash
+
+        return map_record_to_metadata(record=record, content_hash=content_hash)
+
+    def _get_seed_metadata_steps(self, *, identifier: str,
+                                 seed_type: Optional[SeedType]) -> Steps:
+
+        record = yield self._find_one(
+            build_seed_query(seed_type=seed_type, identifier=identifier),
+            METADATA_PROJECTION)
+
+        if record is None:
+            return None
+
+        return (yield from self._map_record_to_metadata_steps(record=record))
+
+    def _list_seed_metadata_steps(self, *, seed_type: Optional[SeedType],
+                                  sort_order: SortOrder) -> Steps:
+
+        records = yield self._find(
+            build_seed_query(seed_type=seed_type),
+            METADATA_PROJECTION,
+            sort=_sort_by_identifier(sort_order=sort_order))
+
+        metadata = []
+
+        for record in records:
+            metadata.append(
+                (yield from self._map_record_to_metadata_steps(record=record)))
+
+        return tuple(metadata)
+
+    def _get_serialized_seed_steps(self, *, identifier: str,
+                                   seed_type: Optional[SeedType]) -> Steps:
+
+        compact_seed = yield self._get_compact_seed(identifier=identifier,
+                                                    seed_type=seed_type)
+
+        if compact_seed is None:
+            return None
+
+        return (yield self._run_cpu(_serialize_compact_seed,
+                                    compact_seed=compact_seed))
+
+    def _get_raid_info_index_steps(self, *, identifier: str,
+                                   seed_type: Optional[SeedType]) -> Steps:
+
+        compact_seed = yield self._get_compact_seed(identifier=identifier,
+                                                    seed_type=seed_type)
+
+        if compact_seed is None:
+            return None
+
+        return (yield self._run_cpu(_build_compact_raid_info_index,
+                                    compact_seed=compact_seed))
+
+    def _invalidate(self, *, items: Iterable[Tuple[str, SeedType]]) -> None:
+        tags = tuple(tag for (identifier, seed_type) in items
+                     for tag in seed_cache_tags(identifier=identifier,
+                                                seed_type=seed_type))
+
+        if tags:
+            self._cache.invalidate(*tags)
+
+    def _apply_change(self, *, change: dict) -> None:
+        items = map_change_to_seed_keys(change=change)
+
+        if items is None:
+            self._cache.clear()
+        else:
+            self._invalidate(items=items)
+
+    def _poll_changes_steps(self) -> Steps:
+        # covered by the seed index, never reads documents
+        records = yield self._fetch_all(
+            self._collection.find({},
+                                  SEED_KEY_PROJECTION).hint(SEED_INDEX_NAME))
+
+        seed_keys = frozenset(
+            map_seed_key(record=record) for record in records)
+
+        if self._seed_keys is not None:
+            self._invalidate(items=seed_keys ^ self._seed_keys)
+
+        self._seed_keys = seed_keys
+
+    def _watch_failed(self, *, error: PyMongoError) -> bool:
+        """Logs why watching seed changes failed, True if the server has no
+        change streams and polling has to take over."""
+
+        if (isinstance(error, OperationFailure)
+                and error.code == CHANGE_STREAM_UNSUPPORTED_ERROR_CODE):
+            logger.info("Change streams unsupported, polling instead")
+            return True
+
+        logger.warning("Watching seed changes failed: %s", error)
+
+        return False
+
+    def _write_seeds_steps(self, *, session: Any,
+                           items: Tuple[Tuple[str, SeedType, RaidSeed]],
+                           duplicate_ok: bool) -> Steps:
+        """Writes all items in one bulk_write, returns the inserted ones."""
+
+        requests = [
+            build_seed_write(identifier=identifier,
+                             seed_type=seed_type,
+                             data=data,
+                             upsert=duplicate_ok)
+            for (identifier, seed_type, data) in items
+        ]
+
+        try:
+            result = yield self._collection.bulk_write(requests,
+                                                       ordered=True,
+                                                       session=session)
+        except BulkWriteError as err:
+            raise map_bulk_write_error(error=err, items=items) from err
+
+        if duplicate_ok:
+            return tuple(items[index][:2] for index in result.upserted_ids)
+
+        return tuple(item[:2] for item in items)
+
+    def _save_seed_steps(self, *, identifier: str, seed_type: SeedType,
+                         data: RaidSeed, duplicate_ok: bool) -> Steps:
+
+        items = ((identifier, seed_type, data), )
+
+        changed = yield self._in_write_session(self._write_seeds_steps,
+                                               items=items,
+                                               duplicate_ok=duplicate_ok)
+
+        self._invalidate(items=changed)
+
+    def _save_seeds_steps(self, *, items: Iterable[Tuple[str, SeedType,
+                                                         RaidSeed]],
+                          duplicate_ok: bool) -> Steps:
+
+        # the transaction may retry writing them
+        changed = yield self._in_transaction(self._write_seeds_steps,
+                                             items=tuple(items),
+                                             duplicate_ok=duplicate_ok)
+
+        self._invalidate(items=changed)
+
+    def _delete_one_steps(self, *, session: Any, query: dict) -> Steps:
+        result = yield self._collection.delete_one(query, session=session)
+
+        return result.deleted_count
+
+    def _delete_seed_steps(self, *, identifier: str, seed_type: SeedType,
+                           notfound_ok: bool) -> Steps:
+
+        deleted_count = yield self._in_write_session(
+            self._delete_one_steps,
+            query=build_seed_query(seed_type=seed_type, identifier=identifier))
+
+        if not notfound_ok and deleted_count == 0:
+            raise SeedNotFoundError(
+                f"Seed {identifier}.{seed_type.value} not found")
+
+        if deleted_count:
+            self._invalidate(items=((identifier, seed_type), ))
+
+    def _delete_many_steps(self, *, session: Any, query: dict,
+                           expected_count: Optional[int]) -> Steps:
+        result = yield self._collection.delete_many(query, session=session)
+
+        if expected_count is not None and result.deleted_count != expected_count:
+            # aborts the transaction, nothing is deleted
+            raise SeedNotFoundError()
+
+        return result.deleted_count
+
+    def _delete_seeds_steps(self, *, items: Iterable[Tuple[str, SeedType]],
+                            notfound_ok: bool) -> Steps:
+
+        items = tuple(items)
+
+        if not items:
+            return
+
+        query = build_seeds_query(items=items)
+
+        try:
+            deleted_count = yield self._in_transaction(
+                self._delete_many_steps,
+                query=query,
+                expected_count=None if notfound_ok else len(items))
+        except SeedNotFoundError:
+            records = yield self._fetch_all(
+                self._collection.find(query, SEED_KEY_PROJECTION))
+
+            found = tuple(map_seed_key(record=record) for record in records)
+
+            raise map_missing_seed_error(items=items, found=found) from None
+
+        if deleted_count:
+            self._invalidate(items=items)
+
+    def _delete_expired_steps(self, *, session: Any, query: dict) -> Steps:
+        # served by the seed_date index, only touches expired seeds
+        records = yield self._fetch_all(
+            self._collection.find(query, SEED_KEY_PROJECTION, session=session))
+
+        expired = tuple(map_seed_key(record=record) for record in records)
+
+        if expired:
+            yield self._collection.delete_many(query, session=session)
+
+        return expired
+
+    def _delete_seeds_older_than_steps(self, *, days: int) -> Steps:
+        expired = yield self._in_write_session(
+            self._delete_expired_steps, query=build_retention_query(days=days))
+
+        self._invalidate(items=expired)
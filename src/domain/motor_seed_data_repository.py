@@ -0,0 +1,350 @@
+import asyncio
+import contextlib
+import logging
+import operator
+from typing import Any, AsyncGenerator, Callable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from motor.motor_asyncio import (AsyncIOMotorClient, AsyncIOMotorClientSession,
+                                 AsyncIOMotorCursor)
+from pymongo import ReadPreference
+from pymongo.errors import PyMongoError
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
+from src.domain.mongo_seed_documents import (SEED_CHANGE_PIPELINE,
+                                             WATCH_RETRY_SECONDS,
+                                             seed_cache_key, seed_cache_tag,
+                                             seed_list_cache_tag)
+from src.domain.mongo_seed_repository_mixin import (MongoSeedRepositoryMixin,
+                                                    Steps, async_run_steps)
+from src.model.compact_seed import CompactSeed
+from src.model.raid_data import RaidSeed
+from src.model.seed_metadata import SeedMetadata
+from src.model.seed_type import SeedType
+from src.utils.raid_info_index import RaidInfoIndex
+from src.utils.serialized_seed import SerializedSeed
+from src.utils.single_flight import async_single_flight
+from src.utils.sort_order import SortOrder
+from src.utils.swr_cache import async_swr_cachedmethod
+
+logger = logging.getLogger(__name__)
+
+
+class MotorSeedDataRepository(MongoSeedRepositoryMixin,
+                              AsyncSeedDataRepository):
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def _connect(self) -> AsyncIOMotorClient:
+        # connect lazily: the client is created before gunicorn forks
+        return AsyncIOMotorClient(self._connection_string,
+                                  connect=False,
+                                  event_listeners=[self._pool_listener],
+                                  **self._client_options)
+
+    @contextlib.asynccontextmanager
+    async def _write_session(
+            self) -> AsyncGenerator[AsyncIOMotorClientSession, None]:
+        session = await self._client.start_session(causal_consistency=True)
+
+        async with session:
+            yield session
+
+            self._write_tracker.record(session=session)
+
+    @contextlib.asynccontextmanager
+    async def _read_session(
+            self) -> AsyncGenerator[Optional[AsyncIOMotorClientSession], None]:
+        if not self._needs_read_session():
+            yield None
+            return
+
+        session = await self._client.start_session(causal_consistency=True)
+
+        async with session:
+            self._write_tracker.advance(session=session)
+
+            yield session
+
+    async def _find(self, *args, **kwargs) -> List[dict]:
+        async with self._read_session() as session:
+            cursor = self._read_collection.find(*args,
+                                                session=session,
+                                                **kwargs)
+
+            return await cursor.to_list(length=None)
+
+    async def _find_one(self, *args, **kwargs) -> Optional[dict]:
+        async with self._read_session() as session:
+            return await self._read_collection.find_one(*args,
+                                                        session=session,
+                                                        **kwargs)
+
+    @staticmethod
+    async def _fetch_all(cursor: AsyncIOMotorCursor) -> List[dict]:
+        return await cursor.to_list(length=None)
+
+    @staticmethod
+    async def _run_cpu(func: Callable, **kwargs) -> Any:
+        return await run_in_threadpool(func, **kwargs)
+
+    async def _in_write_session(self, steps_func: Callable[..., Steps],
+                                **kwargs) -> Any:
+        async with self._write_session() as session:
+            return await async_run_steps(steps_func(session=session, **kwargs))
+
+    async def _in_transaction(self, steps_func: Callable[..., Steps],
+                              **kwargs) -> Any:
+        async with self._write_session() as session:
+            return await session.with_transaction(
+                lambda s: async_run_steps(steps_func(session=s, **kwargs)),
+                read_preference=ReadPreference.PRIMARY)
+
+    async def startup(self) -> None:
+        await self.ensure_indexes()
+        await self.backfill_seed_dates()
+        await self._backfill_content_hashes()
+
+        if self._watch_changes:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def ensure_indexes(self) -> None:
+        await async_run_steps(self._ensure_indexes_steps())
+
+    async def backfill_seed_dates(self) -> None:
+        await async_run_steps(self._backfill_seed_dates_steps())
+
+    async def _backfill_content_hashes(self) -> None:
+        await async_run_steps(self._backfill_content_hashes_steps())
+
+    def close(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+        self._disconnect()
+
+    async def _teardown_db(self) -> None:
+        await async_run_steps(self._teardown_db_steps())
+
+    async def list_seed_identifiers(
+            self,
+            *,
+            seed_type: Optional[SeedType] = None,
+            sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[str]:
+
+        return await async_run_steps(
+            self._list_seed_identifiers_steps(seed_type=seed_type,
+                                              sort_order=sort_order))
+
+    async def get_seed_identifier_by_week_offset(
+            self,
+            *,
+            seed_type: Optional[SeedType] = None,
+            offset_weeks: int = 0) -> Optional[str]:
+
+        return await async_run_steps(
+            self._get_seed_identifier_by_week_offset_steps(
+                seed_type=seed_type, offset_weeks=offset_weeks))
+
+    @async_swr_cachedmethod(operator.attrgetter("_cache"),
+                            key=seed_cache_key("seeds"),
+                            tag=seed_list_cache_tag)
+    @async_single_flight()
+    async def _list_compact_seeds(
+            self,
+            *,
+            seed_type: Optional[SeedType] = None,
+            sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[CompactSeed]:
+
+        return await async_run_steps(
+            self._list_compact_seeds_steps(seed_type=seed_type,
+                                           sort_order=sort_order))
+
+    @async_swr_cachedmethod(operator.attrgetter("_cache"),
+                            key=seed_cache_key("seed"),
+                            tag=seed_cache_tag)
+    @async_single_flight()
+    async def _get_compact_seed(
+            self,
+            *,
+            identifier: str,
+            seed_type: Optional[SeedType] = None) -> Optional[CompactSeed]:
+
+        return await async_run_steps(
+            self._get_compact_seed_steps(identifier=identifier,
+                                         seed_type=seed_type))
+
+    async def list_seeds(
+            self,
+            *,
+            seed_type: Optional[SeedType] = None,
+            sort_order: SortOrder = SortOrder.ASCENDING) -> Tuple[RaidSeed]:
+
+        return await async_run_steps(
+            self._list_seeds_steps(seed_type=seed_type, sort_order=sort_order))
+
+    async def get_seed_by_identifier(
+            self,
+            *,
+            identifier: str,
+            seed_type: Optional[SeedType] = None) -> Optional[RaidSeed]:
+
+        return await async_run_steps(
+            self._get_seed_by_identifier_steps(identifier=identifier,
+                                               seed_type=seed_type))
+
+    @async_swr_cachedmethod(operator.attrgetter("_cache"),
+                            key=seed_cache_key("seed_metadata"),
+                            tag=seed_cache_tag)
+    @async_single_flight()
+    async def get_seed_metadata(
+            self,
+            *,
+            identifier: str,
+            seed_type: Optional[SeedType] = None) -> Optional[SeedMetadata]:
+
+        return await async_run_steps(
+            self._get_seed_metadata_steps(identifier=identifier,
+                                          seed_type=seed_type))
+
+    @async_swr_cachedmethod(operator.attrgetter("_cache"),
+                            key=seed_cache_key("seed_metadata_list"),
+                            tag=seed_list_cache_tag)
+    async def list_seed_metadata(
+            self,
+            *,
+            seed_type: Optional[SeedType] = None,
+            sort_order: SortOrder = SortOrder.ASCENDING
+    ) -> Tuple[SeedMetadata]:
+
+        return await async_run_steps(
+            self._list_seed_metadata_steps(seed_type=seed_type,
+                                           sort_order=sort_order))
+
+    @async_swr_cachedmethod(operator.attrgetter("_cache"),
+                            key=seed_cache_key("serialized_seed"),
+                            tag=seed_cache_tag)
+    @async_single_flight()
+    async def get_serialized_seed(
+            self,
+            *,
+            identifier: str,
+            seed_type: Optional[SeedType] = None) -> Optional[SerializedSeed]:
+
+        return await async_run_steps(
+            self._get_serialized_seed_steps(identifier=identifier,
+                                            seed_type=seed_type))
+
+    @async_swr_cachedmethod(operator.attrgetter("_cache"),
+                            key=seed_cache_key("raid_info_index"),
+                            tag=seed_cache_tag)
+    @async_single_flight()
+    async def get_raid_info_index(
+            self,
+            *,
+            identifier: str,
+            seed_type: Optional[SeedType] = None) -> Optional[RaidInfoIndex]:
+
+        return await async_run_steps(
+            self._get_raid_info_index_steps(identifier=identifier,
+                                            seed_type=seed_type))
+
+    async def get_seed_by_week_offset(
+        self,
+        *,
+        seed_type: Optional[SeedType] = None,
+        offset_weeks: int = 0,
+    ) -> Optional[RaidSeed]:
+
+        return await async_run_steps(
+            self._get_seed_by_week_offset_steps(seed_type=seed_type,
+                                                offset_weeks=offset_weeks))
+
+    async def _poll_changes(self) -> None:
+        await async_run_steps(self._poll_changes_steps())
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await self._poll_changes()
+            except PyMongoError as err:
+                logger.warning("Polling seed changes failed: %s", err)
+
+            await asyncio.sleep(self._poll_interval)
+
+    async def _watch(self) -> None:
+        while True:
+            try:
+                async with self._collection.watch(
+                        SEED_CHANGE_PIPELINE) as stream:
+                    async for change in stream:
+                        self._apply_change(change=change)
+            except PyMongoError as err:
+                if self._watch_failed(error=err):
+                    await self._poll()
+                    return
+
+            # changes may have been missed until the stream is reopened
+            self._cache.clear()
+            await asyncio.sleep(WATCH_RETRY_SECONDS)
+
+    async def save_seed(self,
+                        *,
+                        identifier: str,
+                        seed_type: SeedType,
+                        data: RaidSeed,
+                        _duplicate_ok: bool = False) -> None:
+
+        await async_run_steps(
+            self._save_seed_steps(identifier=identifier,
+                                  seed_type=seed_type,
+                                  data=data,
+                                  duplicate_ok=_duplicate_ok))
+
+    async def save_seeds(self,
+                         *,
+                         items: Tuple[Tuple[str, SeedType, RaidSeed]],
+                         _duplicate_ok: bool = False) -> None:
+
+        await async_run_steps(
+            self._save_seeds_steps(items=items, duplicate_ok=_duplicate_ok))
+
+    async def delete_seed(self,
+                          *,
+                          identifier: str,
+                          seed_type: SeedType,
+                          _notfound_ok: bool = False) -> None:
+
+        await async_run_steps(
+            self._delete_seed_steps(identifier=identifier,
+                                    seed_type=seed_type,
+                                    notfound_ok=_notfound_ok))
+
+    async def delete_seeds(self,
+                           *,
+                           items: Tuple[Tuple[str, SeedType]],
+                           _notfound_ok: bool = False) -> None:
+
+        await async_run_steps(
+            self._delete_seeds_steps(items=items, notfound_ok=_notfound_ok))
+
+    async def delete_seeds_older_than(self, *, days: int) -> None:
+        await async_run_steps(self._delete_seeds_older_than_steps(days=days))
+
+
+@contextlib.asynccontextmanager
+async def temp_repo(**kwargs) -> AsyncGenerator[MotorSeedDataRepository, None]:
+
+    repo = MotorSeedDataRepository(**kwargs)
+
+    # pylint: disable=protected-access
+
+    try:
+        await repo.startup()
+
+        yield repo
+    finally:
+        await repo._teardown_db()
@@ -0,0 +1,510 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+from test.mocks import (mock_raid_seed_enhanced, mock_raid_seed_raw,
+                        mock_seed_identifier)
+from test.utils.assert_deep_equals import assert_deep_equals
+
+import pytest
+import pytest_asyncio
+from pymongo import ReadPreference
+from src.domain.mongo_seed_documents import (SEED_DATE_INDEX_KEYS,
+                                             SEED_DATE_INDEX_NAME,
+                                             SEED_INDEX_KEYS, SEED_INDEX_NAME,
+                                             build_seed_document)
+from src.domain.motor_seed_data_repository import (MotorSeedDataRepository,
+                                                   temp_repo)
+from src.domain.seed_data_repository import (SeedDuplicateError,
+                                             SeedNotFoundError)
+from src.model.raid_data import map_to_native_object
+from src.model.seed_type import SeedType
+from src.utils.get_env import get_env
+from src.utils.sort_order import SortOrder
+
+# pylint: disable=redefined-outer-name,duplicate-code
+
+
+@pytest_asyncio.fixture
+async def repo() -> MotorSeedDataRepository:
+    repo_init_kwargs = {
+        "url": get_env(key="MONGO_URL"),
+        "username": get_env(key="MONGO_USERNAME"),
+        "password": get_env(key="MONGO_PASSWORD"),
+        "db_name": str(uuid.uuid4()),
+        "coll_name": "test",
+    }
+
+    async with temp_repo(**repo_init_kwargs) as repo:
+        yield repo
+
+
+@pytest.mark.asyncio
+async def test_startup(repo: MotorSeedDataRepository):
+    await repo.startup()
+
+    # pylint: disable=protected-access
+    indexes = await repo._collection.index_information()
+
+    assert indexes[SEED_INDEX_NAME]["key"] == SEED_INDEX_KEYS
+    assert indexes[SEED_INDEX_NAME]["unique"]
+
+    assert indexes[SEED_DATE_INDEX_NAME]["key"] == SEED_DATE_INDEX_KEYS
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_retention_days_changed(
+        repo: MotorSeedDataRepository):
+    cases = ((30, 2592000), (60, 5184000), (None, None))
+
+    # pylint: disable=protected-access
+    for retention_days, expire_after in cases:
+        repo._retention_days = retention_days
+        await repo.ensure_indexes()
+
+        indexes = await repo._collection.index_information()
+
+        assert indexes[SEED_DATE_INDEX_NAME].get(
+            "expireAfterSeconds") == expire_after
+
+
+@pytest.mark.asyncio
+async def test_read_preference():
+    repo_init_kwargs = {
+        "url": get_env(key="MONGO_URL"),
+        "username": get_env(key="MONGO_USERNAME"),
+        "password": get_env(key="MONGO_PASSWORD"),
+        "db_name": str(uuid.uuid4()),
+        "coll_name": "test",
+        "read_preference": "secondaryPreferred",
+    }
+
+    async with temp_repo(**repo_init_kwargs) as repo:
+        # pylint: disable=protected-access
+        assert repo._collection.read_preference == ReadPreference.PRIMARY
+        assert repo._read_collection.read_preference == (
+            ReadPreference.SECONDARY_PREFERRED)
+
+        seed_id = mock_seed_identifier()
+        seed = mock_raid_seed_raw()
+
+        await repo.save_seed(identifier=seed_id,
+                             seed_type=SeedType.RAW,
+                             data=seed)
+
+        # causally consistent with the write above, even on a secondary
+        assert await repo.list_seed_identifiers() == (seed_id, )
+
+        saved_seed = await repo.get_seed_by_identifier(identifier=seed_id,
+                                                       seed_type=SeedType.RAW)
+
+        assert_deep_equals(seed, saved_seed)
+
+
+@pytest.mark.asyncio
+async def test_poll_changes(repo: MotorSeedDataRepository):
+    # pylint: disable=protected-access
+    await repo._poll_changes()
+
+    assert len(await repo.list_seeds()) == 0
+
+    seed_id = mock_seed_identifier()
+
+    # written by another worker, bypassing this repo's cache
+    await repo._collection.insert_one(
+        build_seed_document(identifier=seed_id,
+                            seed_type=SeedType.RAW,
+                            data=mock_raid_seed_raw()))
+
+    assert len(await repo.list_seeds()) == 0
+
+    await repo._poll_changes()
+
+    assert len(await repo.list_seeds()) == 1
+
+
+@pytest.mark.asyncio
+async def test_apply_change(repo: MotorSeedDataRepository):
+    assert len(await repo.list_seeds()) == 0
+
+    seed_id = mock_seed_identifier()
+    document = build_seed_document(identifier=seed_id,
+                                   seed_type=SeedType.RAW,
+                                   data=mock_raid_seed_raw())
+
+    # pylint: disable=protected-access
+    await repo._collection.insert_one(document)
+    repo._apply_change(change={
+        "operationType": "insert",
+        "fullDocument": document
+    })
+
+    assert len(await repo.list_seeds()) == 1
+
+    await repo._collection.delete_one({"_id": document["_id"]})
+    repo._apply_change(change={
+        "operationType": "delete",
+        "documentKey": {
+            "_id": document["_id"]
+        }
+    })
+
+    assert len(await repo.list_seeds()) == 0
+
+
+def mock_items():
+    ids = tuple(mock_seed_identifier() for _ in range(4))
+
+    seeds = (
+        *(mock_raid_seed_raw() for _ in range(2)),
+        *(mock_raid_seed_enhanced() for _ in range(2)),
+    )
+
+    seed_types = (
+        *(SeedType.RAW for _ in range(2)),
+        *(SeedType.ENHANCED for _ in range(2)),
+    )
+
+    return tuple(zip(ids, seed_types, seeds))
+
+
+class TestSaveSeed:
+
+    @pytest.mark.asyncio
+    async def test_one_success(self, repo: MotorSeedDataRepository):
+        for (seed_id, seed_type, seed) in mock_items():
+            id_kwargs = {"identifier": seed_id, "seed_type": seed_type}
+
+            await repo.save_seed(data=seed, **id_kwargs)
+
+            saved_seed = await repo.get_seed_by_identifier(**id_kwargs)
+
+            assert_deep_equals(seed, saved_seed)
+
+    @pytest.mark.asyncio
+    async def test_one_duplicate(self, repo: MotorSeedDataRepository):
+        (seed_id, seed_type, seed), *_ = mock_items()
+
+        id_kwargs = {"identifier": seed_id, "seed_type": seed_type}
+
+        await repo.save_seed(data=seed, **id_kwargs)
+
+        with pytest.raises(SeedDuplicateError,
+                           match=f"{seed_id}.{seed_type.value}"):
+            await repo.save_seed(data=seed, **id_kwargs)
+
+        await repo.save_seed(data=seed, _duplicate_ok=True, **id_kwargs)
+
+    @pytest.mark.asyncio
+    async def test_one_invalid(self, repo: MotorSeedDataRepository):
+        with pytest.raises(ValueError, match=SeedType.ENHANCED.value):
+            await repo.save_seed(identifier=mock_seed_identifier(),
+                                 seed_type=SeedType.ENHANCED,
+                                 data=mock_raid_seed_raw())
+
+    @pytest.mark.asyncio
+    async def test_multiple_success(self, repo: MotorSeedDataRepository):
+        items = mock_items()
+
+        await repo.save_seeds(items=iter(items))
+
+        for (seed_id, seed_type, seed) in items:
+            saved_seed = await repo.get_seed_by_identifier(
+                identifier=seed_id, seed_type=seed_type)
+
+            assert_deep_equals(seed, saved_seed)
+
+    @pytest.mark.asyncio
+    async def test_multiple_duplicate(self, repo: MotorSeedDataRepository):
+        items = mock_items()
+
+        with pytest.raises(SeedDuplicateError, match=items[0][0]):
+            await repo.save_seeds(items=(*items, items[0]))
+
+        assert len(await repo.list_seed_identifiers()) == 0
+
+    @pytest.mark.asyncio
+    async def test_multiple_invalid(self, repo: MotorSeedDataRepository):
+        items = mock_items()
+
+        with pytest.raises(ValueError):
+            await repo.save_seeds(items=(*items, ("invalid", SeedType.RAW,
+                                                  "invalid")))
+
+        assert len(await repo.list_seed_identifiers()) == 0
+
+
+class TestSeeds:
+
+    items = mock_items()
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def seeds(self, repo: MotorSeedDataRepository):
+        await repo.save_seeds(items=self.items)
+
+    @pytest.mark.asyncio
+    async def test_list_seed_identifiers(self, repo: MotorSeedDataRepository):
+        for seed_type in SeedType:
+            ids = tuple(i[0] for i in self.items if i[1] == seed_type)
+
+            for sort_order in SortOrder:
+                saved_ids = await repo.list_seed_identifiers(
+                    seed_type=seed_type, sort_order=sort_order)
+
+                assert saved_ids == tuple(
+                    sorted(ids,
+                           reverse=sort_order == SortOrder.DESCENDING))
+
+    @pytest.mark.asyncio
+    async def test_list_seeds(self, repo: MotorSeedDataRepository):
+        for seed_type in SeedType:
+            items = sorted(i for i in self.items if i[1] == seed_type)
+
+            seeds = await repo.list_seeds(seed_type=seed_type)
+
+            assert_deep_equals(seeds, tuple(i[2] for i in items))
+
+    @pytest.mark.asyncio
+    async def test_get_seed_by_identifier(self,
+                                          repo: MotorSeedDataRepository):
+        for (seed_id, seed_type, seed) in self.items:
+            saved_seed = await repo.get_seed_by_identifier(
+                identifier=seed_id, seed_type=seed_type)
+
+            assert saved_seed == seed
+
+        result = await repo.get_seed_by_identifier(identifier="doesnotexist",
+                                                   seed_type=SeedType.RAW)
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_get_seed_by_week_offset(self,
+                                           repo: MotorSeedDataRepository):
+        for seed_type in SeedType:
+            items = sorted((i for i in self.items if i[1] == seed_type),
+                           reverse=True)
+
+            for offset_weeks, (seed_id, _, seed) in enumerate(items):
+                saved_id = await repo.get_seed_identifier_by_week_offset(
+                    seed_type=seed_type, offset_weeks=offset_weeks)
+
+                saved_seed = await repo.get_seed_by_week_offset(
+                    seed_type=seed_type, offset_weeks=offset_weeks)
+
+                assert saved_id == seed_id
+                assert saved_seed == seed
+
+            result = await repo.get_seed_by_week_offset(
+                seed_type=seed_type, offset_weeks=len(items))
+
+            assert result is None
+
+    @pytest.mark.asyncio
+    async def test_cache_invalidation(self, repo: MotorSeedDataRepository):
+        (seed_id, seed_type, seed), *_ = self.items
+
+        await repo.get_seed_by_identifier(identifier=seed_id,
+                                          seed_type=seed_type)
+        await repo.list_seeds(seed_type=SeedType.RAW)
+
+        seeds_enhanced = await repo.list_seeds(seed_type=SeedType.ENHANCED)
+
+        await repo.save_seed(identifier=mock_seed_identifier(),
+                             seed_type=SeedType.ENHANCED,
+                             data=mock_raid_seed_enhanced())
+
+        hits = repo.cache_stats.hits
+
+        assert await repo.get_seed_by_identifier(identifier=seed_id,
+                                                 seed_type=seed_type) == seed
+        await repo.list_seeds(seed_type=SeedType.RAW)
+
+        assert repo.cache_stats.hits == hits + 2
+
+        assert len(await repo.list_seeds(
+            seed_type=SeedType.ENHANCED)) == len(seeds_enhanced) + 1
+        assert repo.cache_stats.hits == hits + 2
+
+    @pytest.mark.asyncio
+    async def test_get_seed_metadata(self, repo: MotorSeedDataRepository):
+        for (seed_id, seed_type, _) in self.items:
+            metadata = await repo.get_seed_metadata(identifier=seed_id,
+                                                    seed_type=seed_type)
+
+            serialized = await repo.get_serialized_seed(identifier=seed_id,
+                                                        seed_type=seed_type)
+
+            assert metadata.identifier == seed_id
+            assert metadata.seed_type == seed_type
+            assert metadata.content_hash == serialized.content_hash
+
+        for seed_type in SeedType:
+            metadata = await repo.list_seed_metadata(seed_type=seed_type)
+
+            assert tuple(m.identifier for m in metadata) == \
+                await repo.list_seed_identifiers(seed_type=seed_type)
+
+    @pytest.mark.asyncio
+    async def test_get_serialized_seed(self, repo: MotorSeedDataRepository):
+        for (seed_id, seed_type, seed) in self.items:
+            serialized = await repo.get_serialized_seed(identifier=seed_id,
+                                                        seed_type=seed_type)
+
+            index = await repo.get_raid_info_index(identifier=seed_id,
+                                                   seed_type=seed_type)
+
+            raid_infos = map_to_native_object(data=seed)
+
+            assert_deep_equals(json.loads(serialized.body), raid_infos)
+
+            for raid_info in raid_infos:
+                key = (raid_info["tier"], raid_info["level"])
+
+                assert_deep_equals(index[key], raid_info)
+
+    @pytest.mark.asyncio
+    async def test_get_serialized_seed_concurrent(
+            self, repo: MotorSeedDataRepository):
+        (seed_id, seed_type, _), *_ = self.items
+
+        # pylint: disable=protected-access
+        run_cpu = repo._run_cpu
+        funcs = []
+
+        async def counting_run_cpu(func, **kwargs):
+            funcs.append(func.__name__)
+            return await run_cpu(func, **kwargs)
+
+        repo._run_cpu = counting_run_cpu
+
+        results = await asyncio.gather(*(repo.get_serialized_seed(
+            identifier=seed_id, seed_type=seed_type) for _ in range(5)))
+
+        assert funcs.count("_serialize_compact_seed") == 1
+        assert all(result is results[0] for result in results)
+
+
+class TestDeleteSeed:
+
+    items = mock_items()
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def seeds(self, repo: MotorSeedDataRepository):
+        await repo.save_seeds(items=self.items)
+
+    @pytest.mark.asyncio
+    async def test_one_success(self, repo: MotorSeedDataRepository):
+        for (seed_id, seed_type, _) in self.items:
+            id_kwargs = {"identifier": seed_id, "seed_type": seed_type}
+
+            await repo.get_seed_by_identifier(**id_kwargs)
+            await repo.delete_seed(**id_kwargs)
+
+            assert await repo.get_seed_by_identifier(**id_kwargs) is None
+
+    @pytest.mark.asyncio
+    async def test_one_notfound(self, repo: MotorSeedDataRepository):
+        with pytest.raises(SeedNotFoundError,
+                           match=f"doesnotexist.{SeedType.RAW.value}"):
+            await repo.delete_seed(identifier="doesnotexist",
+                                   seed_type=SeedType.RAW)
+
+        await repo.delete_seed(identifier="doesnotexist",
+                               seed_type=SeedType.RAW,
+                               _notfound_ok=True)
+
+    @pytest.mark.asyncio
+    async def test_multiple_success(self, repo: MotorSeedDataRepository):
+        await repo.delete_seeds(items=((i[0], i[1]) for i in self.items))
+
+        assert len(await repo.list_seed_identifiers()) == 0
+
+    @pytest.mark.asyncio
+    async def test_multiple_notfound(self, repo: MotorSeedDataRepository):
+        items = (*((i[0], i[1]) for i in self.items),
+                 ("doesnotexist", SeedType.RAW))
+
+        with pytest.raises(SeedNotFoundError, match="doesnotexist"):
+            await repo.delete_seeds(items=items)
+
+        assert len(await repo.list_seed_identifiers()) == len(self.items)
+
+    @pytest.mark.asyncio
+    async def test_multiple_notfound_ok(self, repo: MotorSeedDataRepository):
+        items = (("doesnotexist", SeedType.RAW),
+                 *((i[0], i[1]) for i in self.items[1:]))
+
+        await repo.delete_seeds(items=items, _notfound_ok=True)
+
+        assert await repo.list_seed_identifiers() == (self.items[0][0], )
+
+
+class TestDeleteOldSeeds:
+
+    today = datetime.now().date()
+
+    _ids = (
+        f"raid_seed_{today.strftime('%Y%m%d')}",
+        f"raid_seed_{(today - timedelta(days=7)).strftime('%Y%m%d')}",
+        f"raid_seed_{(today - timedelta(days=14)).strftime('%Y%m%d')}",
+    )
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def seeds(self, repo: MotorSeedDataRepository):
+        await repo.save_seeds(items=(
+            *((seed_id, SeedType.RAW, mock_raid_seed_raw())
+              for seed_id in self._ids),
+            *((seed_id, SeedType.ENHANCED, mock_raid_seed_enhanced())
+              for seed_id in self._ids),
+        ))
+
+    @pytest.mark.asyncio
+    async def test_none_found(self, repo: MotorSeedDataRepository):
+        await repo.delete_seeds_older_than(days=15)
+
+        assert set(await repo.list_seed_identifiers()) == set(self._ids)
+
+    @pytest.mark.asyncio
+    async def test_success(self, repo: MotorSeedDataRepository):
+        await repo.delete_seeds_older_than(days=10)
+
+        assert set(await repo.list_seed_identifiers()) == set(self._ids[:2])
+
+        await repo.delete_seeds_older_than(days=-1)
+
+        assert len(await repo.list_seed_identifiers()) == 0
+
+    @pytest.mark.asyncio
+    async def test_backfill_seed_dates(self, repo: MotorSeedDataRepository):
+        # pylint: disable=protected-access
+        await repo._collection.update_many({}, {"$unset": {"seed_date": ""}})
+
+        await repo.delete_seeds_older_than(days=10)
+
+        assert set(await repo.list_seed_identifiers()) == set(self._ids)
+
+        await repo.backfill_seed_dates()
+        await repo.delete_seeds_older_than(days=10)
+
+        assert set(await repo.list_seed_identifiers()) == set(self._ids[:2])
+
+    @pytest.mark.asyncio
+    async def test_backfill_content_hashes(self,
+                                           repo: MotorSeedDataRepository):
+        # pylint: disable=protected-access
+        expected = (await repo._collection.find_one({}))["content_hash"]
+
+        await repo._collection.update_many({},
+                                           {"$unset": {
+                                               "content_hash": ""
+                                           }})
+
+        await repo._backfill_content_hashes()
+
+        async for record in repo._collection.find({}, {"content_hash": 1}):
+            assert "content_hash" in record
+
+        record = await repo._collection.find_one({})
+
+        assert record["content_hash"] == expected
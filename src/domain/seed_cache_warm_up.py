@@ -0,0 +1,39 @@
+import logging
+import time
+
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
+from src.model.seed_type import SeedType
+from src.utils.sort_order import SortOrder
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_COUNT = 2
+
+
+async def warm_up_seed_cache(*,
+                             repo: AsyncSeedDataRepository,
+                             count: int = WARM_UP_COUNT) -> int:
+    """Loads the count most recent seeds of each type the way the seed and
+    raid info routes do, returns how many seeds were loaded."""
+
+    start = time.perf_counter()
+    warmed = 0
+
+    for seed_type in SeedType:
+        ids = await repo.list_seed_identifiers(seed_type=seed_type,
+                                               sort_order=SortOrder.DESCENDING)
+
+        for identifier in ids[:count]:
+            await repo.get_seed_metadata(identifier=identifier,
+                                         seed_type=seed_type)
+            await repo.get_serialized_seed(identifier=identifier,
+                                           seed_type=seed_type)
+            await repo.get_raid_info_index(identifier=identifier,
+                                           seed_type=seed_type)
+
+            warmed += 1
+
+    logger.info("Warmed up %d seeds in %.3fs", warmed,
+                time.perf_counter() - start)
+
+    return warmed
@@ -0,0 +1,44 @@
+from unittest.mock import AsyncMock, Mock, call
+
+import pytest
+from src.domain.seed_cache_warm_up import warm_up_seed_cache
+from src.model.seed_type import SeedType
+from src.utils.sort_order import SortOrder
+
+
+@pytest.mark.asyncio
+async def test_warm_up_seed_cache():
+    repo = Mock()
+    repo.list_seed_identifiers = AsyncMock(return_value=("c", "b", "a"))
+    repo.get_seed_metadata = AsyncMock()
+    repo.get_serialized_seed = AsyncMock()
+    repo.get_raid_info_index = AsyncMock()
+
+    warmed = await warm_up_seed_cache(repo=repo, count=2)
+
+    assert warmed == 2 * len(SeedType)
+
+    repo.list_seed_identifiers.assert_has_calls([
+        call(seed_type=seed_type, sort_order=SortOrder.DESCENDING)
+        for seed_type in SeedType
+    ])
+
+    expected = [
+        call(identifier=identifier, seed_type=seed_type)
+        for seed_type in SeedType for identifier in ("c", "b")
+    ]
+
+    assert repo.get_seed_metadata.call_args_list == expected
+    assert repo.get_serialized_seed.call_args_list == expected
+    assert repo.get_raid_info_index.call_args_list == expected
+
+
+@pytest.mark.asyncio
+async def test_warm_up_seed_cache_empty():
+    repo = Mock()
+    repo.list_seed_identifiers = AsyncMock(return_value=())
+    repo.get_seed_metadata = AsyncMock()
+
+    assert await warm_up_seed_cache(repo=repo) == 0
+
+    repo.get_seed_metadata.assert_not_called()
@@ -0,0 +1,67 @@
+import asyncio
+import functools
+import logging
+from typing import Awaitable, Callable, Optional, Sequence
+
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
+from src.domain.seed_cache_warm_up import WARM_UP_COUNT, warm_up_seed_cache
+
+logger = logging.getLogger(__name__)
+
+STARTUP_RETRY_INTERVAL = 30
+
+Step = Callable[[], Awaitable]
+
+
+async def _retry_steps(*, steps: Sequence[Step],
+                       retry_interval: float) -> None:
+    await asyncio.sleep(retry_interval)
+
+    for step in steps:
+        while True:
+            try:
+                await step()
+                break
+            except Exception as err:
+                logger.warning("Starting the seed data repository failed: %s",
+                               err)
+
+            await asyncio.sleep(retry_interval)
+
+    logger.info("Started the seed data repository")
+
+
+async def start_seed_data_repo(
+        *,
+        repo: AsyncSeedDataRepository,
+        warm_up_count: int = WARM_UP_COUNT,
+        retry_interval: float = STARTUP_RETRY_INTERVAL
+) -> Optional[asyncio.Task]:
+    """Starts the repository and warms up its cache before serving.
+
+    A failed step does not abort the app's startup, it and the steps after
+    it are retried in the returned task instead. Until then, requests reach
+    the repository uncached and fail as long as it is unreachable.
+    """
+
+    steps = [repo.startup]
+
+    if warm_up_count > 0:
+        steps.append(
+            functools.partial(warm_up_seed_cache,
+                              repo=repo,
+                              count=warm_up_count))
+
+    for index, step in enumerate(steps):
+        try:
+            await step()
+        except Exception as err:
+            logger.warning(
+                "Starting the seed data repository failed, retrying in "
+                "the background: %s", err)
+
+            return asyncio.create_task(
+                _retry_steps(steps=steps[index:],
+                             retry_interval=retry_interval))
+
+    return None
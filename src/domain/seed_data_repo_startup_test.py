@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from src.domain.seed_data_repo_startup import start_seed_data_repo
+
+
+@pytest.mark.asyncio
+async def test_start_seed_data_repo():
+    repo = Mock()
+    repo.startup = AsyncMock()
+
+    with patch("src.domain.seed_data_repo_startup.warm_up_seed_cache",
+               new=AsyncMock()) as warm_up:
+        task = await start_seed_data_repo(repo=repo, warm_up_count=2)
+
+    assert task is None
+
+    repo.startup.assert_awaited_once()
+    warm_up.assert_awaited_once_with(repo=repo, count=2)
+
+
+@pytest.mark.asyncio
+async def test_start_seed_data_repo_no_warm_up():
+    repo = Mock()
+    repo.startup = AsyncMock()
+
+    with patch("src.domain.seed_data_repo_startup.warm_up_seed_cache",
+               new=AsyncMock()) as warm_up:
+        assert await start_seed_data_repo(repo=repo, warm_up_count=0) is None
+
+    warm_up.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_start_seed_data_repo_retry():
+    repo = Mock()
+    repo.startup = AsyncMock(side_effect=(ConnectionError, ConnectionError,
+                                          None))
+
+    with patch("src.domain.seed_data_repo_startup.warm_up_seed_cache",
+               new=AsyncMock(side_effect=(ConnectionError, 0))) as warm_up:
+        task = await start_seed_data_repo(repo=repo,
+                                          warm_up_count=2,
+                                          retry_interval=0)
+
+        assert task is not None
+        warm_up.assert_not_awaited()
+
+        await task
+
+    assert repo.startup.await_count == 3
+    assert warm_up.await_count == 2
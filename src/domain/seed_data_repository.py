@@ -4,9 +4,15 @@ from abc import ABC, abstractmethod
 from ast import Tuple
 from typing import List, Optional
 
+from src.domain.mongo_pool_monitor import PoolStats
 from src.model.raid_data import RaidSeed
+from src.model.seed_metadata import SeedMetadata
 from src.model.seed_type import SeedType
+from src.utils.raid_info_index import RaidInfoIndex
+from src.utils.seed_file import SeedFile
+from src.utils.serialized_seed import SerializedSeed
 from src.utils.sort_order import SortOrder
+from src.utils.swr_cache import CacheStats
 
 
 class SeedDuplicateError(Exception):
@@ -19,6 +25,19 @@ class SeedNotFoundError(Exception):
 
 class SeedDataRepository(ABC):
 
+    def startup(self) -> None:
+        """Called once before the repository serves requests."""
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Only repositories which cache seeds return any."""
+        return None
+
+    @property
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Only repositories which pool connections return any."""
+        return None
+
     @abstractmethod
     def list_seed_identifiers(
             self,
@@ -52,6 +71,48 @@ class SeedDataRepository(ABC):
     ) -> Optional[RaidSeed]:
         pass
 
+    @abstractmethod
+    def get_seed_metadata(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SeedMetadata]:
+        pass
+
+    @abstractmethod
+    def list_seed_metadata(
+            self,
+            *,
+            seed_type: SeedType = SeedType.RAW,
+            sort_order: SortOrder = SortOrder.ASCENDING
+    ) -> Tuple[SeedMetadata]:
+        pass
+
+    @abstractmethod
+    def get_serialized_seed(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SerializedSeed]:
+        pass
+
+    def get_seed_file(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SeedFile]:
+        """Only repositories which store seeds as files return one."""
+        # pylint: disable=unused-argument
+        return None
+
+    @abstractmethod
+    def get_raid_info_index(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[RaidInfoIndex]:
+        pass
+
     @abstractmethod
     def list_seeds(
             self,
@@ -0,0 +1,202 @@
+import logging
+from typing import Dict, Generator, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from src.domain.async_seed_data_repository import AsyncSeedDataRepository
+from src.domain.mongo_pool_monitor import PoolStats
+from src.domain.seed_data_repository import SeedDataRepository
+from src.model.raid_data import RaidSeed
+from src.model.seed_metadata import SeedMetadata
+from src.model.seed_type import SeedType
+from src.utils.bulk_load import loads_json
+from src.utils.raid_info_index import RaidInfoIndex, build_raid_info_index
+from src.utils.seed_file import SeedFile
+from src.utils.seed_snapshot import SeedSnapshot
+from src.utils.serialized_seed import SerializedSeed
+from src.utils.shared_seed_store import SharedSeedStore
+from src.utils.single_flight import async_single_flight
+from src.utils.sort_order import SortOrder
+from src.utils.swr_cache import CacheStats
+
+logger = logging.getLogger(__name__)
+
+SHARED_STORE_COUNT = 4
+
+
+def _build_stored_raid_info_index(*, seed: SerializedSeed) -> RaidInfoIndex:
+    return build_raid_info_index(data=loads_json(seed.body))
+
+
+def load_shared_seed_store(*,
+                           repo: SeedDataRepository,
+                           snapshot: Optional[SeedSnapshot] = None,
+                           count: int = SHARED_STORE_COUNT) -> SharedSeedStore:
+    """Loads the count most recent seeds of each type into a
+    SharedSeedStore, reading the ones whose content hash is unchanged from
+    the snapshot and updating it with the rest when one is given.
+
+    If the repository fails, the store holds whatever the snapshot has
+    instead, the server then starts and fetches the other seeds on request.
+    """
+
+    content_hashes = set()
+
+    def serialized_seeds() -> Generator[SerializedSeed, None, None]:
+        for seed_type in SeedType:
+            records = repo.list_seed_metadata(seed_type=seed_type,
+                                              sort_order=SortOrder.DESCENDING)
+
+            for metadata in records[:count]:
+                content_hashes.add(metadata.content_hash)
+
+                if snapshot is not None:
+                    serialized = snapshot.load(
+                        content_hash=metadata.content_hash)
+
+                    if serialized is not None:
+                        yield serialized
+                        continue
+
+                serialized = repo.get_serialized_seed(
+                    identifier=metadata.identifier, seed_type=seed_type)
+
+                if serialized is not None:
+                    if snapshot is not None:
+                        snapshot.save(seed=serialized)
+
+                    yield serialized
+
+    try:
+        store = SharedSeedStore(seeds=serialized_seeds())
+    except Exception as err:
+        logger.warning("Loading the shared seed store failed: %s", err)
+
+        if snapshot is None:
+            return SharedSeedStore(seeds=())
+
+        # stale seeds are never served, their hash matches no metadata
+        return SharedSeedStore(seeds=snapshot.load_all())
+
+    if snapshot is not None:
+        snapshot.prune(keep=content_hashes)
+
+    return store
+
+
+class SharedStoreSeedDataRepository(AsyncSeedDataRepository):
+    """Serves serialized seeds and raid info indexes from a SharedSeedStore
+    when the content hash of the requested seed is in it, and delegates
+    everything else."""
+
+    def __init__(self, *, repo: AsyncSeedDataRepository,
+                 store: SharedSeedStore) -> None:
+        super().__init__()
+
+        self._repo = repo
+        self._store = store
+
+        # keyed by content hash, bounded by the seeds in the store
+        self._raid_info_indexes: Dict[str, RaidInfoIndex] = {}
+
+    async def startup(self) -> None:
+        await self._repo.startup()
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self._repo.cache_stats
+
+    @property
+    def pool_stats(self) -> Optional[PoolStats]:
+        return self._repo.pool_stats
+
+    async def get_serialized_seed(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[SerializedSeed]:
+
+        metadata = await self._repo.get_seed_metadata(identifier=identifier,
+                                                      seed_type=seed_type)
+
+        if metadata is not None:
+            serialized = self._store.get(content_hash=metadata.content_hash)
+
+            if serialized is not None:
+                return serialized
+
+        return await self._repo.get_serialized_seed(identifier=identifier,
+                                                    seed_type=seed_type)
+
+    async def list_seed_identifiers(self, **kwargs) -> Tuple[str]:
+        return await self._repo.list_seed_identifiers(**kwargs)
+
+    async def get_seed_identifier_by_week_offset(self,
+                                                 **kwargs) -> Optional[str]:
+        return await self._repo.get_seed_identifier_by_week_offset(**kwargs)
+
+    async def get_seed_by_identifier(self, **kwargs) -> Optional[RaidSeed]:
+        return await self._repo.get_seed_by_identifier(**kwargs)
+
+    async def get_seed_by_week_offset(self, **kwargs) -> Optional[RaidSeed]:
+        return await self._repo.get_seed_by_week_offset(**kwargs)
+
+    async def get_seed_metadata(self, **kwargs) -> Optional[SeedMetadata]:
+        return await self._repo.get_seed_metadata(**kwargs)
+
+    async def list_seed_metadata(self, **kwargs) -> Tuple[SeedMetadata]:
+        return await self._repo.list_seed_metadata(**kwargs)
+
+    async def get_seed_file(self, **kwargs) -> Optional[SeedFile]:
+        return await self._repo.get_seed_file(**kwargs)
+
+    async def get_raid_info_index(
+            self,
+            *,
+            identifier: str,
+            seed_type: SeedType = SeedType.RAW) -> Optional[RaidInfoIndex]:
+
+        metadata = await self._repo.get_seed_metadata(identifier=identifier,
+                                                      seed_type=seed_type)
+
+        # built from the stored body, the seed is not loaded again after a
+        # restart
+        if metadata is not None and metadata.content_hash in self._store:
+            return await self._get_stored_raid_info_index(
+                content_hash=metadata.content_hash)
+
+        return await self._repo.get_raid_info_index(identifier=identifier,
+                                                    seed_type=seed_type)
+
+    @async_single_flight()
+    async def _get_stored_raid_info_index(self, *,
+                                          content_hash: str) -> RaidInfoIndex:
+
+        index = self._raid_info_indexes.get(content_hash)
+
+        if index is None:
+            # building the index blocks for too long to run on the event loop
+            index = await run_in_threadpool(
+                _build_stored_raid_info_index,
+                seed=self._store.get(content_hash=content_hash))
+
+            self._raid_info_indexes[content_hash] = index
+
+        return index
+
+    async def list_seeds(self, **kwargs) -> List[RaidSeed]:
+        return await self._repo.list_seeds(**kwargs)
+
+    async def save_seed(self, **kwargs) -> None:
+        return await self._repo.save_seed(**kwargs)
+
+    async def save_seeds(self, **kwargs) -> None:
+        return await self._repo.save_seeds(**kwargs)
+
+    async def delete_seed(self, **kwargs) -> None:
+        return await self._repo.delete_seed(**kwargs)
+
+    async def delete_seeds(self, **kwargs) -> None:
+        return await self._repo.delete_seeds(**kwargs)
+
+    async def delete_seeds_older_than(self, **kwargs) -> None:
+        return await self._repo.delete_seeds_older_than(**kwargs)
@@ -0,0 +1,224 @@
+from datetime import datetime, timezone
+from test.mocks import mock_raid_seed_enhanced, mock_raid_seed_raw
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from src.domain.shared_store_seed_data_repository import (
+    SharedStoreSeedDataRepository, load_shared_seed_store)
+from src.model.raid_data import map_to_native_object
+from src.model.seed_metadata import SeedMetadata
+from src.model.seed_type import SeedType
+from src.utils.raid_info_index import build_raid_info_index
+from src.utils.seed_snapshot import SeedSnapshot
+from src.utils.serialized_seed import serialize_seed
+from src.utils.shared_seed_store import SharedSeedStore
+from src.utils.sort_order import SortOrder
+
+
+def mock_metadata(*, identifier: str, seed_type: SeedType,
+                  content_hash: str) -> SeedMetadata:
+    return SeedMetadata(identifier=identifier,
+                        seed_type=seed_type,
+                        content_hash=content_hash,
+                        last_modified=datetime.now(tz=timezone.utc))
+
+
+def test_load_shared_seed_store():
+    seeds = {
+        SeedType.RAW: serialize_seed(data=mock_raid_seed_raw()),
+        SeedType.ENHANCED: serialize_seed(data=mock_raid_seed_enhanced()),
+    }
+
+    repo = Mock()
+    repo.list_seed_metadata.side_effect = (
+        lambda seed_type, sort_order:
+        (mock_metadata(identifier="testid",
+                       seed_type=seed_type,
+                       content_hash=seeds[seed_type].content_hash), ))
+    repo.get_serialized_seed.side_effect = (
+        lambda identifier, seed_type: seeds[seed_type])
+
+    store = load_shared_seed_store(repo=repo)
+
+    assert len(store) == len(seeds)
+
+    for seed in seeds.values():
+        assert store.get(content_hash=seed.content_hash) == seed
+
+
+def test_load_shared_seed_store_snapshot(tmp_path):
+    seeds = {
+        SeedType.RAW: serialize_seed(data=mock_raid_seed_raw()),
+        SeedType.ENHANCED: serialize_seed(data=mock_raid_seed_enhanced()),
+    }
+
+    stale = serialize_seed(data=mock_raid_seed_raw())
+
+    snapshot = SeedSnapshot(path=tmp_path)
+    snapshot.save(seed=seeds[SeedType.RAW])
+    snapshot.save(seed=stale)
+
+    repo = Mock()
+    repo.list_seed_metadata.side_effect = (
+        lambda seed_type, sort_order:
+        (mock_metadata(identifier="testid",
+                       seed_type=seed_type,
+                       content_hash=seeds[seed_type].content_hash), ))
+    repo.get_serialized_seed.side_effect = (
+        lambda identifier, seed_type: seeds[seed_type])
+
+    store = load_shared_seed_store(repo=repo, snapshot=snapshot)
+
+    assert len(store) == len(seeds)
+
+    repo.get_serialized_seed.assert_called_once_with(
+        identifier="testid", seed_type=SeedType.ENHANCED)
+
+    for seed in seeds.values():
+        assert store.get(content_hash=seed.content_hash) == seed
+        assert snapshot.load(content_hash=seed.content_hash) == seed
+
+    assert snapshot.load(content_hash=stale.content_hash) is None
+
+
+def test_load_shared_seed_store_count():
+    seeds = tuple(serialize_seed(data=mock_raid_seed_raw()) for _ in range(3))
+
+    repo = Mock()
+    repo.list_seed_metadata.side_effect = (lambda seed_type, sort_order: tuple(
+        mock_metadata(identifier=f"testid{index}",
+                      seed_type=seed_type,
+                      content_hash=seed.content_hash)
+        for index, seed in enumerate(seeds)))
+    repo.get_serialized_seed.side_effect = (
+        lambda identifier, seed_type: seeds[int(identifier[-1])])
+
+    store = load_shared_seed_store(repo=repo, count=2)
+
+    assert len(store) == 2
+
+    for seed in seeds[:2]:
+        assert seed.content_hash in store
+
+    for seed_type in SeedType:
+        repo.list_seed_metadata.assert_any_call(
+            seed_type=seed_type, sort_order=SortOrder.DESCENDING)
+
+
+def test_load_shared_seed_store_failure(tmp_path):
+    seed = serialize_seed(data=mock_raid_seed_raw())
+
+    snapshot = SeedSnapshot(path=tmp_path)
+    snapshot.save(seed=seed)
+
+    repo = Mock()
+    repo.list_seed_metadata.side_effect = ConnectionError
+
+    assert len(load_shared_seed_store(repo=repo)) == 0
+
+    store = load_shared_seed_store(repo=repo, snapshot=snapshot)
+
+    assert len(store) == 1
+    assert store.get(content_hash=seed.content_hash) == seed
+    assert snapshot.load(content_hash=seed.content_hash) == seed
+
+
+@pytest.mark.asyncio
+async def test_get_serialized_seed_from_store():
+    seed = serialize_seed(data=mock_raid_seed_raw())
+
+    inner = Mock()
+    inner.get_seed_metadata = AsyncMock(return_value=mock_metadata(
+        identifier="testid",
+        seed_type=SeedType.RAW,
+        content_hash=seed.content_hash))
+    inner.get_serialized_seed = AsyncMock()
+
+    repo = SharedStoreSeedDataRepository(repo=inner,
+                                         store=SharedSeedStore(seeds=(seed, )))
+
+    result = await repo.get_serialized_seed(identifier="testid",
+                                            seed_type=SeedType.RAW)
+
+    assert result == seed
+
+    inner.get_serialized_seed.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_serialized_seed_fallback():
+    seed = serialize_seed(data=mock_raid_seed_raw())
+
+    for metadata in (None,
+                     mock_metadata(identifier="testid",
+                                   seed_type=SeedType.RAW,
+                                   content_hash="changed")):
+        inner = Mock()
+        inner.get_seed_metadata = AsyncMock(return_value=metadata)
+        inner.get_serialized_seed = AsyncMock(return_value=seed)
+
+        repo = SharedStoreSeedDataRepository(repo=inner,
+                                             store=SharedSeedStore(seeds=()))
+
+        result = await repo.get_serialized_seed(identifier="testid",
+                                                seed_type=SeedType.RAW)
+
+        assert result == seed
+
+        inner.get_serialized_seed.assert_awaited_once_with(
+            identifier="testid", seed_type=SeedType.RAW)
+
+
+@pytest.mark.asyncio
+async def test_get_raid_info_index_from_store():
+    data = mock_raid_seed_raw()
+    seed = serialize_seed(data=data)
+
+    inner = Mock()
+    inner.get_seed_metadata = AsyncMock(return_value=mock_metadata(
+        identifier="testid",
+        seed_type=SeedType.RAW,
+        content_hash=seed.content_hash))
+    inner.get_raid_info_index = AsyncMock()
+
+    repo = SharedStoreSeedDataRepository(repo=inner,
+                                         store=SharedSeedStore(seeds=(seed, )))
+
+    first = await repo.get_raid_info_index(identifier="testid",
+                                           seed_type=SeedType.RAW)
+    second = await repo.get_raid_info_index(identifier="testid",
+                                            seed_type=SeedType.RAW)
+
+    assert first == build_raid_info_index(data=map_to_native_object(data=data))
+    assert second is first
+
+    inner.get_raid_info_index.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_raid_info_index_fallback():
+    index = {(1, 1): {"tier": 1, "level": 1}}
+
+    inner = Mock()
+    inner.get_seed_metadata = AsyncMock(return_value=mock_metadata(
+        identifier="testid", seed_type=SeedType.RAW, content_hash="changed"))
+    inner.get_raid_info_index = AsyncMock(return_value=index)
+
+    repo = SharedStoreSeedDataRepository(repo=inner,
+                                         store=SharedSeedStore(seeds=()))
+
+    assert await repo.get_raid_info_index(identifier="testid",
+                                          seed_type=SeedType.RAW) == index
+
+    inner.get_raid_info_index.assert_awaited_once_with(
+        identifier="testid", seed_type=SeedType.RAW)
+
+
+def test_stats():
+    inner = Mock()
+
+    repo = SharedStoreSeedDataRepository(repo=inner,
+                                         store=SharedSeedStore(seeds=()))
+
+    assert repo.cache_stats is inner.cache_stats
+    assert repo.pool_stats is inner.pool_stats
@@ -0,0 +1,127 @@
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+# pylint: disable=no-name-in-module
+from pydantic import BaseModel
+from src.model.raid_data import (RAID_INFO_TYPES, RaidSeed,
+                                 map_data_to_seed_type)
+from src.model.seed_type import SeedType
+
+
+class CompactModel:
+    """Field values of a pydantic model in slots, without the per instance
+    __dict__ and __fields_set__ of the model itself.
+
+    Subclasses are generated per model type by compact_type.
+    """
+
+    __slots__ = ()
+
+    model_type: Type[BaseModel]
+    nested_types: Dict[str, Type[BaseModel]]
+
+
+CompactSeed = Tuple[CompactModel, ...]
+
+
+def _is_model_type(type_: Any) -> bool:
+    return isinstance(type_, type) and issubclass(type_, BaseModel)
+
+
+@lru_cache(maxsize=None)
+def compact_type(model_type: Type[BaseModel]) -> Type[CompactModel]:
+    nested_types = {
+        name: field.type_
+        for name, field in model_type.__fields__.items()
+        if _is_model_type(field.type_)
+    }
+
+    return type(
+        f"Compact{model_type.__name__}", (CompactModel, ), {
+            "__slots__": tuple(model_type.__fields__),
+            "model_type": model_type,
+            "nested_types": nested_types,
+        })
+
+
+def _map_to_compact_value(*, value: Any,
+                          model_type: Optional[Type[BaseModel]]) -> Any:
+    if value is None:
+        return None
+
+    if isinstance(value, list):
+        return tuple(
+            _map_to_compact_value(value=item, model_type=model_type)
+            for item in value)
+
+    if model_type is not None:
+        return map_to_compact(model_type=model_type, data=value)
+
+    if isinstance(value, str):
+        # ids, names and bonus types repeat across raid infos and seeds
+        return sys.intern(value)
+
+    return value
+
+
+def map_to_compact(*, model_type: Type[BaseModel], data: dict) -> CompactModel:
+    """Only for data that was validated as model_type before it was
+    stored, like construct_model."""
+
+    compact = compact_type(model_type)()
+
+    for name, field in model_type.__fields__.items():
+        value = data.get(field.alias, field.get_default())
+
+        setattr(
+            compact, name,
+            _map_to_compact_value(value=value,
+                                  model_type=compact.nested_types.get(name)))
+
+    return compact
+
+
+def map_to_compact_seed(*, data: List[dict],
+                        seed_type: Optional[SeedType]) -> CompactSeed:
+    compact_seed = []
+
+    for item in data:
+        item_seed_type = seed_type or map_data_to_seed_type(data=item)
+
+        compact_seed.append(
+            map_to_compact(model_type=RAID_INFO_TYPES[item_seed_type],
+                           data=item))
+
+    return tuple(compact_seed)
+
+
+def map_compact_to_native(*, data: Any) -> Any:
+    if isinstance(data, CompactModel):
+        return {
+            field.alias: map_compact_to_native(data=getattr(data, name))
+            for name, field in data.model_type.__fields__.items()
+        }
+
+    if isinstance(data, tuple):
+        return [map_compact_to_native(data=item) for item in data]
+
+    return data
+
+
+def map_compact_to_model(*, data: Any) -> Any:
+    if isinstance(data, CompactModel):
+        return data.model_type.construct(
+            **{
+                name: map_compact_to_model(data=getattr(data, name))
+                for name in data.__slots__
+            })
+
+    if isinstance(data, tuple):
+        return [map_compact_to_model(data=item) for item in data]
+
+    return data
+
+
+def map_compact_to_raid_seed(*, data: CompactSeed) -> RaidSeed:
+    return [map_compact_to_model(data=item) for item in data]
@@ -0,0 +1,69 @@
+from test.mocks import mock_raid_seed_enhanced, mock_raid_seed_raw
+
+import pytest
+from src.model.compact_seed import (CompactModel, map_compact_to_native,
+                                    map_compact_to_raid_seed,
+                                    map_to_compact_seed)
+from src.model.raid_data import (EnhancedTitan, EnhancedTitanPart,
+                                 RaidInfoEnhanced, RaidInfoRaw,
+                                 map_to_native_object)
+from src.model.seed_type import SeedType
+from src.utils.serialized_seed import serialize_body
+
+
+@pytest.mark.parametrize("seed_type", (SeedType.RAW, SeedType.ENHANCED, None))
+def test_compact_seed(seed_type):
+    seed = (mock_raid_seed_enhanced()
+            if seed_type != SeedType.RAW else mock_raid_seed_raw())
+    data = map_to_native_object(data=seed)
+
+    compact_seed = map_to_compact_seed(data=data, seed_type=seed_type)
+
+    assert all(isinstance(item, CompactModel) for item in compact_seed)
+    assert not hasattr(compact_seed[0], "__dict__")
+
+    assert map_compact_to_native(data=compact_seed) == data
+
+    mapped = map_compact_to_raid_seed(data=compact_seed)
+
+    assert mapped == seed
+    assert [type(item) for item in mapped] == [type(item) for item in seed]
+    assert serialize_body(data=mapped) == serialize_body(data=seed)
+
+
+def test_compact_seed_nested():
+    data = map_to_native_object(data=mock_raid_seed_enhanced())
+
+    seed = map_compact_to_raid_seed(
+        data=map_to_compact_seed(data=data, seed_type=SeedType.ENHANCED))
+
+    titans = [titan for raid_info in seed for titan in raid_info.titans]
+    parts = [part for titan in titans for part in titan.parts]
+
+    assert all(isinstance(raid_info, RaidInfoEnhanced) for raid_info in seed)
+    assert titans and all(isinstance(t, EnhancedTitan) for t in titans)
+    assert parts and all(isinstance(p, EnhancedTitanPart) for p in parts)
+
+
+def test_compact_seed_mixed():
+    seed = [*mock_raid_seed_raw(length=1), *mock_raid_seed_enhanced(length=1)]
+
+    compact_seed = map_to_compact_seed(data=map_to_native_object(data=seed),
+                                       seed_type=None)
+
+    mapped = map_compact_to_raid_seed(data=compact_seed)
+
+    assert mapped == seed
+    assert [type(item) for item in mapped] == [RaidInfoRaw, RaidInfoEnhanced]
+
+
+def test_compact_seed_interned():
+    data = map_to_native_object(data=mock_raid_seed_raw(length=2))
+
+    # equal but distinct string objects, as decoded from two documents
+    for raid_info in data:
+        raid_info["titans"][0]["enemy_id"] = "".join(("enemy", "_id"))
+
+    first, second = map_to_compact_seed(data=data, seed_type=SeedType.RAW)
+
+    assert first.titans[0].enemy_id is second.titans[0].enemy_id
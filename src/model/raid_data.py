@@ -1,8 +1,8 @@
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Type, Union
 
 from fastapi.encoders import jsonable_encoder
 # pylint: disable=no-name-in-module
-from pydantic import BaseModel, StrictStr, ValidationError
+from pydantic import BaseModel, StrictStr
 from src.model.seed_type import SeedType
 
 
@@ -100,31 +100,42 @@ RaidSeedEnhanced = List[RaidInfoEnhanced]
 
 RaidSeed = Union[RaidSeedRaw, RaidInfoEnhanced]
 
+RAID_INFO_TYPES: Dict[SeedType, Type[RaidInfo]] = {
+    SeedType.RAW: RaidInfoRaw,
+    SeedType.ENHANCED: RaidInfoEnhanced,
+}
+
+# every enhanced raid info has them, no raw one does
+ENHANCED_ONLY_FIELDS = frozenset(RaidInfoEnhanced.__fields__.keys() -
+                                 RaidInfoRaw.__fields__.keys())
+
 
 def is_of_seed_type(*, data: Any, seed_type: SeedType) -> bool:
     try:
-        data_type = RaidInfoRaw if seed_type == SeedType.RAW else RaidInfoEnhanced
+        data_type = RAID_INFO_TYPES[seed_type]
 
         return all(type(elem) == data_type for elem in data)
     except Exception:
         return False
 
 
+def map_data_to_seed_type(*, data: dict) -> SeedType:
+    if ENHANCED_ONLY_FIELDS.isdisjoint(data):
+        return SeedType.RAW
+
+    return SeedType.ENHANCED
+
+
 def map_to_native_object(*, data: Any) -> Any:
     return jsonable_encoder(data)
 
 
 def map_to_raid_info(*, data: Any, seed_type: Optional[SeedType]) -> RaidInfo:
     if seed_type is None:
-        try:
-            return RaidInfoEnhanced(**data)
-        except ValidationError:
-            return RaidInfoRaw(**data)
-
-    else:
-        data_type = RaidInfoRaw if seed_type == SeedType.RAW else RaidInfoEnhanced
+        # one validation per item instead of retrying as raw on failure
+        seed_type = map_data_to_seed_type(data=data)
 
-        return data_type(**data)
+    return RAID_INFO_TYPES[seed_type](**data)
 
 
 def map_to_raid_seed(*, data: Any, seed_type: Optional[SeedType]) -> RaidSeed:
@@ -0,0 +1,24 @@
+from test.mocks import mock_raid_seed_enhanced, mock_raid_seed_raw
+
+from src.model.raid_data import (RaidInfoEnhanced, RaidInfoRaw,
+                                 map_data_to_seed_type, map_to_native_object,
+                                 map_to_raid_seed)
+from src.model.seed_type import SeedType
+
+
+def test_map_data_to_seed_type():
+    seed = [*mock_raid_seed_raw(length=1), *mock_raid_seed_enhanced(length=1)]
+    raw, enhanced = map_to_native_object(data=seed)
+
+    assert map_data_to_seed_type(data=raw) == SeedType.RAW
+    assert map_data_to_seed_type(data=enhanced) == SeedType.ENHANCED
+
+
+def test_map_to_raid_seed_mixed():
+    seed = [*mock_raid_seed_raw(length=1), *mock_raid_seed_enhanced(length=1)]
+    data = map_to_native_object(data=seed)
+
+    mapped = map_to_raid_seed(data=data, seed_type=None)
+
+    assert mapped == seed
+    assert [type(item) for item in mapped] == [RaidInfoRaw, RaidInfoEnhanced]
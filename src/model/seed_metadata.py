@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import Optional
+
+# pylint: disable=no-name-in-module
+from pydantic import BaseModel, StrictStr
+from src.model.seed_type import SeedType
+
+
+class SeedMetadata(BaseModel):
+    identifier: StrictStr
+    seed_type: SeedType
+
+    content_hash: StrictStr
+    last_modified: Optional[datetime]
@@ -0,0 +1,53 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def _fsync_dir(*, dir_path: Path) -> None:
+    # directories can not be opened for syncing on windows
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+
+    dir_fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def write_bytes_atomic(*,
+                       filepath: Path,
+                       data: bytes,
+                       exclusive: bool = False) -> None:
+    """Replaces filepath in one step, readers see the old or the new file
+    but never a partial one.
+
+    With exclusive, raises FileExistsError instead of replacing an existing
+    file, like opening it with O_EXCL would.
+    """
+
+    with tempfile.NamedTemporaryFile(dir=filepath.parent,
+                                     prefix=f".{filepath.name}.",
+                                     delete=False) as file:
+        try:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            os.unlink(file.name)
+            raise
+
+    try:
+        if exclusive:
+            # unlike os.replace, linking fails if filepath exists
+            os.link(file.name, filepath)
+            os.unlink(file.name)
+        else:
+            os.replace(file.name, filepath)
+    except BaseException:
+        if os.path.exists(file.name):
+            os.unlink(file.name)
+        raise
+
+    _fsync_dir(dir_path=filepath.parent)
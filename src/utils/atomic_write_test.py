@@ -0,0 +1,24 @@
+import pytest
+from src.utils.atomic_write import write_bytes_atomic
+
+
+def test_write_bytes_atomic(tmp_path):
+    filepath = tmp_path / "seed.json"
+
+    write_bytes_atomic(filepath=filepath, data=b"[1]")
+    write_bytes_atomic(filepath=filepath, data=b"[2]")
+
+    assert filepath.read_bytes() == b"[2]"
+    assert [path.name for path in tmp_path.iterdir()] == ["seed.json"]
+
+
+def test_write_bytes_atomic_exclusive(tmp_path):
+    filepath = tmp_path / "seed.json"
+
+    write_bytes_atomic(filepath=filepath, data=b"[1]", exclusive=True)
+
+    with pytest.raises(FileExistsError):
+        write_bytes_atomic(filepath=filepath, data=b"[2]", exclusive=True)
+
+    assert filepath.read_bytes() == b"[1]"
+    assert [path.name for path in tmp_path.iterdir()] == ["seed.json"]
@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Sequence, Tuple, TypeVar
+
+import orjson
+
+BULK_LOAD_WORKERS = 8
+
+# below this, starting threads costs more than reading in parallel saves
+BULK_LOAD_MIN_ITEMS = 4
+
+T = TypeVar("T")
+
+
+def loads_json(body: bytes) -> Any:
+    # decodes about twice as fast as json
+    return orjson.loads(body)
+
+
+def load_json_bulk(*,
+                   items: Sequence[T],
+                   read: Callable[[T], bytes],
+                   max_workers: int = BULK_LOAD_WORKERS) -> Tuple[Any, ...]:
+    """Reads the body of every item in a thread pool and decodes them in
+    the calling thread while the rest are still read, in the order of
+    items.
+
+    Decoding stays in one process, sending decoded seeds back from a
+    process pool costs about as much as decoding them.
+    """
+
+    if len(items) < BULK_LOAD_MIN_ITEMS:
+        return tuple(loads_json(read(item)) for item in items)
+
+    with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(items))) as executor:
+        return tuple(map(loads_json, executor.map(read, items)))
@@ -0,0 +1,27 @@
+import json
+import threading
+
+from src.utils.bulk_load import BULK_LOAD_MIN_ITEMS, load_json_bulk
+
+
+def test_load_json_bulk():
+    for count in (0, BULK_LOAD_MIN_ITEMS - 1, BULK_LOAD_MIN_ITEMS * 4):
+        items = tuple(range(count))
+
+        result = load_json_bulk(items=items,
+                                read=lambda item: json.dumps([item]).encode())
+
+        assert result == tuple([item] for item in items)
+
+
+def test_load_json_bulk_threads():
+    threads = set()
+
+    def read(item: int) -> bytes:
+        threads.add(threading.get_ident())
+        return json.dumps(item).encode()
+
+    items = tuple(range(BULK_LOAD_MIN_ITEMS))
+
+    assert load_json_bulk(items=items, read=read) == items
+    assert threading.get_ident() not in threads
@@ -0,0 +1,104 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from fastapi import status
+from fastapi.responses import Response
+
+# seeds are immutable, but offset based routes change weekly: always revalidate
+CACHE_CONTROL = "public, no-cache"
+
+
+def create_etag(*parts: str) -> str:
+    # weak: the same seed is served with different content encodings
+    return f'W/"{str.join("-", map(str, parts))}"'
+
+
+def create_etag_from_hashes(content_hashes: Iterable[str]) -> str:
+    digest = hashlib.sha256(str.join(",", content_hashes).encode("utf-8"))
+
+    return create_etag(digest.hexdigest())
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _etag_matches(*, if_none_match: str, etag: str) -> bool:
+    candidates = map(str.strip, if_none_match.split(","))
+
+    return any(candidate == "*" or _strip_weak(candidate) == _strip_weak(etag)
+               for candidate in candidates)
+
+
+def _not_modified_since(*, if_modified_since: str,
+                        last_modified: Optional[datetime]) -> bool:
+    if last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is None or last_modified.tzinfo is None:
+        return False
+
+    # http dates have second precision
+    return int(last_modified.timestamp()) <= int(since.timestamp())
+
+
+def is_not_modified(*, if_none_match: Optional[str],
+                    if_modified_since: Optional[str], etag: str,
+                    last_modified: Optional[datetime]) -> bool:
+
+    # If-Modified-Since is ignored when If-None-Match is sent (RFC 7232)
+    if isinstance(if_none_match, str):
+        return _etag_matches(if_none_match=if_none_match, etag=etag)
+
+    if isinstance(if_modified_since, str):
+        return _not_modified_since(if_modified_since=if_modified_since,
+                                   last_modified=last_modified)
+
+    return False
+
+
+def caching_headers(*,
+                    etag: str,
+                    last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if last_modified is not None and last_modified.tzinfo is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True)
+
+    return headers
+
+
+def create_not_modified_response(
+        *,
+        etag: str,
+        last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers=caching_headers(etag=etag,
+                                            last_modified=last_modified))
+
+
+async def create_conditional_response(
+    *, etag: str, last_modified: Optional[datetime],
+    if_none_match: Optional[str], if_modified_since: Optional[str],
+    create_response_func: Callable[..., Awaitable[Optional[Response]]]
+) -> Optional[Response]:
+    """The 304 response if the client's copy is current, otherwise the
+    response create_response_func makes with the caching headers to send."""
+
+    if is_not_modified(if_none_match=if_none_match,
+                       if_modified_since=if_modified_since,
+                       etag=etag,
+                       last_modified=last_modified):
+        return create_not_modified_response(etag=etag,
+                                            last_modified=last_modified)
+
+    return await create_response_func(
+        headers=caching_headers(etag=etag, last_modified=last_modified))
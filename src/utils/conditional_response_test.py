@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from src.utils.conditional_response import (CACHE_CONTROL, caching_headers,
+                                            create_conditional_response,
+                                            create_etag,
+                                            create_etag_from_hashes,
+                                            create_not_modified_response,
+                                            is_not_modified)
+
+LAST_MODIFIED = datetime(2022, 7, 17, 12, 30, 15, tzinfo=timezone.utc)
+
+HTTP_DATE = format_datetime(LAST_MODIFIED, usegmt=True)
+HTTP_DATE_BEFORE = format_datetime(LAST_MODIFIED - timedelta(seconds=1),
+                                   usegmt=True)
+
+ETAG = create_etag("abc")
+
+CASES = (
+    ((None, None), False),
+    ((ETAG, None), True),
+    (('"abc"', None), True),
+    (('W/"abc"', None), True),
+    (('W/"other", W/"abc"', None), True),
+    (("*", None), True),
+    (('W/"other"', None), False),
+    (('W/"abc-1"', None), False),
+    ((None, HTTP_DATE), True),
+    ((None, HTTP_DATE_BEFORE), False),
+    ((None, "invalid date"), False),
+    (('W/"other"', HTTP_DATE), False),
+)
+
+
+def test_create_etag():
+    assert create_etag("abc") == 'W/"abc"'
+    assert create_etag("abc", 1, 2) == 'W/"abc-1-2"'
+
+
+def test_create_etag_from_hashes():
+    assert create_etag_from_hashes(("a", "b")) == create_etag_from_hashes(
+        ["a", "b"])
+    assert create_etag_from_hashes(("a", "b")) != create_etag_from_hashes(
+        ("b", "a"))
+    assert create_etag_from_hashes(()) != create_etag_from_hashes(("a", ))
+
+
+def test_is_not_modified():
+    for (if_none_match, if_modified_since), output in CASES:
+        result = is_not_modified(if_none_match=if_none_match,
+                                 if_modified_since=if_modified_since,
+                                 etag=ETAG,
+                                 last_modified=LAST_MODIFIED)
+
+        assert result == output
+
+    assert not is_not_modified(if_none_match=None,
+                               if_modified_since=HTTP_DATE,
+                               etag=ETAG,
+                               last_modified=None)
+
+
+def test_caching_headers():
+    assert caching_headers(etag=ETAG) == {
+        "ETag": ETAG,
+        "Cache-Control": CACHE_CONTROL
+    }
+
+    assert caching_headers(etag=ETAG, last_modified=LAST_MODIFIED) == {
+        "ETag": ETAG,
+        "Cache-Control": CACHE_CONTROL,
+        "Last-Modified": HTTP_DATE,
+    }
+
+
+def test_create_not_modified_response():
+    response = create_not_modified_response(etag=ETAG,
+                                            last_modified=LAST_MODIFIED)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers.get("etag") == ETAG
+    assert response.headers.get("last-modified") == HTTP_DATE
+
+
+@pytest.mark.asyncio
+async def test_create_conditional_response():
+    response = object()
+    create_response = AsyncMock(return_value=response)
+
+    result = await create_conditional_response(
+        etag=ETAG,
+        last_modified=LAST_MODIFIED,
+        if_none_match=None,
+        if_modified_since=HTTP_DATE_BEFORE,
+        create_response_func=create_response)
+
+    create_response.assert_awaited_once_with(
+        headers=caching_headers(etag=ETAG, last_modified=LAST_MODIFIED))
+
+    assert result is response
+
+    create_response.reset_mock()
+
+    result = await create_conditional_response(
+        etag=ETAG,
+        last_modified=LAST_MODIFIED,
+        if_none_match=ETAG,
+        if_modified_since=None,
+        create_response_func=create_response)
+
+    create_response.assert_not_called()
+
+    assert result.status_code == 304
+    assert result.headers.get("etag") == ETAG
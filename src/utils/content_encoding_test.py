@@ -0,0 +1,43 @@
+from src.utils.content_encoding import (ContentEncoding, compress, decompress,
+                                        select_content_encoding)
+
+ALL = tuple(ContentEncoding)
+
+NO_BROTLI = (ContentEncoding.IDENTITY, ContentEncoding.GZIP)
+
+CASES = (
+    ((None, ALL), ContentEncoding.IDENTITY),
+    (("", ALL), ContentEncoding.IDENTITY),
+    (("gzip", ALL), ContentEncoding.GZIP),
+    (("gzip, deflate, br", ALL), ContentEncoding.BROTLI),
+    (("gzip, deflate, br", NO_BROTLI), ContentEncoding.GZIP),
+    (("br;q=0.5, gzip", ALL), ContentEncoding.GZIP),
+    (("br;q=1.0, gzip;q=1.0", ALL), ContentEncoding.BROTLI),
+    (("GZIP", ALL), ContentEncoding.GZIP),
+    (("deflate", ALL), ContentEncoding.IDENTITY),
+    (("*", ALL), ContentEncoding.BROTLI),
+    (("*;q=0, gzip", ALL), ContentEncoding.GZIP),
+    (("br;q=0, gzip;q=0", ALL), ContentEncoding.IDENTITY),
+    (("gzip;q=invalid, br", ALL), ContentEncoding.BROTLI),
+    (("gzip;q=invalid", ALL), ContentEncoding.IDENTITY),
+    (("identity;q=0", (ContentEncoding.IDENTITY, )), ContentEncoding.IDENTITY),
+)
+
+
+def test_select_content_encoding():
+    for (accept_encoding, available), output in CASES:
+        result = select_content_encoding(accept_encoding=accept_encoding,
+                                         available=available)
+
+        assert result == output
+
+
+def test_compress():
+    body = b'{"seed": []}' * 100
+
+    assert compress(body=body, encoding=ContentEncoding.IDENTITY) == body
+
+    for encoding in ContentEncoding:
+        compressed = compress(body=body, encoding=encoding)
+
+        assert decompress(body=compressed, encoding=encoding) == body
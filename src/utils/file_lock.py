@@ -0,0 +1,30 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+
+@contextmanager
+def file_lock(*, path: Path) -> Iterator[None]:
+    """Holds an exclusive lock on path, creating it if needed.
+
+    Every call opens the file anew, so the lock excludes other threads of
+    this process as well as other processes. Without fcntl it only
+    creates the file.
+    """
+
+    with open(path, mode="a+b") as file:
+        if fcntl is None:
+            yield
+            return
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
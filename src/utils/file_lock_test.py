@@ -0,0 +1,24 @@
+import threading
+
+from src.utils.file_lock import file_lock
+
+
+def test_file_lock_excludes_threads(tmp_path):
+    path = tmp_path / ".lock"
+
+    acquired = threading.Event()
+
+    def acquire():
+        with file_lock(path=path):
+            acquired.set()
+
+    with file_lock(path=path):
+        thread = threading.Thread(target=acquire)
+        thread.start()
+
+        assert not acquired.wait(timeout=0.1)
+
+    thread.join(timeout=5)
+
+    assert acquired.is_set()
+    assert path.is_file()
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
 
@@ -12,3 +13,10 @@ def get_env(*, key: str, strict: bool = True) -> str:
         raise KeyError(f"{key} is not an environment variable")
 
     return value
+
+
+def get_env_int(*, key: str, default: Optional[int] = None) -> Optional[int]:
+    try:
+        return int(get_env(key=key))
+    except (KeyError, ValueError):
+        return default
@@ -0,0 +1,22 @@
+from typing import Any, Dict, Tuple
+
+from src.model.raid_data import RaidSeed, map_to_native_object
+from src.utils import selectors
+
+RaidInfoIndex = Dict[Tuple[int, int], Dict[str, Any]]
+
+
+def build_raid_info_index(*, data: RaidSeed) -> RaidInfoIndex:
+    index = {}
+
+    for raid_info in data:
+        # repositories pass native seeds, only models need the encoder pass
+        if not isinstance(raid_info, dict):
+            raid_info = map_to_native_object(data=raid_info)
+
+        key = (selectors.raid_tier(raid_info), selectors.raid_level(raid_info))
+
+        # first match wins, same as selectors.select_first_by
+        index.setdefault(key, raid_info)
+
+    return index
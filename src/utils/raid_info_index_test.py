@@ -0,0 +1,47 @@
+from test.mocks import mock_raid_seed_enhanced, mock_raid_seed_raw
+
+from src.model.raid_data import map_to_native_object
+from src.utils import selectors
+from src.utils.raid_info_index import build_raid_info_index
+
+
+def test_build_raid_info_index():
+    for seed in (mock_raid_seed_raw(length=4), mock_raid_seed_enhanced(4)):
+        index = build_raid_info_index(data=seed)
+
+        assert len(index) == len(seed)
+
+        for raid_info in map_to_native_object(data=seed):
+            tier = selectors.raid_tier(raid_info)
+            level = selectors.raid_level(raid_info)
+
+            assert index[(tier, level)] == raid_info
+
+
+def test_build_raid_info_index_native():
+    seed = map_to_native_object(data=mock_raid_seed_enhanced(4))
+
+    index = build_raid_info_index(data=seed)
+
+    for raid_info in seed:
+        tier = selectors.raid_tier(raid_info)
+        level = selectors.raid_level(raid_info)
+
+        assert index[(tier, level)] is raid_info
+
+
+def test_build_raid_info_index_first_match():
+    first, second = map_to_native_object(data=mock_raid_seed_raw(length=2))
+
+    second["tier"] = first["tier"]
+    second["level"] = first["level"]
+
+    index = build_raid_info_index(data=[first, second])
+
+    assert index == {
+        (selectors.raid_tier(first), selectors.raid_level(first)): first
+    }
+
+
+def test_build_raid_info_index_empty():
+    assert not build_raid_info_index(data=[])
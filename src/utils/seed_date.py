@@ -0,0 +1,32 @@
+import re
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+SEED_DATE_FORMAT = "%Y%m%d"
+
+
+def parse_seed_date(*, identifier: str) -> Optional[date]:
+    match = re.search(r"\d+", identifier)
+
+    if match is None:
+        return None
+
+    try:
+        return datetime.strptime(match.group(), SEED_DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def seed_date_cutoff(*, days: int) -> date:
+    return (datetime.now() - timedelta(days=days)).date()
+
+
+def get_ids_older_than(*, ids: Iterable[str], days: int) -> Tuple[str]:
+    cutoff = seed_date_cutoff(days=days)
+
+    def is_older(identifier: str) -> bool:
+        seed_date = parse_seed_date(identifier=identifier)
+
+        return seed_date is not None and seed_date < cutoff
+
+    return tuple(filter(is_older, ids))
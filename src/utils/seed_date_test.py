@@ -0,0 +1,30 @@
+from datetime import date, datetime, timedelta
+
+from src.utils.seed_date import (get_ids_older_than, parse_seed_date,
+                                 seed_date_cutoff)
+
+
+def test_parse_seed_date():
+    assert parse_seed_date(identifier="raid_seed_20220717") == date(
+        2022, 7, 17)
+
+
+def test_parse_seed_date_invalid():
+    assert parse_seed_date(identifier="raid_seed") is None
+    assert parse_seed_date(identifier="raid_seed_20221317") is None
+
+
+def test_seed_date_cutoff():
+    assert seed_date_cutoff(days=7) == (datetime.now() -
+                                        timedelta(days=7)).date()
+
+
+def test_get_ids_older_than():
+    today = datetime.now().date()
+
+    ids = tuple(f"raid_seed_{(today - timedelta(days=days)):%Y%m%d}"
+                for days in (0, 7, 14))
+
+    assert not get_ids_older_than(ids=ids, days=14)
+    assert get_ids_older_than(ids=ids, days=13) == ids[2:]
+    assert get_ids_older_than(ids=(*ids, "raid_seed"), days=-1) == ids
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+from src.utils.content_encoding import ContentEncoding
+
+
+@dataclass(frozen=True)
+class SeedFile:
+    """Paths of a stored seed by content encoding, each holding a body which
+    can be sent to clients as it is."""
+
+    paths: Dict[ContentEncoding, Path]
@@ -0,0 +1,83 @@
+from typing import Any, Dict, Optional
+
+from fastapi.responses import FileResponse, Response
+from src.utils.content_encoding import ContentEncoding, select_content_encoding
+from src.utils.seed_file import SeedFile
+from src.utils.serialized_seed import SerializedSeed
+
+
+class SeedResponse(Response):
+
+    def render(self, content: Any) -> bytes:
+        # sends seeds of the shared store without copying them into bytes
+        if isinstance(content, memoryview):
+            return content
+
+        return super().render(content)
+
+
+class SeedFileResponse(FileResponse):
+    # fewer threadpool round trips than the 4 KiB starlette default, while
+    # memory per request stays bounded by the chunk size
+    chunk_size = 64 * 1024
+
+
+def _seed_headers(*, encoding: ContentEncoding, filename: Optional[str],
+                  headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+
+    if encoding != ContentEncoding.IDENTITY:
+        headers["Content-Encoding"] = encoding.value
+
+    if filename is not None:
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+
+    return headers
+
+
+def create_seed_response(*,
+                         serialized: SerializedSeed,
+                         accept_encoding: Optional[str] = None,
+                         filename: Optional[str] = None,
+                         headers: Optional[Dict[str, str]] = None) -> Response:
+
+    encoding = select_content_encoding(accept_encoding=accept_encoding,
+                                       available=serialized.content.keys())
+
+    return SeedResponse(content=serialized.content[encoding],
+                        media_type="application/json",
+                        headers=_seed_headers(encoding=encoding,
+                                              filename=filename,
+                                              headers=headers))
+
+
+def create_seed_file_response(
+        *,
+        seed_file: SeedFile,
+        accept_encoding: Optional[str] = None,
+        filename: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None) -> Optional[Response]:
+    """Streams the stored body from disk instead of loading it.
+
+    None if the client accepts none of the encodings it is stored in, or
+    accepts compression while it is only stored uncompressed, the caller
+    then serves the seed compressed from memory instead.
+    """
+
+    encoding = select_content_encoding(accept_encoding=accept_encoding,
+                                       available=seed_file.paths.keys())
+
+    if encoding not in seed_file.paths:
+        return None
+
+    if encoding == ContentEncoding.IDENTITY and select_content_encoding(
+            accept_encoding=accept_encoding,
+            available=ContentEncoding) != ContentEncoding.IDENTITY:
+        return None
+
+    return SeedFileResponse(path=seed_file.paths[encoding],
+                            media_type="application/json",
+                            headers=_seed_headers(encoding=encoding,
+                                                  filename=filename,
+                                                  headers=headers))
@@ -0,0 +1,111 @@
+from test.mocks import mock_raid_seed_raw
+
+from src.utils.content_encoding import ContentEncoding
+from src.utils.seed_file import SeedFile
+from src.utils.seed_response import (SeedFileResponse,
+                                     create_seed_file_response,
+                                     create_seed_response)
+from src.utils.serialized_seed import SerializedSeed, serialize_seed
+
+
+def test_create_seed_response():
+    serialized = serialize_seed(data=mock_raid_seed_raw())
+
+    cases = (
+        (None, ContentEncoding.IDENTITY),
+        ("gzip", ContentEncoding.GZIP),
+        ("gzip, br", ContentEncoding.BROTLI),
+    )
+
+    for accept_encoding, encoding in cases:
+        response = create_seed_response(serialized=serialized,
+                                        accept_encoding=accept_encoding)
+
+        assert response.status_code == 200
+        assert response.media_type == "application/json"
+        assert response.body == serialized.content[encoding]
+        assert response.headers.get("vary") == "Accept-Encoding"
+
+        if encoding == ContentEncoding.IDENTITY:
+            assert "content-encoding" not in response.headers
+        else:
+            assert response.headers.get("content-encoding") == encoding.value
+
+        assert "content-disposition" not in response.headers
+
+
+def test_create_seed_response_memoryview():
+    body = serialize_seed(data=mock_raid_seed_raw()).body
+
+    serialized = SerializedSeed(
+        content={ContentEncoding.IDENTITY: memoryview(body)})
+
+    response = create_seed_response(serialized=serialized)
+
+    assert response.body == body
+    assert response.headers.get("content-length") == str(len(body))
+
+
+def test_create_seed_response_filename():
+    serialized = serialize_seed(data=mock_raid_seed_raw())
+
+    response = create_seed_response(serialized=serialized,
+                                    filename="testid.json")
+
+    assert response.headers.get(
+        "content-disposition") == "attachment; filename=testid.json"
+
+
+def test_create_seed_response_headers():
+    serialized = serialize_seed(data=mock_raid_seed_raw())
+
+    response = create_seed_response(serialized=serialized,
+                                    headers={"ETag": 'W/"abc"'})
+
+    assert response.headers.get("etag") == 'W/"abc"'
+    assert response.headers.get("vary") == "Accept-Encoding"
+
+
+def test_create_seed_file_response(tmp_path):
+    filepath = tmp_path / "testid.json"
+    filepath.write_bytes(b"[]")
+
+    seed_file = SeedFile(paths={ContentEncoding.IDENTITY: filepath})
+
+    response = create_seed_file_response(seed_file=seed_file,
+                                         accept_encoding="identity",
+                                         filename="testid.json",
+                                         headers={"ETag": 'W/"abc"'})
+
+    assert isinstance(response, SeedFileResponse)
+    assert response.path == filepath
+    assert response.media_type == "application/json"
+
+    assert "content-encoding" not in response.headers
+    assert response.headers.get("etag") == 'W/"abc"'
+    assert response.headers.get("vary") == "Accept-Encoding"
+    assert response.headers.get(
+        "content-disposition") == "attachment; filename=testid.json"
+
+    # compressed from memory instead of sending the file uncompressed
+    for accept_encoding in ("gzip", "gzip, br"):
+        assert create_seed_file_response(
+            seed_file=seed_file, accept_encoding=accept_encoding) is None
+
+    assert create_seed_file_response(seed_file=seed_file) is not None
+
+
+def test_create_seed_file_response_encoding(tmp_path):
+    filepath = tmp_path / "testid.json.gz"
+    filepath.write_bytes(b"")
+
+    seed_file = SeedFile(paths={ContentEncoding.GZIP: filepath})
+
+    response = create_seed_file_response(seed_file=seed_file,
+                                         accept_encoding="gzip, br")
+
+    assert response.path == filepath
+    assert response.headers.get("content-encoding") == "gzip"
+
+    assert create_seed_file_response(seed_file=seed_file,
+                                     accept_encoding="br") is None
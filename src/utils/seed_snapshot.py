@@ -0,0 +1,96 @@
+import re
+from pathlib import Path
+from typing import Generator, Iterable, Optional
+
+from src.utils.atomic_write import write_bytes_atomic
+from src.utils.content_encoding import ContentEncoding
+from src.utils.serialized_seed import SerializedSeed, compute_content_hash
+
+SNAPSHOT_SUFFIXES = {
+    ContentEncoding.IDENTITY: ".json",
+    ContentEncoding.GZIP: ".json.gz",
+    ContentEncoding.BROTLI: ".json.br",
+}
+
+CONTENT_HASH_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def _parse_snapshot_filename(*, filename: str) -> Optional[str]:
+    for suffix in SNAPSHOT_SUFFIXES.values():
+        if filename.endswith(suffix):
+            content_hash = filename[:-len(suffix)]
+
+            if CONTENT_HASH_PATTERN.fullmatch(content_hash):
+                return content_hash
+
+    return None
+
+
+class SeedSnapshot:
+    """Serialized seeds on local disk, one file per content hash and encoding.
+
+    Files are named by the hash of their identity body, a seed whose hash
+    still matches its metadata needs no fetch or re-encoding after restarts.
+    """
+
+    def __init__(self, *, path: Path) -> None:
+        self.path = path
+
+    def _filepath(self, *, content_hash: str,
+                  encoding: ContentEncoding) -> Path:
+        return self.path / f"{content_hash}{SNAPSHOT_SUFFIXES[encoding]}"
+
+    def load(self, *, content_hash: str) -> Optional[SerializedSeed]:
+        try:
+            content = {
+                encoding: self._filepath(content_hash=content_hash,
+                                         encoding=encoding).read_bytes()
+                for encoding in SNAPSHOT_SUFFIXES
+            }
+        except FileNotFoundError:
+            return None
+
+        seed = SerializedSeed(content=content)
+
+        # guards against truncated or tampered files
+        if compute_content_hash(body=seed.body) != content_hash:
+            return None
+
+        return seed
+
+    def load_all(self) -> Generator[SerializedSeed, None, None]:
+        if not self.path.is_dir():
+            return
+
+        suffix = SNAPSHOT_SUFFIXES[ContentEncoding.IDENTITY]
+
+        for filepath in self.path.glob(f"*{suffix}"):
+            seed = self.load(content_hash=filepath.name[:-len(suffix)])
+
+            if seed is not None:
+                yield seed
+
+    def save(self, *, seed: SerializedSeed) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        for encoding, body in seed.content.items():
+            filepath = self._filepath(content_hash=seed.content_hash,
+                                      encoding=encoding)
+
+            write_bytes_atomic(filepath=filepath, data=body)
+
+    def prune(self, *, keep: Iterable[str]) -> None:
+        keep = set(keep)
+
+        if not self.path.is_dir():
+            return
+
+        for filepath in self.path.iterdir():
+            content_hash = _parse_snapshot_filename(filename=filepath.name)
+
+            # leaves anything save did not write alone
+            if content_hash is None or content_hash in keep:
+                continue
+
+            if filepath.is_file() and not filepath.is_symlink():
+                filepath.unlink()
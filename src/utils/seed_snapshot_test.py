@@ -0,0 +1,82 @@
+from test.mocks import mock_raid_seed_enhanced, mock_raid_seed_raw
+
+from src.utils.content_encoding import ContentEncoding
+from src.utils.seed_snapshot import SeedSnapshot
+from src.utils.serialized_seed import serialize_seed
+
+
+def test_seed_snapshot(tmp_path):
+    snapshot = SeedSnapshot(path=tmp_path / "snapshot")
+    seed = serialize_seed(data=mock_raid_seed_raw())
+
+    assert snapshot.load(content_hash=seed.content_hash) is None
+
+    snapshot.save(seed=seed)
+
+    assert snapshot.load(content_hash=seed.content_hash) == seed
+    assert SeedSnapshot(path=tmp_path / "snapshot").load(
+        content_hash=seed.content_hash) == seed
+
+
+def test_seed_snapshot_load_all(tmp_path):
+    snapshot = SeedSnapshot(path=tmp_path)
+    seeds = (serialize_seed(data=mock_raid_seed_raw()),
+             serialize_seed(data=mock_raid_seed_enhanced()))
+
+    assert not tuple(SeedSnapshot(path=tmp_path / "missing").load_all())
+
+    for seed in seeds:
+        snapshot.save(seed=seed)
+
+    (tmp_path / f"{seeds[0].content_hash}.json.br").unlink()
+
+    assert tuple(snapshot.load_all()) == seeds[1:]
+
+
+def test_seed_snapshot_corrupt(tmp_path):
+    snapshot = SeedSnapshot(path=tmp_path)
+    seed = serialize_seed(data=mock_raid_seed_raw())
+
+    snapshot.save(seed=seed)
+
+    filepath = tmp_path / f"{seed.content_hash}.json"
+    filepath.write_bytes(seed.content[ContentEncoding.IDENTITY][:-1])
+
+    assert snapshot.load(content_hash=seed.content_hash) is None
+
+
+def test_seed_snapshot_prune(tmp_path):
+    snapshot = SeedSnapshot(path=tmp_path)
+    seeds = (serialize_seed(data=mock_raid_seed_raw()),
+             serialize_seed(data=mock_raid_seed_enhanced()))
+
+    for seed in seeds:
+        snapshot.save(seed=seed)
+
+    snapshot.prune(keep=(seeds[0].content_hash, ))
+
+    assert snapshot.load(content_hash=seeds[0].content_hash) == seeds[0]
+    assert snapshot.load(content_hash=seeds[1].content_hash) is None
+    assert len(list(tmp_path.iterdir())) == len(seeds[0].content)
+
+
+def test_seed_snapshot_prune_foreign_files(tmp_path):
+    snapshot = SeedSnapshot(path=tmp_path)
+    seed = serialize_seed(data=mock_raid_seed_raw())
+
+    snapshot.save(seed=seed)
+
+    foreign = (tmp_path / "notes.json", tmp_path / f"{seed.content_hash}.txt",
+               tmp_path / f"{seed.content_hash.upper()}.json")
+
+    for filepath in foreign:
+        filepath.write_bytes(b"{}")
+
+    (tmp_path / f"{'0' * 64}.json").mkdir()
+    (tmp_path / f"{'1' * 64}.json").symlink_to(foreign[0])
+
+    snapshot.prune(keep=())
+
+    assert sorted(tmp_path.iterdir()) == sorted(
+        (*foreign, tmp_path / f"{'0' * 64}.json",
+         tmp_path / f"{'1' * 64}.json"))
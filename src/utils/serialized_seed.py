@@ -0,0 +1,43 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, Union
+
+from src.model.raid_data import RaidSeed, map_to_native_object
+from src.utils.content_encoding import ContentEncoding, compress
+
+
+@dataclass(frozen=True)
+class SerializedSeed:
+    # memoryviews when read from a SharedSeedStore
+    content: Dict[ContentEncoding, Union[bytes, memoryview]]
+
+    @property
+    def body(self) -> Union[bytes, memoryview]:
+        return self.content[ContentEncoding.IDENTITY]
+
+    @property
+    def content_hash(self) -> str:
+        return compute_content_hash(body=self.body)
+
+
+def compute_content_hash(*, body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def serialize_body(*, data: RaidSeed) -> bytes:
+    return json.dumps(map_to_native_object(data=data),
+                      separators=(",", ":")).encode("utf-8")
+
+
+def serialize_seed(*, data: RaidSeed) -> SerializedSeed:
+    return create_serialized_seed(body=serialize_body(data=data))
+
+
+def create_serialized_seed(*, body: bytes) -> SerializedSeed:
+    """Compresses an already serialized body."""
+    return SerializedSeed(
+        content={
+            encoding: compress(body=body, encoding=encoding)
+            for encoding in ContentEncoding
+        })
@@ -0,0 +1,21 @@
+import gzip
+import json
+from test.mocks import mock_raid_seed_enhanced, mock_raid_seed_raw
+
+import brotli
+from src.model.raid_data import map_to_native_object
+from src.utils.content_encoding import ContentEncoding
+from src.utils.serialized_seed import serialize_seed
+
+
+def test_serialize_seed():
+    for seed in (mock_raid_seed_raw(), mock_raid_seed_enhanced()):
+        serialized = serialize_seed(data=seed)
+
+        assert json.loads(serialized.body) == map_to_native_object(data=seed)
+
+        assert gzip.decompress(
+            serialized.content[ContentEncoding.GZIP]) == serialized.body
+
+        assert brotli.decompress(
+            serialized.content[ContentEncoding.BROTLI]) == serialized.body
@@ -0,0 +1,57 @@
+import mmap
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.utils.content_encoding import ContentEncoding
+from src.utils.serialized_seed import SerializedSeed
+
+
+class SharedSeedStore:
+    """Serialized seeds by content hash, kept in one anonymous shared mmap.
+
+    Build it before the server forks its workers: all of them then read the
+    same physical pages instead of each holding a copy of every seed. Seeds
+    are returned as memoryviews of the mmap, so reads do not copy them.
+    """
+
+    def __init__(self, *, seeds: Iterable[SerializedSeed]) -> None:
+        unique = {seed.content_hash: seed for seed in seeds}
+
+        size = sum(
+            len(body) for seed in unique.values()
+            for body in seed.content.values())
+
+        self._buffer = mmap.mmap(-1, max(size, 1))
+        self._index: Dict[str, Dict[ContentEncoding, Tuple[int, int]]] = {}
+
+        offset = 0
+
+        for content_hash, seed in unique.items():
+            entries = {}
+
+            for encoding, body in seed.content.items():
+                self._buffer[offset:offset + len(body)] = body
+                entries[encoding] = (offset, len(body))
+
+                offset += len(body)
+
+            self._index[content_hash] = entries
+
+        self._view = memoryview(self._buffer)
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, *, content_hash: str) -> Optional[SerializedSeed]:
+        entries = self._index.get(content_hash)
+
+        if entries is None:
+            return None
+
+        return SerializedSeed(
+            content={
+                encoding: self._view[offset:offset + length]
+                for encoding, (offset, length) in entries.items()
+            })
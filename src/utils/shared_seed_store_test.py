@@ -0,0 +1,59 @@
+import os
+from test.mocks import mock_raid_seed_enhanced, mock_raid_seed_raw
+
+from src.utils.serialized_seed import serialize_seed
+from src.utils.shared_seed_store import SharedSeedStore
+
+
+def test_shared_seed_store():
+    seeds = (serialize_seed(data=mock_raid_seed_raw()),
+             serialize_seed(data=mock_raid_seed_enhanced()))
+
+    store = SharedSeedStore(seeds=(*seeds, seeds[0]))
+
+    assert len(store) == 2
+
+    for seed in seeds:
+        assert seed.content_hash in store
+        assert store.get(content_hash=seed.content_hash) == seed
+
+
+def test_shared_seed_store_no_copy():
+    seed = serialize_seed(data=mock_raid_seed_raw())
+
+    store = SharedSeedStore(seeds=(seed, ))
+
+    for body in store.get(content_hash=seed.content_hash).content.values():
+        assert isinstance(body, memoryview)
+
+
+def test_shared_seed_store_missing():
+    store = SharedSeedStore(seeds=())
+
+    assert len(store) == 0
+    assert "doesnotexist" not in store
+    assert store.get(content_hash="doesnotexist") is None
+
+
+def test_shared_seed_store_fork():
+    seed = serialize_seed(data=mock_raid_seed_raw())
+
+    store = SharedSeedStore(seeds=(seed, ))
+
+    read_fd, write_fd = os.pipe()
+
+    pid = os.fork()
+
+    if pid == 0:
+        os.close(read_fd)
+        os.write(write_fd, store.get(content_hash=seed.content_hash).body)
+        os._exit(0)  # pylint: disable=protected-access
+
+    os.close(write_fd)
+
+    with os.fdopen(read_fd, "rb") as pipe:
+        body = pipe.read()
+
+    os.waitpid(pid, 0)
+
+    assert body == seed.body
@@ -0,0 +1,112 @@
+import asyncio
+import functools
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from cachetools.keys import hashkey
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """At most one call per key in flight; concurrent callers of the same
+    key block and share its result or exception."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def run(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines running on one event loop.
+
+    The call runs in its own task, so cancelling any of its callers, the
+    first one included, leaves it running for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, func: Callable[[],
+                                                      Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(functools.partial(self._done, key))
+
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        del self._calls[key]
+
+        if not task.cancelled():
+            # mark retrieved in case every caller was cancelled
+            task.exception()
+
+
+def single_flight(key: Callable = hashkey):
+
+    flight = SingleFlight()
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return flight.run(key(*args, **kwargs),
+                              lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def async_single_flight(key: Callable = hashkey):
+
+    flight = AsyncSingleFlight()
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await flight.run(key(*args, **kwargs),
+                                    lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
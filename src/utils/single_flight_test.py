@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.utils.single_flight import async_single_flight, single_flight
+
+
+def test_single_flight():
+    calls = []
+    started = threading.Event()
+
+    @single_flight()
+    def load(*, key: str) -> str:
+        calls.append(key)
+        started.set()
+        time.sleep(0.1)
+
+        return f"loaded {key}"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(load, key="a")
+        started.wait()
+
+        followers = [executor.submit(load, key="a") for _ in range(3)]
+
+        results = [f.result() for f in (leader, *followers)]
+
+    assert results == ["loaded a"] * 4
+    assert calls == ["a"]
+
+    assert load(key="a") == "loaded a"
+    assert calls == ["a", "a"]
+
+
+def test_single_flight_error():
+    started = threading.Event()
+
+    @single_flight()
+    def load() -> None:
+        started.set()
+        time.sleep(0.1)
+
+        raise ValueError("failed")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(load)
+        started.wait()
+
+        follower = executor.submit(load)
+
+        for future in (leader, follower):
+            with pytest.raises(ValueError, match="failed"):
+                future.result()
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight():
+    calls = []
+
+    @async_single_flight()
+    async def load(*, key: str) -> str:
+        calls.append(key)
+        await asyncio.sleep(0.01)
+
+        return f"loaded {key}"
+
+    results = await asyncio.gather(*(load(key=k) for k in "aaab"))
+
+    assert results == ["loaded a"] * 3 + ["loaded b"]
+    assert calls == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_error():
+
+    @async_single_flight()
+    async def load() -> None:
+        await asyncio.sleep(0.01)
+
+        raise ValueError("failed")
+
+    results = await asyncio.gather(load(), load(), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_leader_cancelled():
+    calls = []
+
+    @async_single_flight()
+    async def load() -> str:
+        calls.append(None)
+        await asyncio.sleep(0.05)
+
+        return "loaded"
+
+    leader = asyncio.ensure_future(load())
+    await asyncio.sleep(0)
+
+    follower = asyncio.ensure_future(load())
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    assert await follower == "loaded"
+    assert leader.cancelled()
+    assert len(calls) == 1
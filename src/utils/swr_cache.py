@@ -0,0 +1,315 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from cachetools.keys import hashkey, methodkey
+
+logger = logging.getLogger(__name__)
+
+
+class CacheState(Enum):
+    FRESH = "fresh"
+    STALE = "stale"
+    MISSING = "missing"
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    stale: int
+
+
+@dataclass
+class _Load:
+    """Loads of one key in flight, all storing under the same tag."""
+    tag: Hashable
+    count: int = 0
+    generation: int = 0
+
+
+class StaleWhileRevalidateCache:
+    """LRU cache with two TTLs.
+
+    Entries younger than soft_ttl are fresh. Entries between soft_ttl and
+    hard_ttl are still served, but the caller should refresh them in the
+    background. Older entries count as missing.
+
+    Entries can carry a tag, and invalidate drops every entry with one of
+    the given tags. Loads are registered with begin_load, a load whose key
+    was invalidated or cleared since is not stored.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self,
+                 *,
+                 maxsize: int,
+                 soft_ttl: float,
+                 hard_ttl: float,
+                 timer: Callable[[], float] = time.monotonic) -> None:
+
+        if hard_ttl < soft_ttl:
+            raise ValueError("hard_ttl must not be less than soft_ttl")
+
+        self._maxsize = maxsize
+        self._soft_ttl = soft_ttl
+        self._hard_ttl = hard_ttl
+        self._timer = timer
+
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[Any, float,
+                                            Hashable]] = OrderedDict()
+        self._refreshing: Set[Hashable] = set()
+        self._loads: Dict[Hashable, _Load] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self._hits,
+                          misses=self._misses,
+                          stale=self._stale)
+
+    def lookup(self, key: Hashable) -> Tuple[CacheState, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                value, stored_at, _ = entry
+                age = self._timer() - stored_at
+
+                if age < self._soft_ttl:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+
+                    return CacheState.FRESH, value
+
+                if age < self._hard_ttl:
+                    self._entries.move_to_end(key)
+                    self._stale += 1
+
+                    return CacheState.STALE, value
+
+                del self._entries[key]
+
+            self._misses += 1
+
+            return CacheState.MISSING, None
+
+    def begin_load(self, key: Hashable, tag: Hashable = None) -> int:
+        """Returns the generation to store the loaded value with, every call
+        needs a matching end_load."""
+
+        with self._lock:
+            load = self._loads.get(key)
+
+            if load is None:
+                load = self._loads[key] = _Load(tag=tag)
+
+            load.count += 1
+
+            return load.generation
+
+    def end_load(self, key: Hashable) -> None:
+        with self._lock:
+            load = self._loads[key]
+            load.count -= 1
+
+            if load.count == 0:
+                del self._loads[key]
+
+    def set(self, key: Hashable, value: Any, *, generation: int) -> None:
+        with self._lock:
+            load = self._loads.get(key)
+
+            # invalidated while the value was loading
+            if load is None or load.generation != generation:
+                return
+
+            self._entries[key] = (value, self._timer(), load.tag)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def begin_refresh(self, key: Hashable) -> bool:
+        with self._lock:
+            if key in self._refreshing:
+                return False
+
+            self._refreshing.add(key)
+
+            return True
+
+    def end_refresh(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def invalidate(self, *tags: Hashable) -> None:
+        with self._lock:
+            stale_keys = [
+                key for key, (_, _, tag) in self._entries.items()
+                if tag in tags
+            ]
+
+            for key in stale_keys:
+                del self._entries[key]
+
+            for load in self._loads.values():
+                if load.tag in tags:
+                    load.generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+            for load in self._loads.values():
+                load.generation += 1
+
+
+def _swr_decorator(get_cache: Callable[[tuple], StaleWhileRevalidateCache],
+                   key: Callable, tag: Optional[Callable]):
+
+    def decorator(func):
+
+        def refresh(cache, cache_key, generation, *args, **kwargs):
+            try:
+                cache.set(cache_key,
+                          func(*args, **kwargs),
+                          generation=generation)
+            except Exception:
+                logger.warning("Refreshing %s failed, serving stale value",
+                               func.__qualname__,
+                               exc_info=True)
+            finally:
+                cache.end_load(cache_key)
+                cache.end_refresh(cache_key)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_cache(args)
+            cache_key = key(*args, **kwargs)
+            cache_tag = tag(*args, **kwargs) if tag else None
+
+            state, value = cache.lookup(cache_key)
+
+            if state is CacheState.STALE and cache.begin_refresh(cache_key):
+                generation = cache.begin_load(cache_key, cache_tag)
+
+                threading.Thread(target=refresh,
+                                 args=(cache, cache_key, generation, *args),
+                                 kwargs=kwargs,
+                                 daemon=True).start()
+
+            if state is not CacheState.MISSING:
+                return value
+
+            generation = cache.begin_load(cache_key, cache_tag)
+
+            try:
+                value = func(*args, **kwargs)
+
+                cache.set(cache_key, value, generation=generation)
+            finally:
+                cache.end_load(cache_key)
+
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _async_swr_decorator(get_cache: Callable[[tuple],
+                                             StaleWhileRevalidateCache],
+                         key: Callable, tag: Optional[Callable]):
+
+    def decorator(func):
+
+        tasks = set()
+
+        async def refresh(cache, cache_key, generation, *args, **kwargs):
+            try:
+                cache.set(cache_key,
+                          await func(*args, **kwargs),
+                          generation=generation)
+            except Exception:
+                logger.warning("Refreshing %s failed, serving stale value",
+                               func.__qualname__,
+                               exc_info=True)
+            finally:
+                cache.end_load(cache_key)
+                cache.end_refresh(cache_key)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache = get_cache(args)
+            cache_key = key(*args, **kwargs)
+            cache_tag = tag(*args, **kwargs) if tag else None
+
+            state, value = cache.lookup(cache_key)
+
+            if state is CacheState.STALE and cache.begin_refresh(cache_key):
+                generation = cache.begin_load(cache_key, cache_tag)
+
+                task = asyncio.create_task(
+                    refresh(cache, cache_key, generation, *args, **kwargs))
+
+                # the loop only keeps weak references to tasks
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if state is not CacheState.MISSING:
+                return value
+
+            generation = cache.begin_load(cache_key, cache_tag)
+
+            try:
+                value = await func(*args, **kwargs)
+
+                cache.set(cache_key, value, generation=generation)
+            finally:
+                cache.end_load(cache_key)
+
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def swr_cached(cache: StaleWhileRevalidateCache,
+               key: Callable = hashkey,
+               tag: Optional[Callable] = None):
+    return _swr_decorator(lambda _: cache, key, tag)
+
+
+def async_swr_cached(cache: StaleWhileRevalidateCache,
+                     key: Callable = hashkey,
+                     tag: Optional[Callable] = None):
+    return _async_swr_decorator(lambda _: cache, key, tag)
+
+
+def swr_cachedmethod(cache: Callable[[Any], StaleWhileRevalidateCache],
+                     key: Callable = methodkey,
+                     tag: Optional[Callable] = None):
+    """swr_cached with a per-instance cache, like cachetools.cachedmethod."""
+    return _swr_decorator(lambda args: cache(args[0]), key, tag)
+
+
+def async_swr_cachedmethod(cache: Callable[[Any], StaleWhileRevalidateCache],
+                           key: Callable = methodkey,
+                           tag: Optional[Callable] = None):
+    return _async_swr_decorator(lambda args: cache(args[0]), key, tag)
@@ -0,0 +1,247 @@
+import asyncio
+import time
+
+import pytest
+from cachetools.keys import hashkey
+from src.utils.swr_cache import (CacheState, CacheStats,
+                                 StaleWhileRevalidateCache, async_swr_cached,
+                                 swr_cached, swr_cachedmethod)
+
+
+class FakeTimer:
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_cache(**kwargs):
+    timer = FakeTimer()
+
+    cache_kwargs = {"maxsize": 8, "soft_ttl": 10, "hard_ttl": 100, **kwargs}
+
+    return StaleWhileRevalidateCache(timer=timer, **cache_kwargs), timer
+
+
+def store(cache: StaleWhileRevalidateCache, key, value, tag=None) -> None:
+    generation = cache.begin_load(key, tag)
+    cache.set(key, value, generation=generation)
+    cache.end_load(key)
+
+
+def wait_for_refresh(cache: StaleWhileRevalidateCache, key) -> None:
+    for _ in range(100):
+        if cache.begin_refresh(key):
+            cache.end_refresh(key)
+            return
+
+        time.sleep(0.01)
+
+    raise TimeoutError("refresh did not finish")
+
+
+def test_lookup():
+    cache, timer = create_cache()
+
+    assert cache.lookup("key") == (CacheState.MISSING, None)
+
+    store(cache, "key", "value")
+
+    assert cache.lookup("key") == (CacheState.FRESH, "value")
+
+    timer.now = 50
+    assert cache.lookup("key") == (CacheState.STALE, "value")
+
+    timer.now = 100
+    assert cache.lookup("key") == (CacheState.MISSING, None)
+
+    assert cache.stats == CacheStats(hits=1, misses=2, stale=1)
+
+
+def test_set_outdated_generation():
+    cache, _ = create_cache()
+
+    generation = cache.begin_load("key")
+    cache.clear()
+
+    cache.set("key", "value", generation=generation)
+    cache.end_load("key")
+
+    assert len(cache) == 0
+
+    # without a load in flight
+    cache.set("key", "value", generation=generation)
+
+    assert len(cache) == 0
+
+
+def test_invalidate():
+    cache, _ = create_cache()
+
+    store(cache, "a", "a", tag="first")
+    store(cache, "b", "b", tag="second")
+    store(cache, "c", "c")
+
+    generations = {
+        key: cache.begin_load(key, tag)
+        for key, tag in (("a", "first"), ("b", "second"), ("c", None))
+    }
+
+    cache.invalidate("first")
+
+    assert cache.lookup("a")[0] is CacheState.MISSING
+    assert cache.lookup("b")[0] is CacheState.FRESH
+    assert cache.lookup("c")[0] is CacheState.FRESH
+
+    for key, generation in generations.items():
+        cache.set(key, key * 2, generation=generation)
+        cache.end_load(key)
+
+    # loads of other tags started before the invalidation are still stored
+    assert cache.lookup("a")[0] is CacheState.MISSING
+    assert cache.lookup("b") == (CacheState.FRESH, "bb")
+    assert cache.lookup("c") == (CacheState.FRESH, "cc")
+
+    # loads started after the invalidation are stored
+    store(cache, "a", "a", tag="first")
+
+    assert cache.lookup("a")[0] is CacheState.FRESH
+
+
+def test_maxsize():
+    cache, _ = create_cache(maxsize=2)
+
+    for key in ("a", "b"):
+        store(cache, key, key)
+
+    cache.lookup("a")
+    store(cache, "c", "c")
+
+    assert cache.lookup("a")[0] is CacheState.FRESH
+    assert cache.lookup("b")[0] is CacheState.MISSING
+
+
+def test_invalid_ttl():
+    with pytest.raises(ValueError):
+        create_cache(soft_ttl=10, hard_ttl=1)
+
+
+def test_swr_cached():
+    cache, timer = create_cache()
+
+    calls = []
+
+    @swr_cached(cache)
+    def load(*, key: str) -> int:
+        calls.append(key)
+        return len(calls)
+
+    assert load(key="a") == 1
+    assert load(key="a") == 1
+
+    timer.now = 50
+
+    # stale value, refreshed in the background
+    assert load(key="a") == 1
+
+    wait_for_refresh(cache, hashkey(key="a"))
+
+    timer.now = 55
+
+    assert load(key="a") == 2
+    assert calls == ["a", "a"]
+
+
+def test_swr_cached_refresh_error():
+    cache, timer = create_cache()
+
+    calls = []
+
+    @swr_cached(cache)
+    def load() -> str:
+        calls.append(None)
+
+        if len(calls) > 1:
+            raise ConnectionError("unreachable")
+
+        return "value"
+
+    assert load() == "value"
+
+    timer.now = 50
+
+    assert load() == "value"
+    assert load() == "value"
+
+
+@pytest.mark.asyncio
+async def test_async_swr_cached():
+    cache, timer = create_cache()
+
+    calls = []
+
+    @async_swr_cached(cache)
+    async def load(*, key: str) -> int:
+        calls.append(key)
+        return len(calls)
+
+    assert await load(key="a") == 1
+    assert await load(key="a") == 1
+
+    timer.now = 50
+
+    assert await load(key="a") == 1
+
+    # let the background refresh run
+    await asyncio.sleep(0)
+
+    assert await load(key="a") == 2
+    assert calls == ["a", "a"]
+
+
+def test_swr_cachedmethod():
+
+    class Loader:
+
+        def __init__(self) -> None:
+            self.cache, _ = create_cache()
+            self.calls = []
+
+        @swr_cachedmethod(lambda self: self.cache,
+                          tag=lambda self, *, key: key)
+        def load(self, *, key: str) -> int:
+            self.calls.append(key)
+            return len(self.calls)
+
+    first, second = Loader(), Loader()
+
+    assert first.load(key="a") == 1
+    assert first.load(key="a") == 1
+    assert second.load(key="a") == 1
+
+    first.cache.invalidate("a")
+
+    assert first.load(key="a") == 2
+    assert second.load(key="a") == 1
+
+
+def test_swr_cached_invalidate_while_loading():
+    cache, _ = create_cache()
+
+    calls = []
+
+    @swr_cached(cache, tag=lambda *, key: key)
+    def load(*, key: str) -> int:
+        calls.append(key)
+
+        # written by another worker while this load was running
+        if len(calls) == 1:
+            cache.invalidate(key)
+
+        return len(calls)
+
+    assert load(key="a") == 1
+    assert load(key="a") == 2
+    assert load(key="a") == 2
@@ -16,6 +16,7 @@ import pytest
 import requests
 import uvicorn
 from src.app.main import create_app
+from src.domain.async_seed_data_repository import ThreadedSeedDataRepository
 from src.domain.mongo_seed_data_repository import temp_repo
 from src.model.raid_data import (RaidInfoRaw, RaidSeedRaw,
                                  map_to_native_object, map_to_raid_info,
@@ -111,7 +112,8 @@ def server():
 
     with temp_repo(**repo_init_kwargs) as repo:
 
-        app = create_app(stage=Stage.TEST, seed_data_repo=repo)
+        app = create_app(stage=Stage.TEST,
+                         seed_data_repo=ThreadedSeedDataRepository(repo=repo))
 
         config = uvicorn.Config(app=app, host="0.0.0.0", port=PORT)
         server = Server(config=config)